@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from api import (
     categories,
     orders,
@@ -8,13 +10,45 @@ from api import (
     table,
     users,
 )
+from api.deps import user_cache
 from authx.exceptions import AuthXException, MissingTokenError, NoAuthorizationError
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, RedirectResponse
-
-app = FastAPI(title="Admin Micro Service", version="1.0", root_path="/api/admin")
+from rabbitmq_client import rabbitmq_client
+from redis_client import redis_client
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    try:
+        await redis_client.connect()
+    except Exception as e:
+        print(f"⚠️ Redis unavailable, user lookups use the local cache only: {e}")
+    try:
+        await rabbitmq_client.connect()
+        await rabbitmq_client.subscribe(
+            "user.*",
+            user_cache.handle_user_event,
+            exclusive=True,
+            ordering_key="user_id",
+        )
+    except Exception as e:
+        print(
+            f"⚠️ Admin Service started without RabbitMQ, user cache relies on TTL: {e}"
+        )
+    yield
+    await rabbitmq_client.close()
+    await redis_client.close()
+
+
+app = FastAPI(
+    title="Admin Micro Service",
+    version="1.0",
+    root_path="/api/admin",
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
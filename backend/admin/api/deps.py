@@ -1,10 +1,12 @@
 from enum import Enum
 
 from authx import TokenPayload
-from config import auth
+from config import auth, settings
 from crud import users as crud
 from fastapi import Depends, HTTPException, status
-from schemas.users import User
+from redis_client import redis_client
+from schemas.users import CurrentUser
+from shared.user_cache import UserCache
 
 
 class UserRole(Enum):
@@ -12,9 +14,18 @@ class UserRole(Enum):
     STAFF = "staff"
 
 
+user_cache = UserCache(
+    CurrentUser,
+    redis_client,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+    snapshot_ttl_seconds=settings.USER_SNAPSHOT_TTL_SECONDS,
+)
+
+
 async def get_current_user(
     token: TokenPayload = Depends(auth.access_token_required),
-) -> User:
+) -> CurrentUser:
     try:
         username: str = token.sub
         if not username:
@@ -24,7 +35,7 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        user = await crud.get_user_by_username(username)
+        user = await user_cache.get(username, crud.get_user_by_username)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -45,7 +56,9 @@ async def get_current_user(
         )
 
 
-async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_admin(
+    current_user: CurrentUser = Depends(get_current_user),
+) -> CurrentUser:
     if current_user.role != UserRole.ADMIN.value:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required"
@@ -53,7 +66,9 @@ async def get_current_admin(current_user: User = Depends(get_current_user)) -> U
     return current_user
 
 
-async def get_current_staff(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_staff(
+    current_user: CurrentUser = Depends(get_current_user),
+) -> CurrentUser:
     if current_user.role not in [UserRole.ADMIN, UserRole.STAFF]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Staff access required"
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from schemas import users as user_schema
 from schemas import orders as order_schema
 from api.deps import get_current_admin
@@ -10,8 +10,12 @@ orders_router = APIRouter(prefix="/orders", tags=["Orders"])
 @orders_router.get(
     "", response_model=order_schema.OrdersResponse, status_code=status.HTTP_200_OK
 )
-async def get_orders(_: user_schema.User = Depends(get_current_admin)):
-    return await crud.get_orders()
+async def get_orders(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None),
+    _: user_schema.CurrentUser = Depends(get_current_admin),
+):
+    return await crud.get_orders(limit=limit, cursor=cursor)
 
 
 @orders_router.get(
@@ -19,7 +23,9 @@ async def get_orders(_: user_schema.User = Depends(get_current_admin)):
     response_model=order_schema.OrderResponse,
     status_code=status.HTTP_200_OK,
 )
-async def get_order(order_id: int, _: user_schema.User = Depends(get_current_admin)):
+async def get_order(
+    order_id: int, _: user_schema.CurrentUser = Depends(get_current_admin)
+):
     order = await crud.get_order_by_id(order_id)
 
     if not order:
@@ -32,13 +38,19 @@ async def get_order(order_id: int, _: user_schema.User = Depends(get_current_adm
 
 @orders_router.get("/status/{order_status}", response_model=order_schema.OrdersResponse)
 async def get_orders_by_status(
-    order_status: str, _: user_schema.User = Depends(get_current_admin)
+    order_status: str,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None),
+    _: user_schema.CurrentUser = Depends(get_current_admin),
 ):
-    return await crud.get_orders_by_status(order_status)
+    return await crud.get_orders_by_status(order_status, limit=limit, cursor=cursor)
 
 
 @orders_router.get("/user/{user_id}", response_model=order_schema.OrdersResponse)
 async def get_orders_by_user(
-    user_id: int, _: user_schema.User = Depends(get_current_admin)
+    user_id: int,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None),
+    _: user_schema.CurrentUser = Depends(get_current_admin),
 ):
-    return await crud.get_orders_by_user(user_id)
+    return await crud.get_orders_by_user(user_id, limit=limit, cursor=cursor)
@@ -2,7 +2,7 @@ from api.deps import get_current_admin
 from crud import printers as crud
 from fastapi import APIRouter, Depends, HTTPException, status
 from schemas import printers as schema
-from schemas.users import User
+from schemas.users import CurrentUser
 
 router = APIRouter(prefix="/printers", tags=["Printers"])
 
@@ -10,7 +10,7 @@ router = APIRouter(prefix="/printers", tags=["Printers"])
 @router.get("", response_model=schema.PrintersResponse)
 async def get_printers(
     active_only: bool = False,
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     return await crud.get_printers(active_only=active_only)
 
@@ -18,7 +18,7 @@ async def get_printers(
 @router.get("/{printer_id}", response_model=schema.PrinterResponse)
 async def get_printer(
     printer_id: int,
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     printer = await crud.get_printer_by_id(printer_id)
     if not printer:
@@ -33,7 +33,7 @@ async def get_printer(
 )
 async def create_printer(
     printer: schema.PrinterCreate,
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     return await crud.create_printer(printer)
 
@@ -42,7 +42,7 @@ async def create_printer(
 async def update_printer(
     printer_id: int,
     printer: schema.PrinterUpdate,
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     updated = await crud.update_printer(printer_id, printer)
     if not updated:
@@ -55,7 +55,7 @@ async def update_printer(
 @router.delete("/{printer_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_printer(
     printer_id: int,
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     deleted = await crud.delete_printer(printer_id)
     if not deleted:
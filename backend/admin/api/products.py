@@ -12,7 +12,7 @@ product_router = APIRouter(prefix="/products", tags=["Products"])
 @product_router.get(
     "", response_model=product_schema.ProductsResponse, status_code=status.HTTP_200_OK
 )
-async def get_products(_: user_schema.User = Depends(get_current_admin)):
+async def get_products(_: user_schema.CurrentUser = Depends(get_current_admin)):
     return await product_crud.get_products()
 
 
@@ -22,7 +22,7 @@ async def get_products(_: user_schema.User = Depends(get_current_admin)):
     status_code=status.HTTP_200_OK,
 )
 async def get_product(
-    product_id: int, _: user_schema.User = Depends(get_current_admin)
+    product_id: int, _: user_schema.CurrentUser = Depends(get_current_admin)
 ):
     product = await product_crud.get_product_by_id(product_id)
 
@@ -47,7 +47,7 @@ async def create_product(
     category_id: Optional[int] = Form(None),
     is_active: bool = Form(True),
     image: Optional[UploadFile] = File(None),
-    _: user_schema.User = Depends(get_current_admin),
+    _: user_schema.CurrentUser = Depends(get_current_admin),
 ):
     created_product = await product_crud.create_product(
         title=title,
@@ -82,7 +82,7 @@ async def update_product(
     is_active: Optional[bool] = Form(None),
     image: Optional[UploadFile] = File(None),
     remove_image: bool = Form(False),
-    _: user_schema.User = Depends(get_current_admin),
+    _: user_schema.CurrentUser = Depends(get_current_admin),
 ):
     updated_product = await product_crud.update_product(
         product_id=product_id,
@@ -107,7 +107,7 @@ async def update_product(
 @product_router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_product(
     product_id: int,
-    _: user_schema.User = Depends(get_current_admin),
+    _: user_schema.CurrentUser = Depends(get_current_admin),
 ):
     deleted = await product_crud.delete_product(product_id)
 
@@ -1,11 +1,10 @@
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from datetime import datetime
 from crud import reports as crud
 import schemas.reports as schemas
 from schemas import users as user_schema
 from .deps import get_current_admin
-import os
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
@@ -14,7 +13,7 @@ router = APIRouter(prefix="/reports", tags=["Reports"])
 async def get_sales_report(
     start_date: datetime | None = Query(None),
     end_date: datetime | None = Query(None),
-    _: user_schema.User = Depends(get_current_admin)
+    _: user_schema.CurrentUser = Depends(get_current_admin)
 ):
     """
     Get sales summary report
@@ -23,7 +22,7 @@ async def get_sales_report(
 
 
 @router.get("/inventory", response_model=schemas.InventoryReportResponse)
-async def get_inventory_report(_: user_schema.User = Depends(get_current_admin)):
+async def get_inventory_report(_: user_schema.CurrentUser = Depends(get_current_admin)):
     """
     Get inventory status report
     """
@@ -33,21 +32,32 @@ async def get_inventory_report(_: user_schema.User = Depends(get_current_admin))
 @router.post("/sales/excel")
 async def generate_sales_excel(
     report_request: schemas.ReportRequest,
-    _: user_schema.User = Depends(get_current_admin)
+    _: user_schema.CurrentUser = Depends(get_current_admin)
 ):
     """
     Generate Excel sales report and download
     """
-    filename = await crud.generate_excel_report(
+    fileobj = await crud.generate_excel_report(
         report_request.start_date,
         report_request.end_date
     )
-    
-    if not filename or not os.path.exists(filename):
-        return {"error": "Failed to generate report"}
-    
-    return FileResponse(
-        filename,
+
+    if fileobj is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate report"
+        )
+
+    def iter_file():
+        try:
+            while chunk := fileobj.read(64 * 1024):
+                yield chunk
+        finally:
+            fileobj.close()
+
+    filename = f"sales_report_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    return StreamingResponse(
+        iter_file(),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        filename=os.path.basename(filename)
-    )
\ No newline at end of file
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -2,7 +2,7 @@ from api.deps import get_current_admin
 from crud import table as crud
 from fastapi import APIRouter, Depends, HTTPException, status
 from schemas import table as schema
-from schemas.users import User
+from schemas.users import CurrentUser
 
 tables_router = APIRouter(prefix="/tables", tags=["Tables"])
 
@@ -10,20 +10,20 @@ tables_router = APIRouter(prefix="/tables", tags=["Tables"])
 @tables_router.get("", response_model=schema.Tables)
 async def get_tables(
     active_only: bool = False,
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     return await crud.get_tables(active_only)
 
 
 @tables_router.get("/available", response_model=schema.Tables)
-async def get_available_tables(_: User = Depends(get_current_admin)):
+async def get_available_tables(_: CurrentUser = Depends(get_current_admin)):
     return await crud.get_available_tables()
 
 
 @tables_router.get("/{table_id}", response_model=schema.Table)
 async def get_table(
     table_id: int,
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     table = await crud.get_table_by_id(table_id)
     if not table:
@@ -37,7 +37,7 @@ async def get_table(
 @tables_router.post("", response_model=schema.Table, status_code=status.HTTP_201_CREATED)
 async def create_table(
     table_in: schema.TableCreate,
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     table = await crud.create_table(table_in)
     if not table:
@@ -52,7 +52,7 @@ async def create_table(
 async def update_table(
     table_id: int,
     table_in: schema.TableUpdate,
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     if table_in.number:
         existing = await crud.get_table_by_number(table_in.number)
@@ -75,7 +75,7 @@ async def update_table(
 async def update_table_status(
     table_id: int,
     status_data: schema.TableStatusUpdate,
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     try:
         table = await crud.get_table_by_id(table_id)
@@ -106,7 +106,7 @@ async def update_table_status(
 @tables_router.delete("/{table_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_table(
     table_id: int,
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     deleted = await crud.delete_table(table_id)
     if not deleted:
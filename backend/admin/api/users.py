@@ -2,14 +2,14 @@ from api.deps import get_current_admin
 from crud import users as crud
 from fastapi import APIRouter, Depends, HTTPException, status
 from schemas import users as schema
-from schemas.users import User
+from schemas.users import CurrentUser, User
 
 users_router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @users_router.get("", response_model=schema.Users)
 async def get_users(
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     """Get all users"""
     return await crud.get_users()
@@ -18,7 +18,7 @@ async def get_users(
 @users_router.get("/{user_id}", response_model=User)
 async def get_user(
     user_id: int,
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     """Get a specific user by ID"""
     user = await crud.get_user_by_id(user_id)
@@ -32,7 +32,7 @@ async def get_user(
 @users_router.post("", response_model=User, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user_in: schema.UserCreate,
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     """Create a new user (staff/chef/admin)"""
     user = await crud.create_user(user_in)
@@ -46,7 +46,7 @@ async def create_user(
 @users_router.post("/admin", response_model=User, status_code=status.HTTP_201_CREATED)
 async def create_admin(
     user_in: schema.UserCreate,
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     """Create a new administrator account"""
     user = await crud.create_admin(user_in)
@@ -61,7 +61,7 @@ async def create_admin(
 async def update_user(
     user_id: int,
     user_in: schema.UserUpdate,
-    _: User = Depends(get_current_admin),
+    _: CurrentUser = Depends(get_current_admin),
 ):
     """Update user details"""
     user = await crud.update_user(user_id, user_in)
@@ -76,7 +76,7 @@ async def update_user(
 async def update_user_role(
     user_id: int,
     role_data: schema.UserRoleUpdate,
-    # current_admin: User = Depends(get_current_admin),
+    # current_admin: CurrentUser = Depends(get_current_admin),
 ):
     """Update user role (admin, staff, chef)"""
     try:
@@ -122,7 +122,9 @@ async def update_user_role(
 
 
 @users_router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def remove_user(user_id: int, current_admin: User = Depends(get_current_admin)):
+async def remove_user(
+    user_id: int, current_admin: CurrentUser = Depends(get_current_admin)
+):
     """Delete a user"""
     # Prevent self-deletion
     if user_id == current_admin.id:
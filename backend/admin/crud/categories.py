@@ -2,6 +2,7 @@ import httpx
 from fastapi import HTTPException, status
 from config import settings
 from schemas import categories as schema
+from shared import codec
 
 
 class ServiceClient:
@@ -26,7 +27,7 @@ async def get_categories() -> schema.CategoriesResponse:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to fetch categories",
             )
-        data = response.json()
+        data = codec.decode_response(response)
         return schema.CategoriesResponse(**data)
     except httpx.ConnectError as e:
         print(e)
@@ -51,7 +52,7 @@ async def get_category_by_id(category_id: int) -> schema.CategoryResponse | None
             return None
         if response.status_code != 200:
             return None
-        data = response.json()
+        data = codec.decode_response(response)
         return schema.CategoryResponse(**data)
     except httpx.ConnectError:
         raise HTTPException(
@@ -80,7 +81,7 @@ async def create_category(category: schema.CategoryCreate) -> schema.CategoryRes
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to create category",
             )
-        data = response.json()
+        data = codec.decode_response(response)
         return schema.CategoryResponse(**data)
     except httpx.ConnectError:
         raise HTTPException(
@@ -116,7 +117,7 @@ async def update_category(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to update category",
             )
-        data = response.json()
+        data = codec.decode_response(response)
         return schema.CategoryResponse(**data)
     except httpx.ConnectError:
         raise HTTPException(
@@ -2,6 +2,7 @@ import httpx
 from fastapi import HTTPException, status
 from config import settings
 from schemas import orders as schema
+from shared import codec
 
 
 class ServiceClient:
@@ -17,9 +18,21 @@ class ServiceClient:
 service_client = ServiceClient()
 
 
-async def get_orders() -> schema.OrdersResponse:
+def _order_list_params(limit: int, cursor: str | None) -> dict:
+    # Admin views only render order-level fields, so skip nested products.
+    params = {"limit": limit, "lean": "true"}
+    if cursor:
+        params["cursor"] = cursor
+    return params
+
+
+async def get_orders(
+    limit: int = 100, cursor: str | None = None
+) -> schema.OrdersResponse:
     try:
-        response = await service_client.client.get("/orders")
+        response = await service_client.client.get(
+            "/orders", params=_order_list_params(limit, cursor)
+        )
 
         if response.status_code != 200:
             raise HTTPException(
@@ -27,7 +40,7 @@ async def get_orders() -> schema.OrdersResponse:
                 detail="Failed to fetch orders",
             )
 
-        data = response.json()
+        data = codec.decode_response(response)
         return schema.OrdersResponse(**data)
 
     except httpx.ConnectError:
@@ -54,7 +67,7 @@ async def get_order_by_id(order_id: int) -> schema.OrderResponse | None:
         if response.status_code != 200:
             return None
 
-        data = response.json()
+        data = codec.decode_response(response)
         return schema.OrderResponse(**data)
 
     except httpx.ConnectError:
@@ -68,14 +81,19 @@ async def get_order_by_id(order_id: int) -> schema.OrderResponse | None:
         return None
 
 
-async def get_orders_by_status(order_status: str) -> schema.OrdersResponse:
+async def get_orders_by_status(
+    order_status: str, limit: int = 100, cursor: str | None = None
+) -> schema.OrdersResponse:
     try:
-        response = await service_client.client.get(f"/orders/status/{order_status}")
+        response = await service_client.client.get(
+            f"/orders/status/{order_status}",
+            params=_order_list_params(limit, cursor),
+        )
 
         if response.status_code != 200:
             return schema.OrdersResponse(orders=[], total=0)
 
-        data = response.json()
+        data = codec.decode_response(response)
         return schema.OrdersResponse(**data)
 
     except httpx.ConnectError:
@@ -87,14 +105,18 @@ async def get_orders_by_status(order_status: str) -> schema.OrdersResponse:
         return schema.OrdersResponse(orders=[], total=0)
 
 
-async def get_orders_by_user(user_id: int) -> schema.OrdersResponse:
+async def get_orders_by_user(
+    user_id: int, limit: int = 100, cursor: str | None = None
+) -> schema.OrdersResponse:
     try:
-        response = await service_client.client.get(f"/orders/user/{user_id}")
+        response = await service_client.client.get(
+            f"/orders/user/{user_id}", params=_order_list_params(limit, cursor)
+        )
 
         if response.status_code != 200:
             return schema.OrdersResponse(orders=[], total=0)
 
-        data = response.json()
+        data = codec.decode_response(response)
         return schema.OrdersResponse(**data)
 
     except httpx.ConnectError:
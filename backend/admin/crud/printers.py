@@ -2,6 +2,7 @@ import httpx
 from config import settings
 from fastapi import HTTPException, status
 from schemas import printers as schema
+from shared import codec
 
 
 class ServiceClient:
@@ -27,7 +28,7 @@ async def get_printers(active_only: bool = False) -> schema.PrintersResponse:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to fetch printers",
             )
-        return schema.PrintersResponse(**response.json())
+        return schema.PrintersResponse(**codec.decode_response(response))
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -42,7 +43,7 @@ async def get_printer_by_id(printer_id: int) -> schema.PrinterResponse | None:
             return None
         if response.status_code != 200:
             return None
-        return schema.PrinterResponse(**response.json())
+        return schema.PrinterResponse(**codec.decode_response(response))
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -58,14 +59,16 @@ async def create_printer(printer: schema.PrinterCreate) -> schema.PrinterRespons
             "/printers", json=printer.model_dump()
         )
         if response.status_code == 400:
-            detail = response.json().get("detail", "Invalid printer data")
+            detail = codec.decode_response(response).get(
+                "detail", "Invalid printer data"
+            )
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
         if response.status_code != 201:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to create printer",
             )
-        return schema.PrinterResponse(**response.json())
+        return schema.PrinterResponse(**codec.decode_response(response))
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -83,14 +86,16 @@ async def update_printer(
         if response.status_code == 404:
             return None
         if response.status_code == 400:
-            detail = response.json().get("detail", "Invalid printer data")
+            detail = codec.decode_response(response).get(
+                "detail", "Invalid printer data"
+            )
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
         if response.status_code != 200:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to update printer",
             )
-        return schema.PrinterResponse(**response.json())
+        return schema.PrinterResponse(**codec.decode_response(response))
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -3,6 +3,7 @@ from fastapi import UploadFile
 from fastapi import HTTPException, status
 from config import settings
 from schemas import products as schema
+from shared import codec
 
 
 class ServiceClient:
@@ -27,7 +28,7 @@ async def get_products() -> schema.ProductsResponse:
                 detail="Failed to fetch products",
             )
 
-        data = response.json()
+        data = codec.decode_response(response)
         return schema.ProductsResponse.model_validate(data)
 
     except httpx.ConnectError:
@@ -54,7 +55,7 @@ async def get_product_by_id(product_id: int) -> schema.ProductResponse | None:
         if response.status_code != 200:
             return None
 
-        data = response.json()
+        data = codec.decode_response(response)
         return schema.ProductResponse(**data)
 
     except httpx.ConnectError:
@@ -104,7 +105,7 @@ async def create_product(
         response = await service_client.client.post("/products", data=data, files=files)
 
         if response.status_code == 201:
-            data = response.json()
+            data = codec.decode_response(response)
             return schema.ProductResponse(**data)
 
         return None
@@ -165,7 +166,7 @@ async def update_product(
             return None
 
         if response.status_code == 200:
-            data = response.json()
+            data = codec.decode_response(response)
             return schema.ProductResponse(**data)
 
         return None
@@ -1,13 +1,16 @@
-import os
+import asyncio
+import tempfile
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import IO, AsyncIterator, Optional
 
 import httpx
 import openpyxl
 import schemas.reports as schemas
 from config import settings
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.chart import LineChart, Reference
 from openpyxl.styles import Alignment, Font, PatternFill
+from shared import codec
 
 
 class ServiceClient:
@@ -23,6 +26,43 @@ class ServiceClient:
 service_client = ServiceClient()
 
 
+async def _fetch_sales_dashboard(params: dict) -> tuple[dict, list, list, list]:
+    """Fetch summary, top products, by-day and by-hour for one window."""
+    response = await service_client.db_client.get(
+        "/reports/sales/dashboard", params=params
+    )
+    if response.status_code == 200:
+        data = codec.decode_response(response)
+        return (
+            data.get("summary", {}),
+            data.get("top_products", []),
+            data.get("by_day", []),
+            data.get("by_hour", []),
+        )
+    if response.status_code != 404:
+        raise Exception("Failed to fetch sales dashboard")
+
+    # Database service without the composite endpoint: fan out concurrently.
+    summary_resp, top_products_resp, by_day_resp, by_hour_resp = await asyncio.gather(
+        service_client.db_client.get("/reports/sales/summary", params=params),
+        service_client.db_client.get("/reports/sales/top-products", params=params),
+        service_client.db_client.get("/reports/sales/by-day", params=params),
+        service_client.db_client.get("/reports/sales/by-hour", params=params),
+    )
+
+    if summary_resp.status_code != 200:
+        raise Exception("Failed to fetch sales summary")
+
+    return (
+        codec.decode_response(summary_resp),
+        codec.decode_response(top_products_resp)
+        if top_products_resp.status_code == 200
+        else [],
+        codec.decode_response(by_day_resp) if by_day_resp.status_code == 200 else [],
+        codec.decode_response(by_hour_resp) if by_hour_resp.status_code == 200 else [],
+    )
+
+
 async def get_sales_summary(
     start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
 ) -> schemas.SalesSummaryResponse:
@@ -41,29 +81,7 @@ async def get_sales_summary(
         if end_date:
             params["end_date"] = end_date.isoformat()
 
-        # Get data from database API
-        summary_resp = await service_client.db_client.get(
-            "/reports/sales/summary", params=params
-        )
-        top_products_resp = await service_client.db_client.get(
-            "/reports/sales/top-products", params=params
-        )
-        by_day_resp = await service_client.db_client.get(
-            "/reports/sales/by-day", params=params
-        )
-        by_hour_resp = await service_client.db_client.get(
-            "/reports/sales/by-hour", params=params
-        )
-
-        if summary_resp.status_code != 200:
-            raise Exception("Failed to fetch sales summary")
-
-        summary = summary_resp.json()
-        top_products = (
-            top_products_resp.json() if top_products_resp.status_code == 200 else []
-        )
-        by_day = by_day_resp.json() if by_day_resp.status_code == 200 else []
-        by_hour = by_hour_resp.json() if by_hour_resp.status_code == 200 else []
+        summary, top_products, by_day, by_hour = await _fetch_sales_dashboard(params)
 
         return schemas.SalesSummaryResponse(
             total_sales=summary.get("total_sales", 0),
@@ -105,128 +123,208 @@ async def get_sales_summary(
         )
 
 
-async def generate_excel_report(
-    start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
-) -> Optional[str]:
-    """Generate Excel report with sales data"""
-    try:
-        # Get sales data
-        summary = await get_sales_summary(start_date, end_date)
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_FILL = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+ORDERS_BATCH_SIZE = 500
 
-        # Create workbook
-        wb = openpyxl.Workbook()
-        wb.remove(wb.active)
 
-        # Summary Sheet
-        ws_summary = wb.create_sheet("Summary")
+def _header_row(ws, *titles) -> list:
+    cells = []
+    for title in titles:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cells.append(cell)
+    return cells
 
-        # Header
-        ws_summary["A1"] = "Sales Report"
-        ws_summary["A1"].font = Font(bold=True, size=16, color="FFFFFF")
-        ws_summary["A1"].fill = PatternFill(
-            start_color="4472C4", end_color="4472C4", fill_type="solid"
-        )
-        ws_summary.merge_cells("A1:D1")
 
-        # Date range
-        date_format = "%d.%m.%Y"
-        ws_summary["A2"] = (
+async def _stream_report_orders(params: dict) -> AsyncIterator[list[dict]]:
+    """Read the NDJSON order stream in batches of ORDERS_BATCH_SIZE."""
+    async with service_client.db_client.stream(
+        "GET", "/reports/orders/stream", params={**params, "format": "ndjson"}
+    ) as response:
+        if response.status_code != 200:
+            raise Exception("Failed to fetch report orders")
+
+        batch = []
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            batch.append(codec.loads(line))
+            if len(batch) >= ORDERS_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _order_detail_row(order: dict) -> list:
+    items = ", ".join(
+        f"{(item.get('product') or {}).get('title', item['product_id'])} x{item['quantity']}"
+        for item in order.get("items", [])
+    )
+    return [
+        order["id"],
+        order["created_at"],
+        order["status"],
+        (order.get("user") or {}).get("full_name"),
+        (order.get("table") or {}).get("number"),
+        items,
+        order["total"],
+    ]
+
+
+def _write_excel_report(
+    fileobj,
+    summary: schemas.SalesSummaryResponse,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    next_orders_batch,
+) -> None:
+    """Build the workbook in write-only mode; runs in a worker thread."""
+    wb = openpyxl.Workbook(write_only=True)
+
+    # Summary Sheet
+    ws_summary = wb.create_sheet("Summary")
+    ws_summary.column_dimensions["A"].width = 25
+    ws_summary.column_dimensions["B"].width = 20
+
+    title = WriteOnlyCell(ws_summary, value="Sales Report")
+    title.font = Font(bold=True, size=16, color="FFFFFF")
+    title.fill = HEADER_FILL
+    ws_summary.append([title])
+
+    date_format = "%d.%m.%Y"
+    ws_summary.append(
+        [
             f"Period: {start_date.strftime(date_format) if start_date else 'All'} - {end_date.strftime(date_format) if end_date else 'All'}"
-        )
-        ws_summary.merge_cells("A2:D2")
-
-        # Metrics
-        ws_summary["A4"] = "Metric"
-        ws_summary["B4"] = "Value"
-        ws_summary["A4"].font = Font(bold=True)
-        ws_summary["B4"].font = Font(bold=True)
-
-        metrics = [
-            ("Total Sales", f"{summary.total_sales:,.0f} so'm"),
-            ("Total Orders", summary.total_orders),
-            ("Total Items Sold", summary.total_items),
-            ("Average Order Value", f"{summary.average_order_value:,.0f} so'm"),
         ]
+    )
+    ws_summary.append([])
+
+    metric_header = WriteOnlyCell(ws_summary, value="Metric")
+    metric_header.font = Font(bold=True)
+    value_header = WriteOnlyCell(ws_summary, value="Value")
+    value_header.font = Font(bold=True)
+    ws_summary.append([metric_header, value_header])
+
+    for metric, value in [
+        ("Total Sales", f"{summary.total_sales:,.0f} so'm"),
+        ("Total Orders", summary.total_orders),
+        ("Total Items Sold", summary.total_items),
+        ("Average Order Value", f"{summary.average_order_value:,.0f} so'm"),
+    ]:
+        ws_summary.append([metric, value])
+
+    # Top Products Sheet
+    ws_products = wb.create_sheet("Top Products")
+    ws_products.column_dimensions["A"].width = 30
+    ws_products.column_dimensions["B"].width = 15
+    ws_products.column_dimensions["C"].width = 20
+    ws_products.append(
+        _header_row(ws_products, "Product Name", "Quantity Sold", "Revenue (so'm)")
+    )
+    for product in summary.top_products:
+        ws_products.append([product.product_name, product.quantity, product.revenue])
+
+    # Daily Sales Sheet
+    ws_daily = wb.create_sheet("Daily Sales")
+    ws_daily.column_dimensions["A"].width = 15
+    ws_daily.column_dimensions["B"].width = 20
+    ws_daily.append(_header_row(ws_daily, "Date", "Sales (so'm)"))
+    for day in summary.sales_by_day:
+        ws_daily.append([day.date, day.total])
+
+    # Add chart
+    if len(summary.sales_by_day) > 0:
+        chart = LineChart()
+        chart.title = "Daily Sales Trend"
+        chart.y_axis.title = "Sales (so'm)"
+        chart.x_axis.title = "Date"
+
+        data = Reference(
+            ws_daily, min_col=2, min_row=1, max_row=len(summary.sales_by_day) + 1
+        )
+        cats = Reference(
+            ws_daily, min_col=1, min_row=2, max_row=len(summary.sales_by_day) + 1
+        )
 
-        row = 5
-        for metric, value in metrics:
-            ws_summary[f"A{row}"] = metric
-            ws_summary[f"B{row}"] = value
-            row += 1
-
-        ws_summary.column_dimensions["A"].width = 25
-        ws_summary.column_dimensions["B"].width = 20
-
-        # Top Products Sheet
-        ws_products = wb.create_sheet("Top Products")
-        ws_products["A1"] = "Product Name"
-        ws_products["B1"] = "Quantity Sold"
-        ws_products["C1"] = "Revenue (so'm)"
-
-        for cell in ["A1", "B1", "C1"]:
-            ws_products[cell].font = Font(bold=True, color="FFFFFF")
-            ws_products[cell].fill = PatternFill(
-                start_color="4472C4", end_color="4472C4", fill_type="solid"
-            )
-
-        row = 2
-        for product in summary.top_products:
-            ws_products[f"A{row}"] = product.product_name
-            ws_products[f"B{row}"] = product.quantity
-            ws_products[f"C{row}"] = product.revenue
-            row += 1
-
-        ws_products.column_dimensions["A"].width = 30
-        ws_products.column_dimensions["B"].width = 15
-        ws_products.column_dimensions["C"].width = 20
-
-        # Daily Sales Sheet
-        ws_daily = wb.create_sheet("Daily Sales")
-        ws_daily["A1"] = "Date"
-        ws_daily["B1"] = "Sales (so'm)"
-
-        for cell in ["A1", "B1"]:
-            ws_daily[cell].font = Font(bold=True, color="FFFFFF")
-            ws_daily[cell].fill = PatternFill(
-                start_color="4472C4", end_color="4472C4", fill_type="solid"
-            )
-
-        row = 2
-        for day in summary.sales_by_day:
-            ws_daily[f"A{row}"] = day.date
-            ws_daily[f"B{row}"] = day.total
-            row += 1
-
-        ws_daily.column_dimensions["A"].width = 15
-        ws_daily.column_dimensions["B"].width = 20
+        chart.add_data(data, titles_from_data=True)
+        chart.set_categories(cats)
+
+        ws_daily.add_chart(chart, "D2")
+
+    # Orders Sheet, streamed page by page
+    ws_orders = wb.create_sheet("Orders")
+    for column, width in zip("ABCDEFG", (10, 22, 12, 25, 10, 60, 15)):
+        ws_orders.column_dimensions[column].width = width
+    ws_orders.append(
+        _header_row(
+            ws_orders,
+            "Order ID",
+            "Created At",
+            "Status",
+            "Staff",
+            "Table",
+            "Items",
+            "Total (so'm)",
+        )
+    )
+    while (orders := next_orders_batch()) is not None:
+        for order in orders:
+            ws_orders.append(_order_detail_row(order))
 
-        # Add chart
-        if len(summary.sales_by_day) > 0:
-            chart = LineChart()
-            chart.title = "Daily Sales Trend"
-            chart.y_axis.title = "Sales (so'm)"
-            chart.x_axis.title = "Date"
+    wb.save(fileobj)
 
-            data = Reference(
-                ws_daily, min_col=2, min_row=1, max_row=len(summary.sales_by_day) + 1
-            )
-            cats = Reference(
-                ws_daily, min_col=1, min_row=2, max_row=len(summary.sales_by_day) + 1
-            )
 
-            chart.add_data(data, titles_from_data=True)
-            chart.set_categories(cats)
+async def generate_excel_report(
+    start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+) -> Optional[IO[bytes]]:
+    """Generate Excel report with sales data
 
-            ws_daily.add_chart(chart, "D2")
+    Returns an anonymous temporary file positioned at the start, or None.
+    The caller streams and closes it; nothing is left on disk.
+    """
+    fileobj = tempfile.TemporaryFile()
+    try:
+        # Get sales data
+        summary = await get_sales_summary(start_date, end_date)
 
-        # Save file
-        filename = f"/app/reports/sales_report_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        os.makedirs("/app/reports", exist_ok=True)
-        wb.save(filename)
+        params = {}
+        if start_date:
+            params["start_date"] = start_date.isoformat()
+        if end_date:
+            params["end_date"] = end_date.isoformat()
 
-        return filename
+        # The worker thread pulls batches; each one is read on the event
+        # loop so the shared HTTP client stays on its own loop.
+        loop = asyncio.get_running_loop()
+        batches = _stream_report_orders(params)
+
+        def next_orders_batch() -> Optional[list[dict]]:
+            try:
+                return asyncio.run_coroutine_threadsafe(
+                    batches.__anext__(), loop
+                ).result()
+            except StopAsyncIteration:
+                return None
+
+        try:
+            await asyncio.to_thread(
+                _write_excel_report,
+                fileobj,
+                summary,
+                start_date,
+                end_date,
+                next_orders_batch,
+            )
+        finally:
+            await batches.aclose()
+        fileobj.seek(0)
+        return fileobj
 
     except Exception as e:
+        fileobj.close()
         print(f"Error generating Excel report: {e}")
         return None
 
@@ -239,7 +337,7 @@ async def get_inventory_report() -> schemas.InventoryReportResponse:
         if response.status_code != 200:
             raise Exception("Failed to fetch inventory report")
 
-        data = response.json()
+        data = codec.decode_response(response)
 
         return schemas.InventoryReportResponse(
             total_products=data.get("total_products", 0),
@@ -1,5 +1,6 @@
 import httpx
 from config import settings
+from shared import codec
 
 
 class ServiceClient:
@@ -23,7 +24,7 @@ async def get_system_config(key:str)->dict|None:
     if response.status_code==404:
         return None
     if response.status_code==200:
-        return response.json()
+        return codec.decode_response(response)
     return None
 
 # @handle_service_errors
@@ -3,6 +3,7 @@ from config import settings
 from fastapi import HTTPException, status
 from schemas import users as schema
 from schemas.users import User, Users
+from shared import codec
 
 
 class ServiceClient:
@@ -29,7 +30,7 @@ async def verify_token(token: str) -> dict | None:
         )
 
         if response.status_code == 200:
-            return response.json()
+            return codec.decode_response(response)
 
         return None
 
@@ -45,3 +45,4 @@ class OrderResponse(OrderBase):
 class OrdersResponse(BaseModel):
     orders: list[OrderResponse] = []
     total: int = 0
+    next_cursor: str | None = None
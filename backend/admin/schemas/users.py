@@ -41,6 +41,19 @@ class User(UserBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CurrentUser(BaseModel):
+    """The user behind a request. Cached for auth checks, so no PIN."""
+
+    id: int
+    username: str
+    full_name: str
+    role: str
+    status: str
+    last_login: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class Users(BaseModel):
     users: list[User] = []
 
@@ -5,14 +5,17 @@ from authx.exceptions import AuthXException, MissingTokenError, NoAuthorizationE
 from config import auth, settings
 from crud import (
     create_user_in_db,
+    db_client,
     get_active_users,
     get_user_by_pin,
+    handle_user_event,
     update_last_login,
 )
 from deps import get_current_user
 from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from rabbitmq_client import rabbitmq_client
 from redis_client import redis_client
 from schemas import UserResponse as User
 
@@ -20,7 +23,19 @@ from schemas import UserResponse as User
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await redis_client.connect()
+    await db_client.start()
+    try:
+        await rabbitmq_client.connect()
+        await rabbitmq_client.subscribe(
+            "user.*", handle_user_event, exclusive=True, ordering_key="user_id"
+        )
+    except Exception as e:
+        print(
+            f"⚠️ Auth Service started without RabbitMQ, login options rely on TTL: {e}"
+        )
     yield
+    await rabbitmq_client.close()
+    await db_client.close()
     await redis_client.close()
 
 
@@ -44,14 +59,7 @@ auth_app.add_middleware(
 )
 async def get_login_options():
     """Get list of active users for login selection"""
-    users = await get_active_users()
-    valid_users = []
-    for user in auth_schemas.UserLoginOptionsResponse(users=users).users:
-        if not user.status == "active":
-            continue
-        valid_users.append(user)
-
-    return {"users": valid_users}
+    return {"users": await get_active_users()}
 
 
 @auth_app.post(
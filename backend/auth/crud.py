@@ -3,16 +3,63 @@ from datetime import datetime, timedelta
 import httpx
 from config import auth, settings
 from fastapi import HTTPException, status
-from schemas import UserCreate, UserLoginOption, UserResponse
+from redis_client import redis_client
+from schemas import (
+    UserCreate,
+    UserLoginOption,
+    UserLoginOptionsResponse,
+    UserResponse,
+)
+from shared import codec
+
+LOGIN_OPTIONS_KEY = "login_options"
 
 
 class DatabaseClient:
+    """One pooled, keep-alive HTTP client to the database service.
+
+    Opened in the app lifespan and shared by every request, so a login reuses
+    warm connections instead of paying a TCP handshake per call.
+    """
+
     def __init__(self):
         self.base_url = settings.DATABASE_SERVICE_URL
-        self.timeout = 10.0
+        self.timeout = settings.DATABASE_HTTP_TIMEOUT
+        self._client: httpx.AsyncClient | None = None
+
+    def _http2_enabled(self) -> bool:
+        if not settings.DATABASE_HTTP2:
+            return False
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            print("⚠️ DATABASE_HTTP2 is set but `h2` is not installed, using HTTP/1.1")
+            return False
+        return True
+
+    async def start(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.DATABASE_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.DATABASE_HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=settings.DATABASE_HTTP_KEEPALIVE_EXPIRY,
+                ),
+                http2=self._http2_enabled(),
+            )
 
-    def get_client(self):
-        return httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout)
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_client(self) -> httpx.AsyncClient:
+        # Lazily opened when used outside the app lifespan (scripts, tests)
+        if self._client is None:
+            await self.start()
+        return self._client
 
 
 db_client = DatabaseClient()
@@ -25,126 +72,173 @@ def generate_token(username: str, role: str) -> str:
 
 
 async def get_user_by_username(username: str) -> UserResponse | None:
-    async with db_client.get_client() as client:
-        try:
-            response = await client.get(f"/users/username/{username}")
-            print(response.content)
-            if response.status_code != 200:
-                return None
-            return UserResponse.model_validate_json(response.content)
-
-        except Exception as e:
-            raise Exception(e)
+    client = await db_client.get_client()
+    try:
+        response = await client.get(f"/users/username/{username}")
+        if response.status_code != 200:
+            return None
+        return UserResponse.model_validate_json(response.content)
 
+    except Exception as e:
+        raise Exception(e)
 
-async def get_active_users() -> list[UserLoginOption]:
-    """Get list of active users for login selection"""
-    async with db_client.get_client() as client:
-        try:
-            response = await client.get("/users?status=active")
-            if response.status_code != 200:
-                return []
 
-            data = response.json()
+async def _cached_login_options() -> list[UserLoginOption] | None:
+    try:
+        raw = await redis_client.get_value(LOGIN_OPTIONS_KEY)
+        if raw is None:
+            return None
+        return UserLoginOptionsResponse.model_validate_json(raw).users
+    except Exception as e:
+        print(f"⚠️ Login options cache read failed: {e}")
+        return None
 
-            return [UserLoginOption.model_validate(user) for user in data["users"]]
 
-        except httpx.ConnectError:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Database service unavailable",
-            )
-        except Exception:
+async def get_active_users() -> list[UserLoginOption]:
+    """Get list of active users for login selection"""
+    cached = await _cached_login_options()
+    if cached is not None:
+        return cached
+
+    client = await db_client.get_client()
+    try:
+        response = await client.get("/users/login-options")
+        if response.status_code != 200:
             return []
 
+        options = UserLoginOptionsResponse.model_validate_json(response.content)
+
+    except httpx.ConnectError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database service unavailable",
+        )
+    except Exception:
+        return []
+
+    try:
+        await redis_client.set_value(
+            LOGIN_OPTIONS_KEY,
+            options.model_dump_json(),
+            settings.LOGIN_OPTIONS_CACHE_SECONDS,
+        )
+    except Exception as e:
+        print(f"⚠️ Login options cache write failed: {e}")
+    return options.users
+
+
+async def handle_user_event(data: dict) -> None:
+    """Drop the cached login options unless the event leaves them as they are.
+
+    Every login bumps last_login and publishes user.updated; those events
+    match the cached entry and keep the cache.
+    """
+    cached = await _cached_login_options()
+    if cached is None:
+        return
+    if data.get("action") == "updated" and "full_name" in data:
+        option = next((u for u in cached if u.id == data.get("user_id")), None)
+        if data.get("status") == "active":
+            if option is not None and (
+                option.username,
+                option.full_name,
+                option.role,
+            ) == (data.get("username"), data["full_name"], data.get("role")):
+                return
+        elif option is None:
+            return
+    try:
+        await redis_client.delete_value(LOGIN_OPTIONS_KEY)
+    except Exception as e:
+        print(f"⚠️ Login options cache delete failed: {e}")
+
 
 async def get_user_by_id(user_id: int) -> UserResponse | None:
-    async with db_client.get_client() as client:
-        try:
-            response = await client.get(f"/users/{user_id}")
+    client = await db_client.get_client()
+    try:
+        response = await client.get(f"/users/{user_id}")
 
-            if response.status_code == 404:
-                return None
+        if response.status_code == 404:
+            return None
 
-            if response.status_code != 200:
-                return None
+        if response.status_code != 200:
+            return None
 
-            return UserResponse.model_validate(response.json())
+        return UserResponse.model_validate(codec.decode_response(response))
 
-        except httpx.ConnectError:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Database service unavailable",
-            )
-        except Exception:
-            return None
+    except httpx.ConnectError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database service unavailable",
+        )
+    except Exception:
+        return None
 
 
 async def get_user_by_pin(pin: int) -> UserResponse | None:
-    async with db_client.get_client() as client:
-        try:
-            response = await client.get(f"/users/pin/{pin}")
-
-            if response.status_code == 404:
-                return None
+    client = await db_client.get_client()
+    try:
+        response = await client.get(f"/users/pin/{pin}")
 
-            if response.status_code != 200:
-                return None
+        if response.status_code == 404:
+            return None
 
-            user = UserResponse.model_validate(response.json())
-            if user.status != "active":
-                return None
-            return user
+        if response.status_code != 200:
+            return None
 
-        except httpx.ConnectError:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Database service unavailable",
-            )
-        except Exception:
+        user = UserResponse.model_validate(codec.decode_response(response))
+        if user.status != "active":
             return None
+        return user
+
+    except httpx.ConnectError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database service unavailable",
+        )
+    except Exception:
+        return None
 
 
 async def create_user_in_db(user_in: UserCreate) -> UserResponse | None:
-    async with db_client.get_client() as client:
-        try:
-            response = await client.post("/users", json=user_in.model_dump())
+    client = await db_client.get_client()
+    try:
+        response = await client.post("/users", json=user_in.model_dump())
 
-            if response.status_code == 201:
-                return UserResponse.model_validate(response.json())
+        if response.status_code == 201:
+            return UserResponse.model_validate(codec.decode_response(response))
 
-            return None
+        return None
 
-        except httpx.ConnectError:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Database service unavailable",
-            )
-        except Exception:
-            return None
+    except httpx.ConnectError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database service unavailable",
+        )
+    except Exception:
+        return None
 
 
 async def update_last_login(id: int, username: str) -> bool:
-    async with db_client.get_client() as client:
-        try:
-            response = await client.put(
-                f"/users/{id}",
-                json={
-                    "id": id,
-                    "username": username,
-                    "last_login": datetime.utcnow().isoformat(),
-                },
-            )
-            print(response.content)
-            if response.status_code == 200:
-                return True
-            else:
-                return False
-        except httpx.ConnectError:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Database service unavailable",
-            )
-        except Exception as e:
-            print(e)
+    client = await db_client.get_client()
+    try:
+        response = await client.put(
+            f"/users/{id}",
+            json={
+                "id": id,
+                "username": username,
+                "last_login": datetime.utcnow().isoformat(),
+            },
+        )
+        if response.status_code == 200:
+            return True
+        else:
             return False
+    except httpx.ConnectError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database service unavailable",
+        )
+    except Exception as e:
+        print(e)
+        return False
@@ -52,7 +52,6 @@ class UserLoginOption(BaseModel):
     username: str
     full_name: str
     role: str
-    status: str
 
     # Very useful if your API returns snake_case
     model_config = ConfigDict(
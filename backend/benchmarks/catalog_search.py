@@ -0,0 +1,156 @@
+"""Time staff product search on a synthetic 50k-product catalog.
+
+Builds a catalog of mixed Latin and Cyrillic product titles in memory
+(seeded, so every run is the same), times the search index rebuild, then
+compares CatalogCache.search_products against the linear substring scan
+it replaced, query by query. Ends with a burst of incremental product
+updates. Needs no running services.
+
+    python backend/benchmarks/catalog_search.py [--products 50000] [--limit 50]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(BACKEND_DIR / "staff"), str(BACKEND_DIR)]
+
+from catalog import CatalogCache  # noqa: E402
+
+LATIN_WORDS = (
+    "non suv choy qahva sut go'sht tovuq osh lag'mon shokolad pepsi coca cola "
+    "olma banan apelsin sharbat pishloq yog' tuz shakar un guruch kolbasa "
+    "moroj pechene tort qatiq kefir smetana"
+).split()
+CYRILLIC_WORDS = (
+    "нон сув чой қаҳва сут гўшт товуқ ош лағмон шоколад молоко хлеб сыр масло "
+    "сахар чай кофе мясо курица рис"
+).split()
+CATEGORY_NAMES = (
+    "Ichimliklar",
+    "Напитки",
+    "Sut mahsulotlari",
+    "Shirinliklar",
+    "Go'sht",
+)
+SIZES = ("0.5l", "1l", "250g", "1kg", "")
+QUERIES = (
+    "c",
+    "ch",
+    "choy",
+    "qahva",
+    "kahva",
+    "қаҳва",
+    "lagmon",
+    "лағмон",
+    "go'sht",
+    "sut kef",
+    "pepsi 1l",
+    "#4999",
+    "xyzzy",
+)
+SEARCH_RUNS = 20
+SCAN_RUNS = 5
+UPDATES = 1000
+
+
+def build_catalog(product_count: int) -> CatalogCache:
+    rng = random.Random(7)
+    words = LATIN_WORDS + CYRILLIC_WORDS
+    brands = [
+        "".join(rng.choice("bcdfgklmnprstvz") + rng.choice("aeiou") for _ in range(3))
+        for _ in range(5000)
+    ]
+    categories = {
+        i: {"id": i, "name": rng.choice(CATEGORY_NAMES), "is_active": True}
+        for i in range(1, 21)
+    }
+    products = {}
+    for i in range(1, product_count + 1):
+        description = rng.choice(
+            [
+                None,
+                "Mazali " + rng.choice(LATIN_WORDS),
+                "Свежий " + rng.choice(CYRILLIC_WORDS),
+            ]
+        )
+        products[i] = {
+            "id": i,
+            "title": f"{rng.choice(words).capitalize()} {rng.choice(brands)} "
+            f"{rng.choice(SIZES)} #{i}",
+            "description": description,
+            "category_id": rng.randint(1, 20),
+            "is_active": rng.random() > 0.05,
+            "price": 1.0,
+            "quantity": -1,
+        }
+
+    catalog = CatalogCache()
+    catalog.products = products
+    catalog.categories = categories
+    return catalog
+
+
+def linear_scan(catalog: CatalogCache, query: str) -> list[dict]:
+    """The search this index replaced: a substring test on every product."""
+    query_lower = query.lower()
+    return [
+        p
+        for p in catalog.active_products()
+        if query_lower in p.get("title", "").lower()
+        or query_lower in (p.get("description") or "").lower()
+    ]
+
+
+def median_ms(fn, runs: int) -> tuple[float, int]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        hits = len(fn())
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, hits
+
+
+async def apply_updates(catalog: CatalogCache) -> None:
+    for i in range(UPDATES):
+        await catalog.handle_product_event(
+            {"action": "updated", "product_id": i + 1, "title": f"Yangi choy {i}"}
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=None, help="top-k per query")
+    args = parser.parse_args()
+
+    catalog = build_catalog(args.products)
+    started = time.perf_counter()
+    catalog.search_index.rebuild(catalog.products.values(), catalog._category_names())
+    catalog.loaded = True
+    print(f"index build: {(time.perf_counter() - started) * 1000:.0f} ms\n")
+
+    print(f"{'query':<12} {'index':>10} {'hits':>6}   {'linear':>10} {'hits':>6}")
+    for query in QUERIES:
+        indexed, hits = median_ms(
+            lambda: catalog.search_products(query, None, args.limit), SEARCH_RUNS
+        )
+        scanned, scan_hits = median_ms(lambda: linear_scan(catalog, query), SCAN_RUNS)
+        print(
+            f"{query!r:<12} {indexed:>7.2f} ms {hits:>6}   "
+            f"{scanned:>7.2f} ms {scan_hits:>6}"
+        )
+
+    started = time.perf_counter()
+    asyncio.run(apply_updates(catalog))
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"\n{UPDATES} incremental product updates: {elapsed:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
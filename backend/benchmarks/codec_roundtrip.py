@@ -0,0 +1,115 @@
+"""Round-trip event bodies through shared.codec and the stdlib json it replaced.
+
+Times an encode + decode round trip of two typical event bodies: an
+order.created with 30 items and a datetime, and a small status delta.
+First checks that codec output matches ``json.dumps(default=str)``, as
+consumers expect. The msgpack row is skipped when msgpack is not
+installed.
+
+    python backend/benchmarks/codec_roundtrip.py [--number 20000]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from shared import codec  # noqa: E402
+
+REPEAT = 5
+
+ITEMS = [
+    {
+        "id": i,
+        "product_id": 100 + i,
+        "product_name": f"Plov special {i}",
+        "category_id": i % 6,
+        "quantity": 1 + i % 3,
+        "price": 25000.0 + i * 500,
+        "subtotal": (25000.0 + i * 500) * (1 + i % 3),
+        "notes": "без лука" if i % 4 == 0 else None,
+    }
+    for i in range(30)
+]
+ORDER_CREATED = {
+    "action": "created",
+    "order_id": 4821,
+    "version": 1,
+    "user_id": 7,
+    "table_id": 12,
+    "status": "pending",
+    "subtotal_amount": 1234000.0,
+    "fee_percent": 10.0,
+    "fee_amount": 123400.0,
+    "total": 1357400.0,
+    "created_at": datetime(2026, 10, 16, 12, 30, 5),
+    "items": ITEMS,
+}
+STATUS_DELTA = {
+    "action": "status_updated",
+    "order_id": 4821,
+    "version": 5,
+    "user_id": 7,
+    "table_id": 12,
+    "category_ids": [0, 1, 2, 3, 4, 5],
+    "old_status": "pending",
+    "new_status": "ready",
+    "changes": {"status": "ready"},
+}
+
+
+def check_parity() -> None:
+    odd = {**ORDER_CREATED, "amount": Decimal("12.50"), 3: "int key"}
+    expected = json.loads(json.dumps(odd, default=str))
+    assert codec.loads(codec.dumps(odd)) == expected, "orjson output differs"
+    if codec.msgpack is not None:
+        decoded = codec.decode(codec.encode(odd, codec.MSGPACK), codec.MSGPACK)
+        assert decoded["created_at"] == expected["created_at"], "msgpack differs"
+
+
+def codecs(payload: dict):
+    yield (
+        "json (stdlib)",
+        lambda: json.loads(json.dumps(payload, default=str)),
+        len(json.dumps(payload, default=str).encode()),
+    )
+    yield (
+        "orjson",
+        lambda: codec.decode(codec.encode(payload)),
+        len(codec.encode(payload)),
+    )
+    if codec.msgpack is not None:
+        yield (
+            "msgpack",
+            lambda: codec.decode(codec.encode(payload, codec.MSGPACK), codec.MSGPACK),
+            len(codec.encode(payload, codec.MSGPACK)),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="round trips")
+    args = parser.parse_args()
+
+    check_parity()
+    if codec.msgpack is None:
+        print("msgpack not installed, skipping it")
+
+    for name, payload in (
+        ("order.created", ORDER_CREATED),
+        ("status delta", STATUS_DELTA),
+    ):
+        for label, round_trip, size in codecs(payload):
+            best = min(timeit.repeat(round_trip, number=args.number, repeat=REPEAT))
+            micros = best / args.number * 1e6
+            print(f"{name:<14} {label:<14} {micros:7.2f} us round trip  {size:5d} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Time database/crud/order.create_order for baskets of growing size.
+
+Runs against a throwaway file-backed SQLite database seeded with 200
+products, half of them stock-tracked. Prints the median and p95 of one
+create_order call per basket size. The broker is not part of the
+measurement: any direct publish is replaced with a no-op.
+
+    python backend/benchmarks/create_order.py [--sizes 1,10,30,60] [--orders 30]
+
+To compare against the per-item loop it replaced, check out
+backend/database/crud/order.py from before the batching change and run
+the script again.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(BACKEND_DIR / "database"), str(BACKEND_DIR)]
+
+PRODUCTS = 200
+
+
+async def _no_publish(*args, **kwargs):
+    return True
+
+
+async def _seed(session_factory, Product, User, UserRole, UserStatus):
+    async with session_factory() as db:
+        db.add(
+            User(
+                username="bench",
+                pin=1234,
+                full_name="Bench",
+                role=UserRole.STAFF,
+                status=UserStatus.ACTIVE,
+            )
+        )
+        for i in range(PRODUCTS):
+            # Odd ids track stock, even ids are unlimited (-1)
+            db.add(
+                Product(
+                    title=f"Product {i}", price=10 + i, quantity=10**9 if i % 2 else -1
+                )
+            )
+        await db.commit()
+
+
+async def run(sizes: list[int], orders: int) -> None:
+    import rabbitmq_client
+    from crud import order as crud
+    from database import AsyncSessionLocal, Base, engine
+    from models import Product, User, UserRole, UserStatus
+    from schemas.order import OrderCreate
+
+    rabbitmq_client.rabbitmq_client.publish = _no_publish
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await _seed(AsyncSessionLocal, Product, User, UserRole, UserStatus)
+
+    print(f"{'basket':>6}  {'median':>9}  {'p95':>9}")
+    for size in sizes:
+        timings = []
+        for _ in range(orders):
+            body = OrderCreate(
+                items=[
+                    {"product_id": 1 + j % PRODUCTS, "quantity": 1, "price": 1}
+                    for j in range(size)
+                ]
+            )
+            async with AsyncSessionLocal() as db:
+                started = time.perf_counter()
+                await crud.create_order(db, body, 1)
+                timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+        print(f"{size:>6}  {statistics.median(timings):>6.2f} ms  {p95:>6.2f} ms")
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1,10,30,60", help="basket sizes")
+    parser.add_argument("--orders", type=int, default=30, help="orders per size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Read by the database service's config on import
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/bench.db"
+        asyncio.run(run([int(n) for n in args.sizes.split(",")], args.orders))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Time waves of concurrent logins through auth's database client.
+
+A login is the two database-service calls auth makes: the PIN lookup,
+then the last_login update. Each wave fires --concurrency logins at once
+(a shift change). The script compares a fresh httpx client per call,
+which is what auth did before the shared client, with the pooled
+``crud.db_client``. Prints p50/p99 latency and logins per second.
+
+Needs a running database service at DATABASE_SERVICE_URL (default
+http://localhost:8002), e.g. with a scratch SQLite file:
+
+    cd backend/database && DATABASE_URL=sqlite+aiosqlite:///./bench.db \\
+        PYTHONPATH=.. uvicorn __init__:app --port 8002
+    python backend/benchmarks/login_throughput.py [--concurrency 40] [--waves 15]
+
+The first run creates active users bench_<pin> for PINs 1000 and up.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(BACKEND_DIR / "auth"), str(BACKEND_DIR)]
+
+import crud  # noqa: E402
+import httpx  # noqa: E402
+
+FIRST_PIN = 1000
+
+
+async def seed_users(count: int) -> None:
+    client = await crud.db_client.get_client()
+    for pin in range(FIRST_PIN, FIRST_PIN + count):
+        response = await client.get(f"/users/pin/{pin}")
+        if response.status_code == 200:
+            continue
+        response = await client.post(
+            "/users",
+            json={"username": f"bench_{pin}", "full_name": f"Bench {pin}", "pin": pin},
+        )
+        response.raise_for_status()
+        user_id = response.json()["id"]
+        response = await client.put(f"/users/{user_id}", json={"status": "active"})
+        response.raise_for_status()
+
+
+async def per_call_login(pin: int) -> None:
+    """Auth's login before the shared client: a new AsyncClient per call."""
+    base_url = crud.db_client.base_url
+    async with httpx.AsyncClient(base_url=base_url, timeout=10.0) as client:
+        user = (await client.get(f"/users/pin/{pin}")).json()
+    async with httpx.AsyncClient(base_url=base_url, timeout=10.0) as client:
+        await client.put(
+            f"/users/{user['id']}",
+            json={
+                "id": user["id"],
+                "username": user["username"],
+                "last_login": datetime.utcnow().isoformat(),
+            },
+        )
+
+
+async def pooled_login(pin: int) -> None:
+    user = await crud.get_user_by_pin(pin)
+    await crud.update_last_login(user.id, user.username)
+
+
+async def wave(login, concurrency: int) -> tuple[list[float], float]:
+    latencies = []
+
+    async def one(pin: int):
+        started = time.perf_counter()
+        await login(pin)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(FIRST_PIN + i) for i in range(concurrency)))
+    return latencies, time.perf_counter() - started
+
+
+async def run(concurrency: int, waves: int) -> None:
+    await crud.db_client.start()
+    try:
+        await seed_users(concurrency)
+        # Alternate so both see the same database state and warm-up
+        for name, login in (
+            ("per-call", per_call_login),
+            ("pooled", pooled_login),
+            ("per-call", per_call_login),
+            ("pooled", pooled_login),
+        ):
+            latencies, walls = [], []
+            for _ in range(waves):
+                wave_latencies, wall = await wave(login, concurrency)
+                latencies += wave_latencies
+                walls.append(wall)
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2]
+            p99 = latencies[int(len(latencies) * 0.99)]
+            rate = concurrency / statistics.median(walls)
+            print(
+                f"{name:<9} p50 {p50:7.1f} ms  p99 {p99:7.1f} ms  {rate:5.0f} logins/s"
+            )
+    finally:
+        await crud.db_client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=40, help="logins per wave")
+    parser.add_argument("--waves", type=int, default=15)
+    args = parser.parse_args()
+    asyncio.run(run(args.concurrency, args.waves))
+
+
+if __name__ == "__main__":
+    main()
@@ -14,11 +14,15 @@ from config import settings
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, RedirectResponse
 from rabbitmq_client import rabbitmq_client
-from sqlalchemy import text
+from sqlalchemy import inspect, text
 
-from database import Base, engine
+from crud import rollups
+from crud.outbox import outbox_relay
+from crud import users as users_crud
+from database import AsyncSessionLocal, Base, engine, read_engine
+from models import Order, User
 
 
 async def _ensure_table_location_column() -> None:
@@ -46,12 +50,68 @@ async def _ensure_table_location_column() -> None:
             )
 
 
+async def _ensure_order_version_column() -> None:
+    async with engine.begin() as conn:
+        cols = await conn.run_sync(
+            lambda sync_conn: inspect(sync_conn).get_columns("orders")
+        )
+        if "version" not in [col["name"] for col in cols]:
+            await conn.execute(
+                text("ALTER TABLE orders ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+            )
+
+
+async def _ensure_order_indexes() -> None:
+    # create_all skips indexes on tables that already exist.
+    def _create(sync_conn) -> None:
+        for index in Order.__table__.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(_create)
+
+
+async def _ensure_user_pin_lookup() -> None:
+    # Add and backfill users.pin_lookup before its unique index goes on,
+    # then create the users indexes create_all skips on existing tables.
+    if not settings.PIN_LOOKUP_KEY:
+        print(
+            "⚠️ PIN_LOOKUP_KEY is not set, PIN lookups are keyed with SECRET_KEY;"
+            " set a dedicated secret"
+        )
+    async with engine.begin() as conn:
+        cols = await conn.run_sync(
+            lambda sync_conn: inspect(sync_conn).get_columns("users")
+        )
+        if "pin_lookup" not in [col["name"] for col in cols]:
+            await conn.execute(
+                text("ALTER TABLE users ADD COLUMN pin_lookup VARCHAR(64)")
+            )
+    async with AsyncSessionLocal() as db:
+        changed = await users_crud.backfill_pin_lookups(db)
+    if changed:
+        print(f"✅ PIN lookups backfilled for {changed} users")
+
+    def _create(sync_conn) -> None:
+        for index in User.__table__.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(_create)
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     # Startup
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     await _ensure_table_location_column()
+    await _ensure_order_version_column()
+    await _ensure_order_indexes()
+    await _ensure_user_pin_lookup()
+    async with AsyncSessionLocal() as db:
+        if await rollups.rebuild_if_empty(db):
+            print("✅ Sales rollups backfilled")
 
     rabbitmq_connected = await rabbitmq_client.connect(retries=5, delay_seconds=2)
     if not rabbitmq_connected:
@@ -60,13 +120,19 @@ async def lifespan(_: FastAPI):
         print(
             "⚠️ Database Service started without RabbitMQ, background reconnect enabled"
         )
+    # Publishes events committed to the outbox, including any left from
+    # before a restart; it waits out a broker that is still connecting.
+    outbox_relay.start()
     print("✅ Database Service started on port 8003")
 
     yield
 
     # Shutdown
+    await outbox_relay.stop()
     await rabbitmq_client.close()
     await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
     print("👋 Database Service stopped")
 
 
@@ -75,6 +141,8 @@ app = FastAPI(
     version="1.2",
     lifespan=lifespan,
     root_path="/api/database",
+    # Every other service parses these bodies; orjson renders them faster
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -96,6 +164,12 @@ async def health():
     return {"status": "ok", "service": "database"}
 
 
+@app.get("/mq/stats", tags=["Health"])
+async def rabbitmq_stats():
+    """Published and failed event counts for this worker"""
+    return rabbitmq_client.stats()
+
+
 @app.exception_handler(RequestValidationError)
 async def request_validation_handler(request: Request, exc: RequestValidationError):
     def _json_safe(value):
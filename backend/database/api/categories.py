@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_db
+from database import get_db, get_read_db
 from crud import categories as crud
 from schemas import categories as schema
 
@@ -9,13 +9,13 @@ router = APIRouter(prefix="", tags=["Categories"])
 
 
 @router.get("", response_model=schema.CategoriesResponse)
-async def get_categories(db: AsyncSession = Depends(get_db)):
+async def get_categories(db: AsyncSession = Depends(get_read_db)):
     categories = await crud.get_categories(db)
     return {"categories": categories, "total": len(categories)}
 
 
 @router.get("/{category_id}", response_model=schema.CategoryResponse)
-async def get_category(category_id: int, db: AsyncSession = Depends(get_db)):
+async def get_category(category_id: int, db: AsyncSession = Depends(get_read_db)):
     category = await crud.get_category_by_id(db, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
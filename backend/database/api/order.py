@@ -1,8 +1,9 @@
+from datetime import datetime
 from typing import Optional
 
 from crud import order as crud
 from crud import table as table_crud
-from database import get_db
+from database import get_db, get_read_db
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from models import BusinessType, OrderStatus
 from schemas import order as schema
@@ -11,33 +12,69 @@ from sqlalchemy.ext.asyncio import AsyncSession
 router = APIRouter(tags=["Orders"])
 
 
+def order_list_params(
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        default=None, description="next_cursor from the previous page"
+    ),
+    start_date: Optional[datetime] = Query(default=None),
+    end_date: Optional[datetime] = Query(default=None),
+    lean: bool = Query(default=False, description="Skip nested product objects"),
+) -> schema.OrderListParams:
+    return schema.OrderListParams(
+        limit=limit,
+        cursor=cursor,
+        start_date=start_date,
+        end_date=end_date,
+        lean=lean,
+    )
+
+
+async def _list_orders(
+    db: AsyncSession,
+    params: schema.OrderListParams,
+    status_: Optional[OrderStatus] = None,
+    user_id: Optional[int] = None,
+) -> dict:
+    try:
+        orders, next_cursor = await crud.get_orders(
+            db, status_, user_id, **params.model_dump()
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"orders": orders, "total": len(orders), "next_cursor": next_cursor}
+
+
 @router.get("", response_model=schema.OrdersResponse)
 async def get_orders(
     status: Optional[OrderStatus] = None,
     user_id: Optional[int] = None,
-    db: AsyncSession = Depends(get_db),
+    params: schema.OrderListParams = Depends(order_list_params),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    orders = await crud.get_orders(db, status, user_id)
-    return {"orders": orders, "total": len(orders)}
+    return await _list_orders(db, params, status_=status, user_id=user_id)
 
 
 @router.get("/user/{user_id}", response_model=schema.OrdersResponse)
-async def get_orders_by_user(user_id: int, db: AsyncSession = Depends(get_db)):
-    orders = await crud.get_orders(db, user_id=user_id)
-    return {"orders": orders, "total": len(orders)}
+async def get_orders_by_user(
+    user_id: int,
+    params: schema.OrderListParams = Depends(order_list_params),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await _list_orders(db, params, user_id=user_id)
 
 
 @router.get("/status/{order_status}", response_model=schema.OrdersResponse)
 async def get_orders_by_status(
     order_status: OrderStatus,
-    db: AsyncSession = Depends(get_db),
+    params: schema.OrderListParams = Depends(order_list_params),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    orders = await crud.get_orders(db, status=order_status)
-    return {"orders": orders, "total": len(orders)}
+    return await _list_orders(db, params, status_=order_status)
 
 
 @router.get("/table/{table_id}", response_model=schema.OrdersResponse)
-async def get_orders_by_table(table_id: int, db: AsyncSession = Depends(get_db)):
+async def get_orders_by_table(table_id: int, db: AsyncSession = Depends(get_read_db)):
     table = await table_crud.get_table_by_id(db, table_id)
     if not table:
         raise HTTPException(
@@ -50,7 +87,7 @@ async def get_orders_by_table(table_id: int, db: AsyncSession = Depends(get_db))
 
 
 @router.get("/{order_id}", response_model=schema.OrderResponse)
-async def get_order(order_id: int, db: AsyncSession = Depends(get_db)):
+async def get_order(order_id: int, db: AsyncSession = Depends(get_read_db)):
     order = await crud.get_order_by_id(db, order_id)
     if not order:
         raise HTTPException(
@@ -1,5 +1,5 @@
 from crud import printer as crud
-from database import get_db
+from database import get_db, get_read_db
 from fastapi import APIRouter, Depends, HTTPException, status
 from schemas import printer as schema
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,13 +8,15 @@ router = APIRouter(tags=["Printers"])
 
 
 @router.get("", response_model=schema.PrintersResponse)
-async def get_printers(active_only: bool = False, db: AsyncSession = Depends(get_db)):
+async def get_printers(
+    active_only: bool = False, db: AsyncSession = Depends(get_read_db)
+):
     printers = await crud.get_printers(db, active_only=active_only)
     return {"printers": printers, "total": len(printers)}
 
 
 @router.get("/{printer_id}", response_model=schema.PrinterResponse)
-async def get_printer(printer_id: int, db: AsyncSession = Depends(get_db)):
+async def get_printer(printer_id: int, db: AsyncSession = Depends(get_read_db)):
     printer = await crud.get_printer_by_id(db, printer_id)
     if not printer:
         raise HTTPException(status_code=404, detail="Printer not found")
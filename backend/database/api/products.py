@@ -6,7 +6,7 @@ from pathlib import Path
 import shutil
 import uuid
 
-from database import get_db
+from database import get_db, get_read_db
 from crud import products as crud
 from schemas import products as schema
 
@@ -64,14 +64,14 @@ async def delete_product_image(image_filename: str):
 
 
 @router.get("", response_model=schema.ProductsResponse)
-async def get_products(db: AsyncSession = Depends(get_db)):
+async def get_products(db: AsyncSession = Depends(get_read_db)):
     """Get all products"""
     products = await crud.get_products(db)
     return {"products": products, "total": len(products)}
 
 
 @router.get("/{product_id}", response_model=schema.ProductResponse)
-async def get_product(product_id: int, db: AsyncSession = Depends(get_db)):
+async def get_product(product_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a specific product by ID"""
     product = await crud.get_product_by_id(db, product_id)
     if not product:
@@ -1,10 +1,16 @@
 # backend/database/api/reports.py
-from fastapi import APIRouter, Depends, Query
+import csv
+import io
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from datetime import datetime
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from database import get_db
+from database import ReadSessionLocal, get_db, get_read_db
 from crud import reports as crud
+from shared import codec
+from crud import rollups
 
 router = APIRouter()
 
@@ -13,18 +19,29 @@ router = APIRouter()
 async def get_sales_summary(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get sales summary statistics"""
     return await crud.get_sales_summary(db, start_date, end_date)
 
 
+@router.get("/sales/dashboard")
+async def get_sales_dashboard(
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get summary, top products, daily and hourly sales in one call"""
+    return await crud.get_sales_dashboard(db, start_date, end_date, limit)
+
+
 @router.get("/sales/top-products")
 async def get_top_products(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     limit: int = Query(10, ge=1, le=50),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get top selling products"""
     return await crud.get_top_products(db, start_date, end_date, limit)
@@ -34,7 +51,7 @@ async def get_top_products(
 async def get_sales_by_day(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get daily sales totals"""
     return await crud.get_sales_by_day(db, start_date, end_date)
@@ -44,63 +61,149 @@ async def get_sales_by_day(
 async def get_sales_by_hour(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get hourly sales distribution"""
     return await crud.get_sales_by_hour(db, start_date, end_date)
 
 
+@router.post("/rollups/rebuild")
+async def rebuild_rollups(db: AsyncSession = Depends(get_db)):
+    """Recompute the sales rollup tables from orders (backfill/repair)"""
+    return {"rebuilt": await rollups.rebuild(db)}
+
+
 @router.get("/inventory")
-async def get_inventory_report(db: AsyncSession = Depends(get_db)):
+async def get_inventory_report(db: AsyncSession = Depends(get_read_db)):
     """Get inventory status report"""
     return await crud.get_inventory_report(db)
 
 
+def _report_order_dict(order) -> dict:
+    return {
+        'id': order.id,
+        'user_id': order.user_id,
+        'table_id': order.table_id,
+        'total': float(order.total),
+        'status': order.status.value,
+        'created_at': order.created_at.isoformat(),
+        'updated_at': order.updated_at.isoformat() if order.updated_at else None,
+        'items': [
+            {
+                'id': item.id,
+                'product_id': item.product_id,
+                'quantity': item.quantity,
+                'price': float(item.price),
+                'subtotal': float(item.subtotal),
+                'product': {
+                    'id': item.product.id,
+                    'title': item.product.title,
+                    'price': float(item.product.price)
+                } if item.product else None
+            }
+            for item in order.items
+        ],
+        'user': {
+            'id': order.user.id,
+            'full_name': order.user.full_name,
+            'role': order.user.role
+        } if order.user else None,
+        'table': {
+            'id': order.table.id,
+            'number': order.table.number
+        } if order.table else None
+    }
+
+
+REPORT_CSV_COLUMNS = [
+    'order_id', 'created_at', 'status', 'user_id', 'user_name', 'table_number',
+    'order_total', 'item_id', 'product_id', 'product_title', 'quantity',
+    'price', 'subtotal',
+]
+
+
+def _report_order_csv_rows(order) -> list:
+    base = [
+        order.id,
+        order.created_at.isoformat(),
+        order.status.value,
+        order.user_id,
+        order.user.full_name if order.user else '',
+        order.table.number if order.table else '',
+        float(order.total),
+    ]
+    return [
+        base + [
+            item.id,
+            item.product_id,
+            item.product.title if item.product else '',
+            item.quantity,
+            float(item.price),
+            float(item.subtotal),
+        ]
+        for item in order.items
+    ] or [base + [''] * 6]
+
+
+async def _stream_report_orders(start_date, end_date, fmt: str):
+    # The response outlives request dependencies, so the stream owns its session.
+    async with ReadSessionLocal() as db:
+        if fmt == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(REPORT_CSV_COLUMNS)
+            yield buffer.getvalue()
+
+        async for orders in crud.iter_orders_for_report(db, start_date, end_date):
+            if fmt == 'csv':
+                buffer.seek(0)
+                buffer.truncate()
+                for order in orders:
+                    writer.writerows(_report_order_csv_rows(order))
+                yield buffer.getvalue()
+            else:
+                yield ''.join(
+                    codec.dumps_text(_report_order_dict(order)) + '\n' for order in orders
+                )
+
+
+@router.get("/orders/stream")
+async def stream_orders_for_report(
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    format: str = Query('ndjson', pattern='^(ndjson|csv)$'),
+):
+    """Stream orders for reporting as NDJSON (one order per line) or CSV (one row per item)"""
+    if format == 'csv':
+        return StreamingResponse(
+            _stream_report_orders(start_date, end_date, 'csv'),
+            media_type='text/csv',
+            headers={'Content-Disposition': 'attachment; filename="orders.csv"'},
+        )
+    return StreamingResponse(
+        _stream_report_orders(start_date, end_date, 'ndjson'),
+        media_type='application/x-ndjson',
+    )
+
+
 @router.get("/orders")
 async def get_orders_for_report(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: AsyncSession = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get all orders for reporting with full details"""
-    orders = await crud.get_orders_for_report(db, start_date, end_date)
-    
-    # Convert to dict for JSON response
-    result = []
-    for order in orders:
-        order_dict = {
-            'id': order.id,
-            'user_id': order.user_id,
-            'table_id': order.table_id,
-            'total': float(order.total),
-            'status': order.status.value,
-            'created_at': order.created_at.isoformat(),
-            'updated_at': order.updated_at.isoformat() if order.updated_at else None,
-            'items': [
-                {
-                    'id': item.id,
-                    'product_id': item.product_id,
-                    'quantity': item.quantity,
-                    'price': float(item.price),
-                    'subtotal': float(item.subtotal),
-                    'product': {
-                        'id': item.product.id,
-                        'title': item.product.title,
-                        'price': float(item.product.price)
-                    } if item.product else None
-                }
-                for item in order.items
-            ],
-            'user': {
-                'id': order.user.id,
-                'full_name': order.user.full_name,
-                'role': order.user.role
-            } if order.user else None,
-            'table': {
-                'id': order.table.id,
-                'number': order.table.number
-            } if order.table else None
-        }
-        result.append(order_dict)
-    
-    return {'orders': result, 'total': len(result)}
\ No newline at end of file
+    """Get all orders for reporting with full details
+
+    Pass ``limit`` to page through the range with ``next_cursor``.
+    """
+    try:
+        orders, next_cursor = await crud.get_orders_for_report(
+            db, start_date, end_date, limit, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    result = [_report_order_dict(order) for order in orders]
+    return {'orders': result, 'total': len(result), 'next_cursor': next_cursor}
@@ -1,8 +1,7 @@
-from database import get_db
+from crud import system_config as crud
+from database import get_db, get_read_db
 from fastapi import APIRouter, Depends, HTTPException, status
-from models import SystemConfig
 from pydantic import BaseModel, Field
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
@@ -26,21 +25,16 @@ class RestaurantProfileUpdate(BaseModel):
     business_phone: str = Field(..., min_length=1, max_length=40)
 
 
-async def _get_or_create_config(db: AsyncSession, key: str, default_value: str):
-    result = await db.execute(select(SystemConfig).where(SystemConfig.key == key))
-    config = result.scalars().first()
-    if not config:
-        config = SystemConfig(key=key, value=default_value)
-        db.add(config)
-        await db.commit()
-        await db.refresh(config)
-    return config
+@router.get("", response_model=dict[str, str])
+async def get_system_config(db: AsyncSession = Depends(get_read_db)):
+    """All settings at once, for callers that need more than one."""
+    return await crud.get_config_values(db)
 
 
 @router.get("/business_type", response_model=SystemConfigResponse)
-async def get_business_type(db: AsyncSession = Depends(get_db)):
-    config = await _get_or_create_config(db, "business_type", "market")
-    return SystemConfigResponse(key=config.key, value=config.value)
+async def get_business_type(db: AsyncSession = Depends(get_read_db)):
+    value = await crud.get_config_value(db, "business_type")
+    return SystemConfigResponse(key="business_type", value=value)
 
 
 @router.put("/business_type", response_model=SystemConfigResponse)
@@ -51,59 +45,49 @@ async def update_business_type(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid business type"
         )
-    config = await _get_or_create_config(db, "business_type", data.value)
-    config.value = data.value
-    await db.commit()
-    await db.refresh(config)
-    return SystemConfigResponse(key=config.key, value=config.value)
+    value = await crud.set_config_value(db, "business_type", data.value)
+    return SystemConfigResponse(key="business_type", value=value)
 
 
 @router.get("/service_fee_percent", response_model=SystemConfigResponse)
-async def get_service_fee_percent(db: AsyncSession = Depends(get_db)):
-    config = await _get_or_create_config(db, "service_fee_percent", "0")
-    return SystemConfigResponse(key=config.key, value=config.value)
+async def get_service_fee_percent(db: AsyncSession = Depends(get_read_db)):
+    value = await crud.get_config_value(db, "service_fee_percent")
+    return SystemConfigResponse(key="service_fee_percent", value=value)
 
 
 @router.put("/service_fee_percent", response_model=SystemConfigResponse)
 async def update_service_fee_percent(
     data: ServiceFeeUpdate, db: AsyncSession = Depends(get_db)
 ):
-    config = await _get_or_create_config(db, "service_fee_percent", "0")
-    config.value = str(round(float(data.value), 2))
-    await db.commit()
-    await db.refresh(config)
-    return SystemConfigResponse(key=config.key, value=config.value)
+    value = await crud.set_config_value(
+        db, "service_fee_percent", str(round(float(data.value), 2))
+    )
+    return SystemConfigResponse(key="service_fee_percent", value=value)
 
 
 @router.get("/business_name", response_model=SystemConfigResponse)
-async def get_business_name(db: AsyncSession = Depends(get_db)):
-    config = await _get_or_create_config(db, "business_name", "POS System")
-    return SystemConfigResponse(key=config.key, value=config.value)
+async def get_business_name(db: AsyncSession = Depends(get_read_db)):
+    value = await crud.get_config_value(db, "business_name")
+    return SystemConfigResponse(key="business_name", value=value)
 
 
 @router.put("/business_name", response_model=SystemConfigResponse)
 async def update_business_name(
     data: SystemConfigUpdate, db: AsyncSession = Depends(get_db)
 ):
-    config = await _get_or_create_config(db, "business_name", data.value.strip())
-    config.value = data.value.strip()
-    await db.commit()
-    await db.refresh(config)
-    return SystemConfigResponse(key=config.key, value=config.value)
+    value = await crud.set_config_value(db, "business_name", data.value.strip())
+    return SystemConfigResponse(key="business_name", value=value)
 
 
 @router.get("/business_phone", response_model=SystemConfigResponse)
-async def get_business_phone(db: AsyncSession = Depends(get_db)):
-    config = await _get_or_create_config(db, "business_phone", "+998")
-    return SystemConfigResponse(key=config.key, value=config.value)
+async def get_business_phone(db: AsyncSession = Depends(get_read_db)):
+    value = await crud.get_config_value(db, "business_phone")
+    return SystemConfigResponse(key="business_phone", value=value)
 
 
 @router.put("/business_phone", response_model=SystemConfigResponse)
 async def update_business_phone(
     data: SystemConfigUpdate, db: AsyncSession = Depends(get_db)
 ):
-    config = await _get_or_create_config(db, "business_phone", data.value.strip())
-    config.value = data.value.strip()
-    await db.commit()
-    await db.refresh(config)
-    return SystemConfigResponse(key=config.key, value=config.value)
+    value = await crud.set_config_value(db, "business_phone", data.value.strip())
+    return SystemConfigResponse(key="business_phone", value=value)
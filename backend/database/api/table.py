@@ -1,5 +1,5 @@
 from crud import table as crud
-from database import get_db
+from database import get_db, get_read_db
 from fastapi import APIRouter, Depends, HTTPException, status
 from models import TableStatus
 from schemas import table as schema
@@ -11,20 +11,20 @@ router = APIRouter(tags=["Tables"])
 @router.get("", response_model=schema.TablesResponse)
 async def get_tables(
     active_only: bool = False,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     tables = await crud.get_tables(db, active_only)
     return {"tables": tables, "total": len(tables)}
 
 
 @router.get("/available", response_model=schema.TablesResponse)
-async def get_available_tables(db: AsyncSession = Depends(get_db)):
+async def get_available_tables(db: AsyncSession = Depends(get_read_db)):
     tables = await crud.get_available_tables(db)
     return {"tables": tables, "total": len(tables)}
 
 
 @router.get("/{table_id}", response_model=schema.TableResponse)
-async def get_table(table_id: int, db: AsyncSession = Depends(get_db)):
+async def get_table(table_id: int, db: AsyncSession = Depends(get_read_db)):
     table = await crud.get_table_by_id(db, table_id)
     if not table:
         raise HTTPException(
@@ -1,5 +1,5 @@
 from crud import users as users_crud
-from database import get_db
+from database import get_db, get_read_db
 from fastapi import APIRouter, Depends, HTTPException, status
 from schemas import users as users_schema
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,18 +8,23 @@ user_router = APIRouter()
 
 
 @user_router.get("", response_model=users_schema.UsersResponse)
-async def get_users(db: AsyncSession = Depends(get_db)):
+async def get_users(db: AsyncSession = Depends(get_read_db)):
     return {"users": await users_crud.get_users(db)}
 
 
 @user_router.get("")
-async def get_usernames(status: str, db: AsyncSession = Depends(get_db)):
+async def get_usernames(status: str, db: AsyncSession = Depends(get_read_db)):
     usernames = await users_crud.get_usernames(db, status)
     return usernames
 
 
+@user_router.get("/login-options", response_model=users_schema.UserLoginOptionsResponse)
+async def get_login_options(db: AsyncSession = Depends(get_read_db)):
+    return {"users": await users_crud.get_login_options(db)}
+
+
 @user_router.get("/username/{username}", response_model=users_schema.UserResponse)
-async def get_user_by_username(username: str, db: AsyncSession = Depends(get_db)):
+async def get_user_by_username(username: str, db: AsyncSession = Depends(get_read_db)):
     user = await users_crud.get_user_by_username(db, username)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -27,7 +32,7 @@ async def get_user_by_username(username: str, db: AsyncSession = Depends(get_db)
 
 
 @user_router.get("/pin/{pin}", response_model=users_schema.UserResponse)
-async def get_user_by_pin(pin: int, db: AsyncSession = Depends(get_db)):
+async def get_user_by_pin(pin: int, db: AsyncSession = Depends(get_read_db)):
     user = await users_crud.get_user_by_pin(db, pin)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -35,7 +40,7 @@ async def get_user_by_pin(pin: int, db: AsyncSession = Depends(get_db)):
 
 
 @user_router.get("/{id}", response_model=users_schema.UserResponse)
-async def get_user_by_id(id: int, db: AsyncSession = Depends(get_db)):
+async def get_user_by_id(id: int, db: AsyncSession = Depends(get_read_db)):
     user = await users_crud.get_user_by_id(db, id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -4,6 +4,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import Category
 from schemas import categories as schema
+from crud import outbox
+
+
+def _category_event_payload(category: Category) -> dict:
+    return {
+        "category_id": category.id,
+        "name": category.name,
+        "description": category.description,
+        "is_active": category.is_active,
+        "created_at": category.created_at.isoformat() if category.created_at else None,
+        "updated_at": category.updated_at.isoformat() if category.updated_at else None,
+    }
 
 
 async def get_categories(db: AsyncSession) -> Sequence[Category]:
@@ -28,8 +40,15 @@ async def create_category(
     db.add(new_category)
 
     try:
-        await db.commit()
+        await db.flush()
         await db.refresh(new_category)
+        outbox.add_event(
+            db,
+            "category.created",
+            {"action": "created", **_category_event_payload(new_category)},
+        )
+        await db.commit()
+
         return new_category
     except Exception:
         await db.rollback()
@@ -47,8 +66,15 @@ async def update_category(
         setattr(existing_category, key, value)
 
     try:
-        await db.commit()
+        await db.flush()
         await db.refresh(existing_category)
+        outbox.add_event(
+            db,
+            "category.updated",
+            {"action": "updated", **_category_event_payload(existing_category)},
+        )
+        await db.commit()
+
         return existing_category
     except Exception:
         await db.rollback()
@@ -60,9 +86,13 @@ async def delete_category(db: AsyncSession, id: int) -> bool:
     if not category:
         return False
 
+    category_info = {"category_id": category.id, "name": category.name}
+
     try:
         await db.delete(category)
+        outbox.add_event(db, "category.deleted", {"action": "deleted", **category_info})
         await db.commit()
+
         return True
     except Exception:
         await db.rollback()
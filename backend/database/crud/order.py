@@ -1,6 +1,7 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
+from crud import outbox, rollups
 from crud.table import update_table_status
 from models import (
     BusinessType,
@@ -11,20 +12,33 @@ from models import (
     Table,
     TableStatus,
 )
-from rabbitmq_client import rabbitmq_client
 from schemas.order import OrderCreate, OrderUpdate
-from sqlalchemy import and_, select
+from sqlalchemy import and_, literal, or_, select
+from sqlalchemy.dialects.sqlite import DATETIME as SQLITE_DATETIME
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import noload, selectinload
 
 
 def _order_status_value(status: OrderStatus | str) -> str:
     return status.value if isinstance(status, OrderStatus) else str(status)
 
 
+def _item_event_payload(item: OrderItem) -> dict:
+    return {
+        "item_id": item.id,
+        "product_id": item.product_id,
+        "category_id": item.product.category_id if item.product else None,
+        "title": item.product.title if item.product else None,
+        "quantity": item.quantity,
+        "price": float(item.price),
+        "subtotal": float(item.subtotal),
+    }
+
+
 def _build_order_event_payload(order: Order) -> dict:
     return {
         "order_id": order.id,
+        "version": order.version,
         "user_id": order.user_id,
         "table_id": order.table_id,
         "table_number": order.table.number if order.table else None,
@@ -34,42 +48,186 @@ def _build_order_event_payload(order: Order) -> dict:
         "fee_amount": float(order.fee_amount),
         "total": float(order.total),
         "created_at": order.created_at.isoformat() if order.created_at else None,
-        "items": [
-            {
-                "item_id": item.id,
-                "product_id": item.product_id,
-                "title": item.product.title if item.product else None,
-                "quantity": item.quantity,
-                "price": float(item.price),
-                "subtotal": float(item.subtotal),
-            }
-            for item in order.items
-        ],
+        "items": [_item_event_payload(item) for item in order.items],
+    }
+
+
+def _order_fields(order: Order) -> dict:
+    """Scalar order state that delta events report when it changes."""
+    return {
+        "status": _order_status_value(order.status),
+        "table_id": order.table_id,
+        "subtotal_amount": float(order.subtotal_amount),
+        "fee_percent": float(order.fee_percent),
+        "fee_amount": float(order.fee_amount),
+        "total": float(order.total),
     }
 
 
+def _changed_fields(before: dict, order: Order) -> dict:
+    return {
+        field: value
+        for field, value in _order_fields(order).items()
+        if before.get(field) != value
+    }
+
+
+def _bump_version(order: Order) -> None:
+    # Incremented in SQL so concurrent writers never hand out the same number
+    order.version = Order.version + 1
+
+
+def _category_ids(order: Order) -> set:
+    return {item.product.category_id for item in order.items if item.product}
+
+
+def _add_order_delta(
+    db: AsyncSession,
+    order: Order,
+    action: str,
+    category_ids: set,
+    version: int | None = None,
+    **fields,
+) -> None:
+    """Queue ``order.<action>`` with only what changed.
+
+    Every delta carries the order's new ``version`` (one more than the last
+    event for that order) plus the fields subscribers route on; a client
+    that sees a gap asks the order service for a snapshot instead.
+    """
+    outbox.add_event(
+        db,
+        f"order.{action}",
+        {
+            "action": action,
+            "order_id": order.id,
+            "version": order.version if version is None else version,
+            "user_id": order.user_id,
+            "table_id": order.table_id,
+            "category_ids": sorted(c for c in category_ids if c is not None),
+            **fields,
+        },
+    )
+
+
+def _add_stock_changes(db: AsyncSession, products) -> None:
+    # Orders move stock without going through crud.products, so tell
+    # catalog caches about the new quantities of tracked products.
+    changed = {
+        product.id: product.quantity
+        for product in products
+        if product is not None and product.quantity != -1
+    }
+    if not changed:
+        return
+    outbox.add_event(
+        db,
+        "product.stock_changed",
+        {
+            "action": "stock_changed",
+            "products": [
+                {"product_id": product_id, "quantity": quantity}
+                for product_id, quantity in changed.items()
+            ],
+        },
+    )
+
+
+def _as_utc_naive(value: datetime) -> datetime:
+    # created_at is stored as naive UTC (SQLite CURRENT_TIMESTAMP)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _created_at_literal(value: datetime):
+    # Server-default timestamps are stored without a fractional part, so bind
+    # whole-second cursors the same way to keep "=" comparisons exact.
+    return literal(
+        value,
+        type_=SQLITE_DATETIME(truncate_microseconds=value.microsecond == 0),
+    )
+
+
+def encode_order_cursor(order: Order) -> str:
+    return f"{order.created_at.isoformat()},{order.id}"
+
+
+def decode_order_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, order_id = cursor.rsplit(",", 1)
+        return _as_utc_naive(datetime.fromisoformat(created_at)), int(order_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def order_cursor_condition(cursor: str):
+    """Rows strictly after ``cursor`` in (created_at desc, id desc) order."""
+    cursor_created_at, cursor_id = decode_order_cursor(cursor)
+    created_at = _created_at_literal(cursor_created_at)
+    return or_(
+        Order.created_at < created_at,
+        and_(Order.created_at == created_at, Order.id < cursor_id),
+    )
+
+
 async def get_orders(
     db: AsyncSession,
     status: Optional[OrderStatus] = None,
     user_id: Optional[int] = None,
-):
-    stmt = (
-        select(Order)
-        .options(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    lean: bool = False,
+) -> tuple[list[Order], Optional[str]]:
+    """Return one page of orders (newest first) and the cursor of the next page.
+
+    Pages are keyed on (created_at, id), so each page is an index range scan
+    no matter how deep the caller pages. ``lean`` skips the nested product,
+    user and table objects.
+    """
+    if lean:
+        options = (
+            selectinload(Order.items).noload(OrderItem.product),
+            noload(Order.user),
+            noload(Order.table),
+        )
+    else:
+        options = (
             selectinload(Order.items).selectinload(OrderItem.product),
             selectinload(Order.user),
             selectinload(Order.table),
         )
-        .order_by(Order.created_at.desc())
+
+    stmt = (
+        select(Order)
+        .options(*options)
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(limit + 1)
     )
 
     if status:
         stmt = stmt.where(Order.status == status)
     if user_id:
         stmt = stmt.where(Order.user_id == user_id)
+    if start_date:
+        start_date = _as_utc_naive(start_date)
+        stmt = stmt.where(Order.created_at >= _created_at_literal(start_date))
+    if end_date:
+        end_date = _as_utc_naive(end_date)
+        stmt = stmt.where(Order.created_at < _created_at_literal(end_date))
+    if cursor:
+        stmt = stmt.where(order_cursor_condition(cursor))
 
     result = await db.execute(stmt)
-    return result.unique().scalars().all()
+    orders = list(result.unique().scalars().all())
+
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        next_cursor = encode_order_cursor(orders[-1])
+    return orders, next_cursor
 
 
 async def get_order_by_id(db: AsyncSession, order_id: int):
@@ -114,6 +272,7 @@ async def create_order(db: AsyncSession, order: OrderCreate, user_id: int):
     if order.business_type == BusinessType.MARKET and order.table_id:
         raise ValueError("Table ID should not be set for market orders")
 
+    table = None
     if order.table_id:
         table_stmt = select(Table).where(Table.id == order.table_id)
         table_result = await db.execute(table_stmt)
@@ -126,54 +285,64 @@ async def create_order(db: AsyncSession, order: OrderCreate, user_id: int):
         if table.status != TableStatus.AVAILABLE:
             raise ValueError(f"Table {table.number} is not available")
 
-    db_order = Order(
-        user_id=user_id,
-        table_id=order.table_id,
-        status=OrderStatus.PENDING,
+    # Load every product in the basket with a single IN (...) query and
+    # validate stock against the summed quantity per product, so repeated
+    # lines for the same product cannot oversell.
+    product_ids = list(dict.fromkeys(item.product_id for item in order.items))
+    products_result = await db.execute(
+        select(Product).where(Product.id.in_(product_ids))
     )
-    db_order.fee_percent = order.fee_percent
+    products = {product.id: product for product in products_result.scalars()}
 
-    total = 0.0
+    requested: dict[int, int] = {}
     for item in order.items:
-        stmt = select(Product).where(Product.id == item.product_id)
-        result = await db.execute(stmt)
-        product = result.scalar_one_or_none()
+        requested[item.product_id] = requested.get(item.product_id, 0) + item.quantity
 
+    for product_id, quantity in requested.items():
+        product = products.get(product_id)
         if not product:
-            raise ValueError(f"Product with id {item.product_id} not found")
-
+            raise ValueError(f"Product with id {product_id} not found")
         if not product.is_active:
             raise ValueError(f"Product {product.title} is not active")
-
-        if product.quantity != -1 and product.quantity < item.quantity:
+        if product.quantity != -1 and product.quantity < quantity:
             raise ValueError(f"Insufficient quantity for {product.title}")
 
-        subtotal = float(product.price) * item.quantity
-        total += subtotal
+    db_order = Order(
+        user_id=user_id,
+        table_id=order.table_id,
+        status=OrderStatus.PENDING,
+    )
+    db_order.fee_percent = order.fee_percent
 
-        order_item = OrderItem(
-            product_id=product.id,
-            quantity=item.quantity,
-            price=float(product.price),
-            subtotal=subtotal,
+    for item in order.items:
+        product = products[item.product_id]
+        price = float(product.price)
+        db_order.items.append(
+            OrderItem(
+                product_id=product.id,
+                quantity=item.quantity,
+                price=price,
+                subtotal=price * item.quantity,
+            )
         )
-        db_order.items.append(order_item)
 
+    for product_id, quantity in requested.items():
+        product = products[product_id]
         if product.quantity != -1:
-            product.quantity -= item.quantity
+            product.quantity -= quantity
 
     db_order.calculate_total()
 
-    if order.table_id:
-        await update_table_status(
-            db, order.table_id, TableStatus.OCCUPIED, auto_commit=False
-        )
+    if table is not None:
+        table.status = TableStatus.OCCUPIED
 
     db.add(db_order)
-    await db.commit()
-    await db.refresh(db_order)
+    await db.flush()
+    await db.refresh(db_order, attribute_names=["created_at"])
+    await rollups.apply_change(db, None, rollups.snapshot(db_order))
+    await db.flush()
 
-    # Eagerly load relationships to avoid lazy loading issues
+    # One eager reload for the response and the event payload
     stmt = (
         select(Order)
         .options(
@@ -182,28 +351,16 @@ async def create_order(db: AsyncSession, order: OrderCreate, user_id: int):
             selectinload(Order.table),
         )
         .where(Order.id == db_order.id)
+        .execution_options(populate_existing=True)
     )
     result = await db.execute(stmt)
     loaded_order = result.unique().scalar_one()
 
-    # Access the relationships to load them into memory
-    _ = loaded_order.items
-    _ = loaded_order.user
-    if loaded_order.table:
-        _ = loaded_order.table
-
-    try:
-        event_data = _build_order_event_payload(loaded_order)
-        await rabbitmq_client.publish(
-            "order.created",
-            {"action": "created", **event_data},
-        )
-        await rabbitmq_client.publish(
-            "kitchen.new_order",
-            {"action": "start_cooking", **event_data},
-        )
-    except Exception as e:
-        print(f"⚠️  Failed to publish order.created/kitchen.new_order event: {e}")
+    event_data = _build_order_event_payload(loaded_order)
+    outbox.add_event(db, "order.created", {"action": "created", **event_data})
+    outbox.add_event(db, "kitchen.new_order", {"action": "start_cooking", **event_data})
+    _add_stock_changes(db, products.values())
+    await db.commit()
 
     return loaded_order
 
@@ -218,6 +375,8 @@ async def update_order(db: AsyncSession, order_id: int, order: OrderUpdate):
 
     old_status = db_order.status
     old_table_id = db_order.table_id
+    before = rollups.snapshot(db_order)
+    before_fields = _order_fields(db_order)
 
     if order.status is not None:
         if (
@@ -256,7 +415,11 @@ async def update_order(db: AsyncSession, order_id: int, order: OrderUpdate):
             db, order.table_id, TableStatus.OCCUPIED, auto_commit=False
         )
 
-    await db.commit()
+    changes = _changed_fields(before_fields, db_order)
+    if changes:
+        _bump_version(db_order)
+    await rollups.apply_change(db, before, rollups.snapshot(db_order))
+    await db.flush()
     await db.refresh(db_order)
 
     stmt = (
@@ -271,20 +434,34 @@ async def update_order(db: AsyncSession, order_id: int, order: OrderUpdate):
     result = await db.execute(stmt)
     loaded_order = result.unique().scalar_one()
 
-    if order.status is not None and old_status != loaded_order.status:
-        try:
-            event_data = _build_order_event_payload(loaded_order)
-            await rabbitmq_client.publish(
-                "order.status_updated",
-                {
-                    "action": "status_updated",
-                    "old_status": _order_status_value(old_status),
-                    "new_status": _order_status_value(loaded_order.status),
-                    **event_data,
-                },
-            )
-        except Exception as e:
-            print(f"⚠️  Failed to publish order.status_updated event: {e}")
+    moved = {}
+    if "table_id" in changes:
+        changes["table_number"] = (
+            loaded_order.table.number if loaded_order.table else None
+        )
+        # Subscribers of the table the order left need the move too
+        moved["old_table_id"] = old_table_id
+    if "status" in changes:
+        _add_order_delta(
+            db,
+            loaded_order,
+            "status_updated",
+            _category_ids(loaded_order),
+            old_status=_order_status_value(old_status),
+            new_status=changes["status"],
+            changes=changes,
+            **moved,
+        )
+    elif changes:
+        _add_order_delta(
+            db,
+            loaded_order,
+            "updated",
+            _category_ids(loaded_order),
+            changes=changes,
+            **moved,
+        )
+    await db.commit()
 
     return loaded_order
 
@@ -306,6 +483,8 @@ async def add_order_item(db: AsyncSession, order_id: int, item):
 
     if db_order.status in [OrderStatus.COMPLETED, OrderStatus.CANCELLED]:
         raise ValueError("Cannot modify completed or cancelled orders")
+    before = rollups.snapshot(db_order)
+    before_fields = _order_fields(db_order)
 
     product_stmt = select(Product).where(Product.id == item.product_id)
     product_result = await db.execute(product_stmt)
@@ -331,10 +510,23 @@ async def add_order_item(db: AsyncSession, order_id: int, item):
         product.quantity -= item.quantity
 
     db_order.calculate_total()
-    await db.commit()
+    _bump_version(db_order)
+    await rollups.apply_change(db, before, rollups.snapshot(db_order))
+    await db.flush()
 
     result = await db.execute(stmt)
-    return result.unique().scalar_one()
+    loaded_order = result.unique().scalar_one()
+    _add_order_delta(
+        db,
+        loaded_order,
+        "item_added",
+        _category_ids(loaded_order),
+        item=_item_event_payload(db_item),
+        changes=_changed_fields(before_fields, loaded_order),
+    )
+    _add_stock_changes(db, [product])
+    await db.commit()
+    return loaded_order
 
 
 async def update_order_item(db: AsyncSession, order_id: int, item_id: int, item):
@@ -354,6 +546,8 @@ async def update_order_item(db: AsyncSession, order_id: int, item_id: int, item)
 
     if db_order.status in [OrderStatus.COMPLETED, OrderStatus.CANCELLED]:
         raise ValueError("Cannot modify completed or cancelled orders")
+    before = rollups.snapshot(db_order)
+    before_fields = _order_fields(db_order)
 
     item_stmt = select(OrderItem).where(
         and_(OrderItem.id == item_id, OrderItem.order_id == order_id)
@@ -378,15 +572,37 @@ async def update_order_item(db: AsyncSession, order_id: int, item_id: int, item)
     elif qty_diff < 0 and product and product.quantity != -1:
         product.quantity += abs(qty_diff)
 
+    changed = qty_diff != 0 or new_price != float(db_item.price)
     db_item.quantity = new_quantity
     db_item.price = new_price
     db_item.subtotal = new_quantity * new_price
 
     db_order.calculate_total()
-    await db.commit()
+    if changed:
+        _bump_version(db_order)
+    await rollups.apply_change(db, before, rollups.snapshot(db_order))
+    await db.flush()
 
     order_result = await db.execute(order_stmt)
-    return order_result.unique().scalar_one()
+    loaded_order = order_result.unique().scalar_one()
+    if changed:
+        _add_order_delta(
+            db,
+            loaded_order,
+            "item_updated",
+            _category_ids(loaded_order),
+            item={
+                "item_id": db_item.id,
+                "quantity": db_item.quantity,
+                "price": float(db_item.price),
+                "subtotal": float(db_item.subtotal),
+            },
+            changes=_changed_fields(before_fields, loaded_order),
+        )
+    if qty_diff:
+        _add_stock_changes(db, [product])
+    await db.commit()
+    return loaded_order
 
 
 async def remove_order_item(db: AsyncSession, order_id: int, item_id: int):
@@ -406,6 +622,8 @@ async def remove_order_item(db: AsyncSession, order_id: int, item_id: int):
 
     if db_order.status in [OrderStatus.COMPLETED, OrderStatus.CANCELLED]:
         raise ValueError("Cannot modify completed or cancelled orders")
+    before = rollups.snapshot(db_order)
+    before_fields = _order_fields(db_order)
 
     item_stmt = select(OrderItem).where(
         and_(OrderItem.id == item_id, OrderItem.order_id == order_id)
@@ -421,13 +639,30 @@ async def remove_order_item(db: AsyncSession, order_id: int, item_id: int):
     if product and product.quantity != -1:
         product.quantity += db_item.quantity
 
+    # Drop it from the loaded collection too, otherwise the total and the
+    # rollup snapshot below would still count the removed line.
+    db_order.items.remove(db_item)
     await db.delete(db_item)
     await db.flush()
     db_order.calculate_total()
-    await db.commit()
+    _bump_version(db_order)
+    await rollups.apply_change(db, before, rollups.snapshot(db_order))
+    await db.flush()
 
     order_result = await db.execute(order_stmt)
-    return order_result.unique().scalar_one()
+    loaded_order = order_result.unique().scalar_one()
+    _add_order_delta(
+        db,
+        loaded_order,
+        "item_removed",
+        # Category screens showing the removed line need to hear about it
+        _category_ids(loaded_order) | {product.category_id if product else None},
+        item_id=item_id,
+        changes=_changed_fields(before_fields, loaded_order),
+    )
+    _add_stock_changes(db, [product])
+    await db.commit()
+    return loaded_order
 
 
 async def delete_order(db: AsyncSession, order_id: int):
@@ -438,20 +673,34 @@ async def delete_order(db: AsyncSession, order_id: int):
     if not db_order:
         return False
 
+    product_ids = {item.product_id for item in db_order.items}
+    products_result = await db.execute(
+        select(Product).where(Product.id.in_(product_ids))
+    )
+    products = {product.id: product for product in products_result.scalars()}
+
+    restocked = []
     if db_order.status != OrderStatus.COMPLETED:
         for item in db_order.items:
-            stmt = select(Product).where(Product.id == item.product_id)
-            result = await db.execute(stmt)
-            product = result.scalar_one_or_none()
-
+            product = products.get(item.product_id)
             if product and product.quantity != -1:
                 product.quantity += item.quantity
+                restocked.append(product)
 
     if db_order.table_id:
         await update_table_status(
             db, db_order.table_id, TableStatus.AVAILABLE, auto_commit=False
         )
 
+    await rollups.apply_change(db, rollups.snapshot(db_order), None)
+    _add_order_delta(
+        db,
+        db_order,
+        "deleted",
+        {product.category_id for product in products.values()},
+        version=db_order.version + 1,
+    )
+    _add_stock_changes(db, restocked)
     await db.delete(db_order)
     await db.commit()
     return True
@@ -0,0 +1,116 @@
+import asyncio
+
+from config import settings
+from database import AsyncSessionLocal
+from models import OutboxEvent
+from rabbitmq_client import rabbitmq_client
+from sqlalchemy import delete, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from shared import codec
+
+_PENDING = "outbox_pending"
+
+
+def add_event(db: AsyncSession, routing_key: str, payload: dict) -> None:
+    """Queue an event in the caller's transaction.
+
+    It is stored only if that transaction commits, and the relay publishes it
+    from there, so a write and its event are never separated by a crash or a
+    broker outage.
+    """
+    db.add(OutboxEvent(routing_key=routing_key, payload=codec.dumps_text(payload)))
+    db.info[_PENDING] = True
+
+
+class OutboxRelay:
+    """Background task that publishes committed outbox rows, oldest first.
+
+    Each batch is published with its confirms pipelined and the confirmed
+    prefix is deleted. Rows after a failure, or caught by a crash before the
+    delete, are published again, so delivery is at-least-once; order events
+    carry a version that lets consumers drop repeats.
+    """
+
+    def __init__(self):
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                published, pending = await self.relay_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Outbox relay failed: {e}")
+                published, pending = 0, True
+
+            if pending and not published:
+                # Broker unavailable: keep the rows and back off
+                await asyncio.sleep(settings.OUTBOX_RETRY_SECONDS)
+            elif not pending:
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(), timeout=settings.OUTBOX_POLL_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+    async def relay_batch(self) -> tuple[int, bool]:
+        """Publish one batch; returns (published, rows still pending)."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(OutboxEvent)
+                .order_by(OutboxEvent.id)
+                .limit(settings.OUTBOX_BATCH_SIZE)
+            )
+            rows = result.scalars().all()
+            if not rows:
+                return 0, False
+
+            confirmed = 0
+            try:
+                confirmed = await rabbitmq_client.publish_many(
+                    [(row.routing_key, codec.loads(row.payload)) for row in rows]
+                )
+            finally:
+                if confirmed:
+                    published_ids = [row.id for row in rows[:confirmed]]
+                    await db.execute(
+                        delete(OutboxEvent).where(OutboxEvent.id.in_(published_ids))
+                    )
+                    await db.commit()
+            return confirmed, True
+
+
+outbox_relay = OutboxRelay()
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_relay(session: Session) -> None:
+    if session.info.pop(_PENDING, False):
+        outbox_relay.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_pending(session: Session) -> None:
+    session.info.pop(_PENDING, None)
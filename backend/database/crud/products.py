@@ -4,7 +4,24 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import Product
 from schemas import products as schema
-from rabbitmq_client import rabbitmq_client
+from crud import outbox
+
+
+def product_event_payload(product: Product) -> dict:
+    """Full product state, so subscribers can patch caches from the event alone"""
+    return {
+        "product_id": product.id,
+        "title": product.title,
+        "description": product.description,
+        "category_id": product.category_id,
+        "price": float(product.price) if product.price else 0,
+        "quantity": product.quantity,
+        "is_active": product.is_active,
+        "image_url": product.image_url,
+        "image_filename": product.image_filename,
+        "created_at": product.created_at.isoformat() if product.created_at else None,
+        "updated_at": product.updated_at.isoformat() if product.updated_at else None,
+    }
 
 
 async def get_products(db: AsyncSession) -> Sequence[Product]:
@@ -31,26 +48,14 @@ async def create_product(db: AsyncSession, product: schema.ProductCreate) -> Pro
     db.add(new_product)
 
     try:
-        await db.commit()
+        await db.flush()
         await db.refresh(new_product)
-
-        # Publish event to RabbitMQ
-        try:
-            await rabbitmq_client.publish(
-                "product.created",
-                {
-                    "action": "created",
-                    "product_id": new_product.id,
-                    "title": new_product.title,
-                    "category_id": new_product.category_id,
-                    "price": float(new_product.price) if new_product.price else 0,
-                    "cost": float(new_product.cost) if new_product.cost else None,
-                    "quantity": new_product.quantity,
-                    "is_active": new_product.is_active,
-                },
-            )
-        except Exception as e:
-            print(f"⚠️  Failed to publish product.created event: {e}")
+        outbox.add_event(
+            db,
+            "product.created",
+            {"action": "created", **product_event_payload(new_product)},
+        )
+        await db.commit()
 
         return new_product
     except Exception:
@@ -79,50 +84,41 @@ async def update_product(
         setattr(existing_product, key, value)
 
     try:
-        await db.commit()
+        await db.flush()
         await db.refresh(existing_product)
 
-        # Publish event
-        try:
-            event_data = {
-                "action": "updated",
-                "product_id": existing_product.id,
-                "title": existing_product.title,
-                "category_id": existing_product.category_id,
-                "price": float(existing_product.price) if existing_product.price else 0,
-                "cost": float(existing_product.cost) if existing_product.cost else None,
-                "quantity": existing_product.quantity,
-                "is_active": existing_product.is_active,
-            }
-
-            # Add change flags
-            if old_values["price"] != event_data["price"]:
-                event_data["price_changed"] = True
-                event_data["old_price"] = old_values["price"]
-                event_data["new_price"] = event_data["price"]
-
-            if old_values["quantity"] != event_data["quantity"]:
-                event_data["quantity_changed"] = True
-                event_data["old_quantity"] = old_values["quantity"]
-                event_data["new_quantity"] = event_data["quantity"]
-
-            if old_values["is_active"] != event_data["is_active"]:
-                event_data["status_changed"] = True
-                event_data["old_status"] = (
-                    "active" if old_values["is_active"] else "inactive"
-                )
-                event_data["new_status"] = (
-                    "active" if event_data["is_active"] else "inactive"
-                )
-
-            if old_values["category_id"] != event_data["category_id"]:
-                event_data["category_changed"] = True
-                event_data["old_category_id"] = old_values["category_id"]
-                event_data["new_category_id"] = event_data["category_id"]
-
-            await rabbitmq_client.publish("product.updated", event_data)
-        except Exception as e:
-            print(f"⚠️  Failed to publish product.updated event: {e}")
+        event_data = {
+            "action": "updated",
+            **product_event_payload(existing_product),
+        }
+
+        # Add change flags
+        if old_values["price"] != event_data["price"]:
+            event_data["price_changed"] = True
+            event_data["old_price"] = old_values["price"]
+            event_data["new_price"] = event_data["price"]
+
+        if old_values["quantity"] != event_data["quantity"]:
+            event_data["quantity_changed"] = True
+            event_data["old_quantity"] = old_values["quantity"]
+            event_data["new_quantity"] = event_data["quantity"]
+
+        if old_values["is_active"] != event_data["is_active"]:
+            event_data["status_changed"] = True
+            event_data["old_status"] = (
+                "active" if old_values["is_active"] else "inactive"
+            )
+            event_data["new_status"] = (
+                "active" if event_data["is_active"] else "inactive"
+            )
+
+        if old_values["category_id"] != event_data["category_id"]:
+            event_data["category_changed"] = True
+            event_data["old_category_id"] = old_values["category_id"]
+            event_data["new_category_id"] = event_data["category_id"]
+
+        outbox.add_event(db, "product.updated", event_data)
+        await db.commit()
 
         return existing_product
     except Exception:
@@ -146,20 +142,9 @@ async def delete_product(db: AsyncSession, product_id: int) -> bool:
 
     try:
         await db.delete(product)
+        outbox.add_event(db, "product.deleted", {"action": "deleted", **product_info})
         await db.commit()
 
-        # Publish event
-        try:
-            await rabbitmq_client.publish(
-                "product.deleted",
-                {
-                    "action": "deleted",
-                    **product_info,
-                },
-            )
-        except Exception as e:
-            print(f"⚠️  Failed to publish product.deleted event: {e}")
-
         return True
     except Exception:
         await db.rollback()
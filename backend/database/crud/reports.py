@@ -1,16 +1,26 @@
-from datetime import date, datetime
-from typing import Any, Dict, List, Optional
-
-from models import Order, OrderItem, OrderStatus, Product, User
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from crud import rollups
+from crud.order import encode_order_cursor, order_cursor_condition
+from models import (
+    Order,
+    OrderItem,
+    OrderStatus,
+    Product,
+    ProductDailyRollup,
+    SalesHourlyRollup,
+    User,
+    UserDailyRollup,
+)
 from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 
 
-async def get_orders_for_report(
-    db: AsyncSession, start_date: Optional[date] = None, end_date: Optional[date] = None
-) -> List[Order]:
-    """Get orders for reporting (excluding cancelled orders)"""
-
+def _report_order_conditions(
+    start_date: Optional[date], end_date: Optional[date]
+) -> list:
     # Build conditions list
     conditions = [Order.status != OrderStatus.CANCELLED]
 
@@ -22,57 +32,201 @@ async def get_orders_for_report(
         conditions.append(
             Order.created_at < datetime.combine(end_date, datetime.max.time())
         )
+    return conditions
+
+
+async def get_orders_for_report(
+    db: AsyncSession,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Order], Optional[str]]:
+    """Get orders for reporting (excluding cancelled orders)
+
+    Without ``limit`` the whole range is returned; with it, one keyset page
+    plus the cursor of the next one.
+    """
+    conditions = _report_order_conditions(start_date, end_date)
+    if cursor:
+        conditions.append(order_cursor_condition(cursor))
 
     # Use and_() to combine conditions
-    stmt = select(Order).where(and_(*conditions)).order_by(Order.created_at.desc())
+    stmt = (
+        select(Order)
+        .options(
+            selectinload(Order.items).selectinload(OrderItem.product),
+            selectinload(Order.user),
+            selectinload(Order.table),
+        )
+        .where(and_(*conditions))
+        .order_by(Order.created_at.desc(), Order.id.desc())
+    )
+    if limit:
+        stmt = stmt.limit(limit + 1)
 
     result = await db.execute(stmt)
-    return list(result.scalars().all())
+    orders = list(result.unique().scalars().all())
 
+    next_cursor = None
+    if limit and len(orders) > limit:
+        orders = orders[:limit]
+        next_cursor = encode_order_cursor(orders[-1])
+    return orders, next_cursor
 
-async def get_sales_summary(
-    db: AsyncSession, start_date: Optional[date] = None, end_date: Optional[date] = None
-) -> Dict[str, Any]:
-    """Get sales summary statistics"""
 
-    # Build conditions
-    conditions = [Order.status != OrderStatus.CANCELLED]
+async def iter_orders_for_report(
+    db: AsyncSession,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    batch_size: int = 500,
+) -> AsyncIterator[List[Order]]:
+    """Yield report orders in batches from a server-side cursor.
+
+    Items/products are selectin-loaded per batch and user/table are joined.
+    The identity map only holds weak references, so memory is bounded by
+    ``batch_size`` rather than by the size of the range.
+    """
+    stmt = (
+        select(Order)
+        .options(
+            selectinload(Order.items).selectinload(OrderItem.product),
+            joinedload(Order.user),
+            joinedload(Order.table),
+        )
+        .where(and_(*_report_order_conditions(start_date, end_date)))
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .execution_options(yield_per=batch_size)
+    )
 
-    if start_date:
-        conditions.append(Order.created_at >= start_date)
+    result = await db.stream(stmt)
+    async for orders in result.scalars().partitions():
+        yield orders
 
-    if end_date:
+
+def _window_bounds(
+    start_date: Optional[date], end_date: Optional[date]
+) -> Tuple[Optional[datetime], Optional[date]]:
+    start = None
+    if start_date:
+        start = (
+            start_date
+            if isinstance(start_date, datetime)
+            else datetime.combine(start_date, datetime.min.time())
+        )
+    # The end date is inclusive of its whole day, as before.
+    end = end_date.date() if isinstance(end_date, datetime) else end_date
+    return start, end
+
+
+def _first_whole_bucket(start: datetime, daily: bool) -> datetime:
+    """Start of the first whole hour (or day) at or after ``start``."""
+    if daily:
+        bucket = datetime.combine(start.date(), datetime.min.time())
+        step = timedelta(days=1)
+    else:
+        bucket = start.replace(minute=0, second=0, microsecond=0)
+        step = timedelta(hours=1)
+    return bucket if bucket == start else bucket + step
+
+
+def _hourly_conditions(start_date: Optional[date], end_date: Optional[date]) -> list:
+    """Window on the hourly rollup, from the first whole hour of the start."""
+    start, end = _window_bounds(start_date, end_date)
+    conditions = []
+    if start:
+        start = _first_whole_bucket(start, daily=False)
         conditions.append(
-            Order.created_at < datetime.combine(end_date, datetime.max.time())
+            or_(
+                SalesHourlyRollup.day > start.date(),
+                and_(
+                    SalesHourlyRollup.day == start.date(),
+                    SalesHourlyRollup.hour >= start.hour,
+                ),
+            )
         )
+    if end:
+        conditions.append(SalesHourlyRollup.day <= end)
+    return conditions
 
-    # Main summary query
-    stmt = select(
-        func.count(Order.id).label("total_orders"),
-        func.sum(Order.total).label("total_sales"),
-    ).where(and_(*conditions))
 
-    result = await db.execute(stmt)
-    summary = result.first()
+def _daily_conditions(
+    model, start_date: Optional[date], end_date: Optional[date]
+) -> list:
+    """Window on a per-day rollup, from the first whole day of the start."""
+    start, end = _window_bounds(start_date, end_date)
+    conditions = []
+    if start:
+        conditions.append(model.day >= _first_whole_bucket(start, daily=True).date())
+    if end:
+        conditions.append(model.day <= end)
+    return conditions
 
-    # Items sold query
-    items_stmt = (
-        select(func.sum(OrderItem.quantity))
-        .select_from(OrderItem)
-        .join(Order)
-        .where(and_(*conditions))
+
+async def _partial_start(
+    db: AsyncSession,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    daily: bool,
+) -> List[rollups.OrderContribution]:
+    """Contributions of the orders before the first whole rollup bucket.
+
+    The rollups only hold whole hours and days, so a window starting inside
+    one reads that partial bucket from ``orders``, with the same conditions
+    as the per-order report, and totals match the exact range. The end is
+    always a whole day.
+    """
+    start, _ = _window_bounds(start_date, end_date)
+    if start is None:
+        return []
+    first_bucket = _first_whole_bucket(start, daily)
+    if first_bucket == start:
+        return []
+
+    stmt = (
+        select(Order)
+        .options(selectinload(Order.items))
+        .where(
+            and_(
+                *_report_order_conditions(start, end_date),
+                Order.created_at < first_bucket,
+            )
+        )
     )
+    result = await db.execute(stmt)
+    contributions = map(rollups.snapshot, result.scalars())
+    return [contribution for contribution in contributions if contribution]
+
 
-    items_result = await db.execute(items_stmt)
-    items_sold = items_result.scalar() or 0
+def _fold(buckets: dict, key, orders: int, sales: float) -> None:
+    bucket = buckets.setdefault(key, [0, 0.0])
+    bucket[0] += orders
+    bucket[1] += sales
 
-    total_orders = summary.total_orders or 0
-    total_sales = float(summary.total_sales or 0)
+
+async def get_sales_summary(
+    db: AsyncSession, start_date: Optional[date] = None, end_date: Optional[date] = None
+) -> Dict[str, Any]:
+    """Get sales summary statistics"""
+
+    stmt = select(
+        func.sum(SalesHourlyRollup.orders).label("total_orders"),
+        func.sum(SalesHourlyRollup.sales).label("total_sales"),
+        func.sum(SalesHourlyRollup.items_sold).label("items_sold"),
+    ).where(and_(*_hourly_conditions(start_date, end_date)))
+
+    result = await db.execute(stmt)
+    summary = result.first()
+    partial = await _partial_start(db, start_date, end_date, daily=False)
+
+    total_orders = int(summary.total_orders or 0) + len(partial)
+    total_sales = float(summary.total_sales or 0) + sum(c.total for c in partial)
+    items_sold = int(summary.items_sold or 0) + sum(c.items_sold for c in partial)
 
     return {
         "total_sales": total_sales,
         "total_orders": total_orders,
-        "items_sold": int(items_sold),
+        "items_sold": items_sold,
         "average_order_value": total_sales / total_orders if total_orders > 0 else 0,
     }
 
@@ -85,45 +239,63 @@ async def get_top_products(
 ) -> List[Dict[str, Any]]:
     """Get top selling products by revenue"""
 
-    # Build conditions
-    conditions = [Order.status != OrderStatus.CANCELLED]
-
-    if start_date:
-        conditions.append(Order.created_at >= start_date)
-
-    if end_date:
-        conditions.append(
-            Order.created_at < datetime.combine(end_date, datetime.max.time())
-        )
-
-    # Top products query
+    partial = await _partial_start(db, start_date, end_date, daily=True)
+    revenue = func.sum(ProductDailyRollup.revenue)
+    quantity_sold = func.sum(ProductDailyRollup.quantity_sold)
     stmt = (
         select(
             Product.id,
             Product.title,
-            func.sum(OrderItem.quantity).label("quantity_sold"),
-            func.sum(OrderItem.price * OrderItem.quantity).label("revenue"),
+            quantity_sold.label("quantity_sold"),
+            revenue.label("revenue"),
         )
-        .select_from(OrderItem)
-        .join(Product, OrderItem.product_id == Product.id)
-        .join(Order, OrderItem.order_id == Order.id)
-        .where(and_(*conditions))
+        .select_from(ProductDailyRollup)
+        .join(Product, ProductDailyRollup.product_id == Product.id)
+        .where(and_(*_daily_conditions(ProductDailyRollup, start_date, end_date)))
         .group_by(Product.id, Product.title)
-        .order_by(func.sum(OrderItem.price * OrderItem.quantity).desc())
-        .limit(limit)
+        .order_by(revenue.desc())
     )
+    # The partial day can reorder the ranking, so rank after merging it
+    if not partial:
+        stmt = stmt.having(quantity_sold > 0).limit(limit)
 
     result = await db.execute(stmt)
-    rows = result.all()
-
+    products = {
+        row.id: [row.title, int(row.quantity_sold), float(row.revenue)]
+        for row in result.all()
+    }
+    if partial:
+        missing = {
+            product_id
+            for contribution in partial
+            for product_id in contribution.items
+            if product_id not in products
+        }
+        if missing:
+            titles = await db.execute(
+                select(Product.id, Product.title).where(Product.id.in_(missing))
+            )
+            for product_id, title in titles.all():
+                products[product_id] = [title, 0, 0.0]
+        for contribution in partial:
+            for product_id, (quantity, item_revenue) in contribution.items.items():
+                if product_id in products:
+                    products[product_id][1] += quantity
+                    products[product_id][2] += item_revenue
+
+    ranked = sorted(
+        ((product_id, entry) for product_id, entry in products.items() if entry[1] > 0),
+        key=lambda item: item[1][2],
+        reverse=True,
+    )
     return [
         {
-            "product_id": row.id,
-            "product_name": row.title,
-            "quantity_sold": int(row.quantity_sold),
-            "revenue": float(row.revenue),
+            "product_id": product_id,
+            "product_name": title,
+            "quantity_sold": quantity,
+            "revenue": product_revenue,
         }
-        for row in rows
+        for product_id, (title, quantity, product_revenue) in ranked[:limit]
     ]
 
 
@@ -132,39 +304,34 @@ async def get_sales_by_day(
 ) -> List[Dict[str, Any]]:
     """Get daily sales totals"""
 
-    # Build conditions
-    conditions = [Order.status != OrderStatus.CANCELLED]
-
-    if start_date:
-        conditions.append(Order.created_at >= start_date)
-
-    if end_date:
-        conditions.append(
-            Order.created_at < datetime.combine(end_date, datetime.max.time())
-        )
-
-    # Daily sales query
+    orders = func.sum(SalesHourlyRollup.orders)
     stmt = (
         select(
-            func.date(Order.created_at).label("date"),
-            func.count(Order.id).label("orders"),
-            func.sum(Order.total).label("sales"),
+            SalesHourlyRollup.day.label("date"),
+            orders.label("orders"),
+            func.sum(SalesHourlyRollup.sales).label("sales"),
         )
-        .where(and_(*conditions))
-        .group_by(func.date(Order.created_at))
-        .order_by(func.date(Order.created_at))
+        .where(and_(*_hourly_conditions(start_date, end_date)))
+        .group_by(SalesHourlyRollup.day)
+        .having(orders > 0)
+        .order_by(SalesHourlyRollup.day)
     )
 
     result = await db.execute(stmt)
-    rows = result.all()
+    by_day: Dict[date, List[float]] = {}
+    for row in result.all():
+        _fold(by_day, row.date, int(row.orders), float(row.sales or 0))
+    for contribution in await _partial_start(db, start_date, end_date, daily=False):
+        _fold(by_day, contribution.day, 1, contribution.total)
 
     return [
         {
-            "date": row.date.format() if row.date else None,
-            "orders": int(row.orders),
-            "sales": float(row.sales or 0),
+            "date": day.isoformat() if day else None,
+            "orders": int(orders),
+            "sales": float(sales),
         }
-        for row in rows
+        for day, (orders, sales) in sorted(by_day.items())
+        if orders > 0
     ]
 
 
@@ -173,42 +340,98 @@ async def get_sales_by_hour(
 ) -> List[Dict[str, Any]]:
     """Get hourly sales distribution"""
 
-    # Build conditions
-    conditions = [Order.status != OrderStatus.CANCELLED]
-
-    if start_date:
-        conditions.append(Order.created_at >= start_date)
-
-    if end_date:
-        conditions.append(
-            Order.created_at < datetime.combine(end_date, datetime.max.time())
-        )
-
-    # Use strftime for SQLite compatibility
+    orders = func.sum(SalesHourlyRollup.orders)
     stmt = (
         select(
-            func.strftime("%H", Order.created_at).label("hour"),
-            func.count(Order.id).label("orders"),
-            func.sum(Order.total).label("sales"),
+            SalesHourlyRollup.hour.label("hour"),
+            orders.label("orders"),
+            func.sum(SalesHourlyRollup.sales).label("sales"),
         )
-        .where(and_(*conditions))
-        .group_by(func.strftime("%H", Order.created_at))
-        .order_by(func.strftime("%H", Order.created_at))
+        .where(and_(*_hourly_conditions(start_date, end_date)))
+        .group_by(SalesHourlyRollup.hour)
+        .having(orders > 0)
+        .order_by(SalesHourlyRollup.hour)
     )
 
     result = await db.execute(stmt)
-    rows = result.all()
+    by_hour: Dict[int, List[float]] = {}
+    for row in result.all():
+        _fold(by_hour, int(row.hour or 0), int(row.orders), float(row.sales or 0))
+    for contribution in await _partial_start(db, start_date, end_date, daily=False):
+        _fold(by_hour, contribution.hour, 1, contribution.total)
 
     return [
-        {
-            "hour": int(row.hour) if row.hour else 0,
-            "orders": int(row.orders),
-            "sales": float(row.sales or 0),
-        }
-        for row in rows
+        {"hour": hour, "orders": int(orders), "sales": float(sales)}
+        for hour, (orders, sales) in sorted(by_hour.items())
+        if orders > 0
     ]
 
 
+async def get_sales_dashboard(
+    db: AsyncSession,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 10,
+) -> Dict[str, Any]:
+    """Summary, by-day, by-hour and top products for one window.
+
+    The first three are folded from a single pass over the hourly rollup,
+    plus the orders of a partial first hour.
+    """
+    stmt = (
+        select(
+            SalesHourlyRollup.day,
+            SalesHourlyRollup.hour,
+            SalesHourlyRollup.orders,
+            SalesHourlyRollup.sales,
+            SalesHourlyRollup.items_sold,
+        )
+        .where(and_(*_hourly_conditions(start_date, end_date)))
+        .order_by(SalesHourlyRollup.day, SalesHourlyRollup.hour)
+    )
+    result = await db.execute(stmt)
+
+    total_orders = 0
+    total_sales = 0.0
+    items_sold = 0
+    by_day: Dict[date, List[float]] = {}
+    by_hour: Dict[int, List[float]] = {}
+    for row in result:
+        total_orders += row.orders
+        total_sales += row.sales
+        items_sold += row.items_sold
+        _fold(by_day, row.day, row.orders, row.sales)
+        _fold(by_hour, row.hour, row.orders, row.sales)
+    for contribution in await _partial_start(db, start_date, end_date, daily=False):
+        total_orders += 1
+        total_sales += contribution.total
+        items_sold += contribution.items_sold
+        _fold(by_day, contribution.day, 1, contribution.total)
+        _fold(by_hour, contribution.hour, 1, contribution.total)
+
+    return {
+        "summary": {
+            "total_sales": total_sales,
+            "total_orders": total_orders,
+            "items_sold": items_sold,
+            "average_order_value": (
+                total_sales / total_orders if total_orders > 0 else 0
+            ),
+        },
+        "top_products": await get_top_products(db, start_date, end_date, limit),
+        "by_day": [
+            {"date": day.isoformat(), "orders": int(orders), "sales": float(sales)}
+            for day, (orders, sales) in sorted(by_day.items())
+            if orders > 0
+        ],
+        "by_hour": [
+            {"hour": hour, "orders": int(orders), "sales": float(sales)}
+            for hour, (orders, sales) in sorted(by_hour.items())
+            if orders > 0
+        ],
+    }
+
+
 async def get_inventory_report(db: AsyncSession) -> Dict[str, Any]:
     """Get inventory status report with totals + products list"""
 
@@ -267,41 +490,53 @@ async def get_user_sales(
 ) -> List[Dict[str, Any]]:
     """Get sales by user (cashier performance)"""
 
-    # Build conditions
-    conditions = [Order.status != OrderStatus.CANCELLED]
-
-    if start_date:
-        conditions.append(Order.created_at >= start_date)
-
-    if end_date:
-        conditions.append(
-            Order.created_at < datetime.combine(end_date, datetime.max.time())
-        )
-
-    # User sales query
+    orders = func.sum(UserDailyRollup.orders)
+    sales = func.sum(UserDailyRollup.sales)
     stmt = (
         select(
             User.id,
             User.full_name,
-            func.count(Order.id).label("orders"),
-            func.sum(Order.total).label("sales"),
+            orders.label("orders"),
+            sales.label("sales"),
         )
-        .select_from(Order)
-        .join(User, Order.user_id == User.id)
-        .where(and_(*conditions))
+        .select_from(UserDailyRollup)
+        .join(User, UserDailyRollup.user_id == User.id)
+        .where(and_(*_daily_conditions(UserDailyRollup, start_date, end_date)))
         .group_by(User.id, User.full_name)
-        .order_by(func.sum(Order.total).desc())
+        .having(orders > 0)
+        .order_by(sales.desc())
     )
 
     result = await db.execute(stmt)
-    rows = result.all()
-
+    users = {
+        row.id: [row.full_name, int(row.orders), float(row.sales or 0)]
+        for row in result.all()
+    }
+    partial = await _partial_start(db, start_date, end_date, daily=True)
+    if partial:
+        missing = {c.user_id for c in partial if c.user_id not in users}
+        if missing:
+            names = await db.execute(
+                select(User.id, User.full_name).where(User.id.in_(missing))
+            )
+            for user_id, full_name in names.all():
+                users[user_id] = [full_name, 0, 0.0]
+        for contribution in partial:
+            if contribution.user_id in users:
+                users[contribution.user_id][1] += 1
+                users[contribution.user_id][2] += contribution.total
+
+    ranked = sorted(
+        (item for item in users.items() if item[1][1] > 0),
+        key=lambda item: item[1][2],
+        reverse=True,
+    )
     return [
         {
-            "user_id": row.id,
-            "user_name": row.full_name,
-            "orders": int(row.orders),
-            "sales": float(row.sales or 0),
+            "user_id": user_id,
+            "user_name": full_name,
+            "orders": orders,
+            "sales": sales,
         }
-        for row in rows
+        for user_id, (full_name, orders, sales) in ranked
     ]
@@ -0,0 +1,257 @@
+"""Incrementally maintained sales rollups for the report endpoints.
+
+Order writes take a ``snapshot`` of the order before and after the change and
+hand both to ``apply_change`` inside the same transaction, so the rollup rows
+never drift from ``orders``/``order_items``. ``rebuild`` recomputes every
+rollup from scratch for backfills::
+
+    python -m crud.rollups
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import date, timezone
+from typing import Optional
+
+from models import (
+    Order,
+    OrderItem,
+    OrderStatus,
+    ProductDailyRollup,
+    SalesHourlyRollup,
+    UserDailyRollup,
+)
+from sqlalchemy import Integer, cast, delete, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@dataclass(frozen=True)
+class OrderContribution:
+    """What one order adds to the rollups."""
+
+    day: date
+    hour: int
+    user_id: int
+    total: float
+    # product_id -> (quantity, revenue)
+    items: dict[int, tuple[int, float]] = field(default_factory=dict)
+
+    @property
+    def items_sold(self) -> int:
+        return sum(quantity for quantity, _ in self.items.values())
+
+
+def snapshot(order: Order) -> Optional[OrderContribution]:
+    """Capture an order's rollup contribution; cancelled orders count for nothing."""
+    if order.status == OrderStatus.CANCELLED or order.created_at is None:
+        return None
+
+    created_at = order.created_at
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+
+    items: dict[int, tuple[int, float]] = {}
+    for item in order.items:
+        quantity, revenue = items.get(item.product_id, (0, 0.0))
+        items[item.product_id] = (
+            quantity + item.quantity,
+            revenue + float(item.subtotal),
+        )
+
+    return OrderContribution(
+        day=created_at.date(),
+        hour=created_at.hour,
+        user_id=order.user_id,
+        total=float(order.total or 0),
+        items=items,
+    )
+
+
+def _add(bucket: dict, key, *values) -> None:
+    current = bucket.get(key, (0,) * len(values))
+    bucket[key] = tuple(a + b for a, b in zip(current, values))
+
+
+async def apply_change(
+    db: AsyncSession,
+    before: Optional[OrderContribution],
+    after: Optional[OrderContribution],
+) -> None:
+    """Move the rollups from ``before`` to ``after`` (either may be None).
+
+    Only the net difference is written, so an edit that leaves a bucket
+    unchanged costs nothing. The caller commits.
+    """
+    if before == after:
+        return
+
+    hourly: dict = {}
+    products: dict = {}
+    users: dict = {}
+    for contribution, sign in ((before, -1), (after, 1)):
+        if contribution is None:
+            continue
+        _add(
+            hourly,
+            (contribution.day, contribution.hour),
+            sign,
+            sign * contribution.total,
+            sign * contribution.items_sold,
+        )
+        _add(
+            users,
+            (contribution.day, contribution.user_id),
+            sign,
+            sign * contribution.total,
+        )
+        for product_id, (quantity, revenue) in contribution.items.items():
+            _add(
+                products,
+                (contribution.day, product_id),
+                sign * quantity,
+                sign * revenue,
+            )
+
+    hourly_rows = [
+        {"day": day, "hour": hour, "orders": o, "sales": s, "items_sold": i}
+        for (day, hour), (o, s, i) in hourly.items()
+        if o or s or i
+    ]
+    user_rows = [
+        {"day": day, "user_id": user_id, "orders": o, "sales": s}
+        for (day, user_id), (o, s) in users.items()
+        if o or s
+    ]
+    product_rows = [
+        {"day": day, "product_id": product_id, "quantity_sold": q, "revenue": r}
+        for (day, product_id), (q, r) in products.items()
+        if q or r
+    ]
+
+    await _upsert(
+        db,
+        SalesHourlyRollup,
+        ["day", "hour"],
+        ["orders", "sales", "items_sold"],
+        hourly_rows,
+    )
+    await _upsert(
+        db, UserDailyRollup, ["day", "user_id"], ["orders", "sales"], user_rows
+    )
+    await _upsert(
+        db,
+        ProductDailyRollup,
+        ["day", "product_id"],
+        ["quantity_sold", "revenue"],
+        product_rows,
+    )
+
+
+async def _upsert(
+    db: AsyncSession, model, keys: list[str], counters: list[str], rows: list[dict]
+) -> None:
+    if not rows:
+        return
+    stmt = sqlite_insert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=keys,
+        set_={
+            name: getattr(model, name) + getattr(stmt.excluded, name)
+            for name in counters
+        },
+    )
+    await db.execute(stmt, rows)
+
+
+async def rebuild(db: AsyncSession) -> dict:
+    """Recompute every rollup from orders/order_items and commit."""
+    for model in (SalesHourlyRollup, ProductDailyRollup, UserDailyRollup):
+        await db.execute(delete(model))
+
+    live = Order.status != OrderStatus.CANCELLED
+    day = func.date(Order.created_at)
+    hour = cast(func.strftime("%H", Order.created_at), Integer)
+
+    items_per_order = (
+        select(
+            OrderItem.order_id.label("order_id"),
+            func.sum(OrderItem.quantity).label("quantity"),
+        )
+        .group_by(OrderItem.order_id)
+        .subquery()
+    )
+    await db.execute(
+        insert(SalesHourlyRollup).from_select(
+            ["day", "hour", "orders", "sales", "items_sold"],
+            select(
+                day,
+                hour,
+                func.count(Order.id),
+                func.sum(Order.total),
+                func.coalesce(func.sum(items_per_order.c.quantity), 0),
+            )
+            .select_from(Order)
+            .outerjoin(items_per_order, items_per_order.c.order_id == Order.id)
+            .where(live)
+            .group_by(day, hour),
+        )
+    )
+    await db.execute(
+        insert(UserDailyRollup).from_select(
+            ["day", "user_id", "orders", "sales"],
+            select(day, Order.user_id, func.count(Order.id), func.sum(Order.total))
+            .where(live)
+            .group_by(day, Order.user_id),
+        )
+    )
+    await db.execute(
+        insert(ProductDailyRollup).from_select(
+            ["day", "product_id", "quantity_sold", "revenue"],
+            select(
+                day,
+                OrderItem.product_id,
+                func.sum(OrderItem.quantity),
+                func.sum(OrderItem.subtotal),
+            )
+            .select_from(OrderItem)
+            .join(Order, OrderItem.order_id == Order.id)
+            .where(live)
+            .group_by(day, OrderItem.product_id),
+        )
+    )
+    await db.commit()
+
+    counts = {}
+    for model in (SalesHourlyRollup, ProductDailyRollup, UserDailyRollup):
+        result = await db.execute(select(func.count()).select_from(model))
+        counts[model.__tablename__] = result.scalar_one()
+    return counts
+
+
+async def rebuild_if_empty(db: AsyncSession) -> bool:
+    """Backfill rollups on first start against a database that predates them."""
+    has_rollups = await db.execute(select(SalesHourlyRollup.day).limit(1))
+    if has_rollups.first() is not None:
+        return False
+    has_orders = await db.execute(
+        select(Order.id).where(Order.status != OrderStatus.CANCELLED).limit(1)
+    )
+    if has_orders.first() is None:
+        return False
+    await rebuild(db)
+    return True
+
+
+async def _main() -> None:
+    from database import AsyncSessionLocal, engine
+
+    async with AsyncSessionLocal() as db:
+        counts = await rebuild(db)
+    await engine.dispose()
+    for table, count in counts.items():
+        print(f"✅ {table}: {count} rows")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
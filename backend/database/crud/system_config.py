@@ -0,0 +1,42 @@
+from crud import outbox
+from models import SystemConfig
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Known keys and the value they read as until someone sets them
+CONFIG_DEFAULTS = {
+    "business_type": "market",
+    "service_fee_percent": "0",
+    "business_name": "POS System",
+    "business_phone": "+998",
+}
+
+
+async def get_config_values(db: AsyncSession) -> dict[str, str]:
+    """Every known key in one query; unset keys read as their default."""
+    result = await db.execute(
+        select(SystemConfig.key, SystemConfig.value).where(
+            SystemConfig.key.in_(CONFIG_DEFAULTS)
+        )
+    )
+    return {**CONFIG_DEFAULTS, **dict(result.all())}
+
+
+async def get_config_value(db: AsyncSession, key: str) -> str:
+    result = await db.execute(select(SystemConfig.value).where(SystemConfig.key == key))
+    value = result.scalar_one_or_none()
+    return CONFIG_DEFAULTS.get(key, "") if value is None else value
+
+
+async def set_config_value(db: AsyncSession, key: str, value: str) -> str:
+    result = await db.execute(select(SystemConfig).where(SystemConfig.key == key))
+    config = result.scalars().first()
+    if config is None:
+        db.add(SystemConfig(key=key, value=value))
+    else:
+        config.value = value
+    outbox.add_event(
+        db, "config.updated", {"action": "updated", "key": key, "value": value}
+    )
+    await db.commit()
+    return value
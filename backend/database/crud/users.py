@@ -1,10 +1,13 @@
+import hmac
+from hashlib import sha256
 from typing import Sequence
 
+from config import settings
+from crud import outbox
 from fastapi import HTTPException, status
 from models import User, UserRole, UserStatus
-from rabbitmq_client import rabbitmq_client
 from schemas import users as schema
-from sqlalchemy import func, select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -13,21 +16,31 @@ async def get_users(db: AsyncSession) -> Sequence[User]:
     return result.scalars().all()
 
 
+def parse_status(status: str | None) -> UserStatus | None:
+    """Normalise a status filter in Python so the column compare stays indexable."""
+    try:
+        return UserStatus((status or "").strip().lower())
+    except ValueError:
+        return None
+
+
 async def get_usernames(db: AsyncSession, status: str) -> Sequence[str]:
-    if not status or not status.strip():
+    target_status = parse_status(status)
+    if target_status is None:
         return []
 
-    target_status = status.strip().upper()
-
-    # Используем select(User.username) и фильтруем на уровне БД
-    query = select(User.username).where(
-        func.upper(func.trim(User.status)) == target_status
-    )
+    result = await db.execute(select(User.username).where(User.status == target_status))
+    return result.scalars().all()
 
-    result = await db.execute(query)
-    usernames = result.scalars().all()
 
-    return usernames
+async def get_login_options(db: AsyncSession) -> Sequence:
+    """Active users for the login picker, only the columns it shows."""
+    result = await db.execute(
+        select(User.id, User.username, User.full_name, User.role)
+        .where(User.status == UserStatus.ACTIVE)
+        .order_by(User.full_name)
+    )
+    return result.all()
 
 
 async def get_user_by_id(db: AsyncSession, id: int) -> User | None:
@@ -40,11 +53,46 @@ async def get_user_by_username(db: AsyncSession, username: str) -> User | None:
     return result.scalar_one_or_none()
 
 
+def pin_lookup(pin: int) -> str:
+    """Keyed hash of a PIN, stored in ``users.pin_lookup`` and probed on login."""
+    return hmac.new(
+        settings.pin_lookup_key.encode(), str(pin).encode(), sha256
+    ).hexdigest()
+
+
 async def get_user_by_pin(db: AsyncSession, pin: int) -> User | None:
-    result = await db.execute(select(User).where(User.pin == pin))
+    lookup = pin_lookup(pin)
+    result = await db.execute(select(User).where(User.pin_lookup == lookup))
     return result.scalar_one_or_none()
 
 
+async def backfill_pin_lookups(db: AsyncSession) -> int:
+    """Fill or rehash ``pin_lookup`` for every user and commit.
+
+    Returns the number of rows changed. Duplicate PINs, only possible in data
+    older than the uniqueness check, keep the lookup on the oldest account.
+    """
+    result = await db.execute(
+        select(User.id, User.username, User.pin, User.pin_lookup).order_by(User.id)
+    )
+    seen: set[str] = set()
+    changes = []
+    for user_id, username, pin, current in result.all():
+        lookup = pin_lookup(pin)
+        if lookup in seen:
+            print(f"⚠️ Duplicate PIN for user {username}, PIN login disabled for it")
+            lookup = None
+        else:
+            seen.add(lookup)
+        if current != lookup:
+            changes.append({"id": user_id, "pin_lookup": lookup})
+
+    if changes:
+        await db.execute(update(User), changes)
+        await db.commit()
+    return len(changes)
+
+
 async def create_user(db: AsyncSession, user: schema.UserCreate) -> User:
     existing_user_by_pin = await get_user_by_pin(db, user.pin)
     if existing_user_by_pin:
@@ -53,31 +101,29 @@ async def create_user(db: AsyncSession, user: schema.UserCreate) -> User:
             detail="PIN already exists. Use a unique PIN.",
         )
 
-    new_user = User(**user.model_dump())
+    new_user = User(**user.model_dump(), pin_lookup=pin_lookup(user.pin))
     db.add(new_user)
 
     try:
-        await db.commit()
+        await db.flush()
         await db.refresh(new_user)
-
-        # Publish RabbitMQ event
-        try:
-            await rabbitmq_client.publish(
-                "user.created",
-                {
-                    "action": "created",
-                    "user_id": new_user.id,
-                    "username": new_user.username,
-                    "role": new_user.role.value
-                    if isinstance(new_user.role, UserRole)
-                    else new_user.role,
-                    "status": new_user.status.value
-                    if isinstance(new_user.status, UserStatus)
-                    else new_user.status,
-                },
-            )
-        except Exception as e:
-            print(f"⚠️  Failed to publish user.created event: {e}")
+        outbox.add_event(
+            db,
+            "user.created",
+            {
+                "action": "created",
+                "user_id": new_user.id,
+                "username": new_user.username,
+                "full_name": new_user.full_name,
+                "role": new_user.role.value
+                if isinstance(new_user.role, UserRole)
+                else new_user.role,
+                "status": new_user.status.value
+                if isinstance(new_user.status, UserStatus)
+                else new_user.status,
+            },
+        )
+        await db.commit()
 
         return new_user
     except Exception:
@@ -103,6 +149,7 @@ async def update_user(
             )
 
     # Store old values for event BEFORE updating
+    old_username = existing_user.username
     old_role = (
         existing_user.role.value
         if isinstance(existing_user.role, UserRole)
@@ -116,47 +163,51 @@ async def update_user(
 
     for key, value in update_payload.items():
         setattr(existing_user, key, value)
+    if new_pin is not None:
+        existing_user.pin_lookup = pin_lookup(new_pin)
 
     try:
-        await db.commit()
+        await db.flush()
         await db.refresh(existing_user)
 
-        # Publish RabbitMQ event
-        try:
-            current_role = (
-                existing_user.role.value
-                if isinstance(existing_user.role, UserRole)
-                else existing_user.role
-            )
-            current_status = (
-                existing_user.status.value
-                if isinstance(existing_user.status, UserStatus)
-                else existing_user.status
-            )
+        current_role = (
+            existing_user.role.value
+            if isinstance(existing_user.role, UserRole)
+            else existing_user.role
+        )
+        current_status = (
+            existing_user.status.value
+            if isinstance(existing_user.status, UserStatus)
+            else existing_user.status
+        )
 
-            event_data = {
-                "action": "updated",
-                "user_id": existing_user.id,
-                "username": existing_user.username,
-                "role": current_role,
-                "status": current_status,
-            }
-
-            # Add role change info if role was updated
-            if old_role != current_role:
-                event_data["old_role"] = old_role
-                event_data["new_role"] = current_role
-                event_data["role_changed"] = True
-
-            # Add status change info if status was updated
-            if old_status != current_status:
-                event_data["old_status"] = old_status
-                event_data["new_status"] = current_status
-                event_data["status_changed"] = True
-
-            await rabbitmq_client.publish("user.updated", event_data)
-        except Exception as e:
-            print(f"⚠️  Failed to publish user.updated event: {e}")
+        event_data = {
+            "action": "updated",
+            "user_id": existing_user.id,
+            "username": existing_user.username,
+            "full_name": existing_user.full_name,
+            "role": current_role,
+            "status": current_status,
+        }
+
+        # Caches keyed by username evict the old one on a rename
+        if old_username != existing_user.username:
+            event_data["old_username"] = old_username
+
+        # Add role change info if role was updated
+        if old_role != current_role:
+            event_data["old_role"] = old_role
+            event_data["new_role"] = current_role
+            event_data["role_changed"] = True
+
+        # Add status change info if status was updated
+        if old_status != current_status:
+            event_data["old_status"] = old_status
+            event_data["new_status"] = current_status
+            event_data["status_changed"] = True
+
+        outbox.add_event(db, "user.updated", event_data)
+        await db.commit()
 
         return existing_user
     except Exception:
@@ -176,22 +227,18 @@ async def delete_user(db: AsyncSession, id: int) -> bool:
 
     try:
         await db.delete(user)
+        outbox.add_event(
+            db,
+            "user.deleted",
+            {
+                "action": "deleted",
+                "user_id": user_id,
+                "username": username,
+                "role": role,
+            },
+        )
         await db.commit()
 
-        # Publish RabbitMQ event
-        try:
-            await rabbitmq_client.publish(
-                "user.deleted",
-                {
-                    "action": "deleted",
-                    "user_id": user_id,
-                    "username": username,
-                    "role": role,
-                },
-            )
-        except Exception as e:
-            print(f"⚠️  Failed to publish user.deleted event: {e}")
-
         return True
     except Exception:
         await db.rollback()
@@ -207,24 +254,22 @@ async def update_role(db: AsyncSession, id: int, role: str) -> User | None:
     user.role = role
 
     try:
-        await db.commit()
+        await db.flush()
         await db.refresh(user)
 
-        # Publish RabbitMQ event
-        try:
-            new_role = user.role.value if isinstance(user.role, UserRole) else user.role
-            await rabbitmq_client.publish(
-                "user.role_updated",
-                {
-                    "action": "role_updated",
-                    "user_id": user.id,
-                    "username": user.username,
-                    "old_role": old_role,
-                    "new_role": new_role,
-                },
-            )
-        except Exception as e:
-            print(f"⚠️  Failed to publish user.role_updated event: {e}")
+        new_role = user.role.value if isinstance(user.role, UserRole) else user.role
+        outbox.add_event(
+            db,
+            "user.role_updated",
+            {
+                "action": "role_updated",
+                "user_id": user.id,
+                "username": user.username,
+                "old_role": old_role,
+                "new_role": new_role,
+            },
+        )
+        await db.commit()
 
         return user
     except Exception:
@@ -243,28 +288,24 @@ async def update_status(db: AsyncSession, id: int, status: UserStatus) -> User |
     user.status = status
 
     try:
-        await db.commit()
+        await db.flush()
         await db.refresh(user)
 
-        # Publish RabbitMQ event
-        try:
-            new_status = (
-                user.status.value
-                if isinstance(user.status, UserStatus)
-                else user.status
-            )
-            await rabbitmq_client.publish(
-                "user.status_updated",
-                {
-                    "action": "status_updated",
-                    "user_id": user.id,
-                    "username": user.username,
-                    "old_status": old_status,
-                    "new_status": new_status,
-                },
-            )
-        except Exception as e:
-            print(f"⚠️  Failed to publish user.status_updated event: {e}")
+        new_status = (
+            user.status.value if isinstance(user.status, UserStatus) else user.status
+        )
+        outbox.add_event(
+            db,
+            "user.status_updated",
+            {
+                "action": "status_updated",
+                "user_id": user.id,
+                "username": user.username,
+                "old_status": old_status,
+                "new_status": new_status,
+            },
+        )
+        await db.commit()
 
         return user
     except Exception:
@@ -1,8 +1,69 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+IS_SQLITE = settings.DATABASE_URL.startswith("sqlite")
+IS_SQLITE_MEMORY = IS_SQLITE and ":memory:" in settings.DATABASE_URL
+
+
+def _engine_options(pool_size: int, max_overflow: int) -> dict:
+    if IS_SQLITE_MEMORY:
+        # In-memory databases are per-connection; keep the dialect's default pool.
+        return {}
+    return {"pool_size": pool_size, "max_overflow": max_overflow}
+
+
+def _sqlite_pragmas(read_only: bool) -> list[str]:
+    pragmas = [
+        f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}",
+        f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}",
+        f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _install_sqlite_profile(async_engine, read_only: bool = False) -> None:
+    if not IS_SQLITE:
+        return
+
+    pragmas = _sqlite_pragmas(read_only)
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=False,
+    **_engine_options(settings.DATABASE_POOL_SIZE, settings.DATABASE_MAX_OVERFLOW),
+)
+_install_sqlite_profile(engine)
+
+# Separate pool for GET endpoints. With WAL enabled, readers work on their own
+# snapshot and never wait behind the writer connection.
+read_engine = (
+    engine
+    if IS_SQLITE_MEMORY
+    else create_async_engine(
+        settings.DATABASE_URL,
+        echo=False,
+        **_engine_options(settings.DATABASE_READ_POOL_SIZE, 0),
+    )
+)
+if read_engine is not engine:
+    _install_sqlite_profile(read_engine, read_only=True)
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -12,6 +73,14 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 Base = declarative_base()
 
 
@@ -25,3 +94,9 @@ async def get_db():
             raise
         finally:
             await session.close()
+
+
+async def get_read_db():
+    # Read-only requests never commit; closing the session ends the snapshot.
+    async with ReadSessionLocal() as session:
+        yield session
@@ -5,10 +5,12 @@ from sqlalchemy import (
     Boolean,
     CheckConstraint,
     Column,
+    Date,
     DateTime,
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -55,6 +57,8 @@ class User(Base):
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     username = Column(String(50), unique=True, nullable=False, index=True)
     pin = Column(Integer, nullable=False)
+    # Keyed hash of the PIN, the indexed lookup key for PIN login
+    pin_lookup = Column(String(64), nullable=True)
     full_name = Column(String(100), nullable=False)
     role = Column(Enum(UserRole), nullable=False, default=UserRole.STAFF)
     status = Column(Enum(UserStatus), nullable=False, default=UserStatus.INACTIVE)
@@ -67,6 +71,9 @@ class User(Base):
     orders = relationship("Order", back_populates="user", lazy="dynamic")
     __table_args__ = (
         CheckConstraint("pin>=1000 AND pin<=999999", name="check_pin_range"),
+        Index("ix_users_pin_lookup", "pin_lookup", unique=True),
+        # Login picker: active users in display order
+        Index("ix_users_status_full_name", "status", "full_name"),
     )
 
 
@@ -137,6 +144,18 @@ class SystemConfig(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
 
+# Events written in the same transaction as the change they describe;
+# crud.outbox relays them to RabbitMQ and deletes them once confirmed.
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    routing_key = Column(String(100), nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
 class PrinterConfig(Base):
     __tablename__ = "printer_configs"
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
@@ -170,12 +189,20 @@ class Order(Base):
     )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    # Bumped on every write; order.* events carry it so clients spot gaps
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     user = relationship("User", back_populates="orders")
     table = relationship("Table", back_populates="orders")
     items = relationship(
         "OrderItem", back_populates="order", cascade="all, delete-orphan", lazy="joined"
     )
-    __table_args__ = (CheckConstraint("total>=0", name="check_total_non_negative"),)
+    __table_args__ = (
+        CheckConstraint("total>=0", name="check_total_non_negative"),
+        # Serves per-user listings (e.g. "today's orders") as a range scan in
+        # (created_at, id) order; SQLite appends the rowid to every index.
+        Index("ix_orders_user_id_created_at", "user_id", "created_at"),
+        Index("ix_orders_created_at", "created_at"),
+    )
 
     def _notes_meta(self) -> dict:
         if not self.notes:
@@ -238,3 +265,30 @@ class OrderItem(Base):
     def calculate_subtotal(self):
         self.subtotal = self.price * self.quantity
         return self.subtotal
+
+
+# Report rollups. Each row holds the running totals of non-cancelled orders
+# for one UTC bucket; crud.rollups keeps them in step with order writes.
+class SalesHourlyRollup(Base):
+    __tablename__ = "sales_hourly_rollups"
+    day = Column(Date, primary_key=True)
+    hour = Column(Integer, primary_key=True)
+    orders = Column(Integer, default=0, nullable=False)
+    sales = Column(Float, default=0.0, nullable=False)
+    items_sold = Column(Integer, default=0, nullable=False)
+
+
+class ProductDailyRollup(Base):
+    __tablename__ = "product_daily_rollups"
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, primary_key=True, index=True)
+    quantity_sold = Column(Integer, default=0, nullable=False)
+    revenue = Column(Float, default=0.0, nullable=False)
+
+
+class UserDailyRollup(Base):
+    __tablename__ = "user_daily_rollups"
+    day = Column(Date, primary_key=True)
+    user_id = Column(Integer, primary_key=True, index=True)
+    orders = Column(Integer, default=0, nullable=False)
+    sales = Column(Float, default=0.0, nullable=False)
@@ -69,6 +69,7 @@ class OrderResponse(OrderBase):
     status: OrderStatus
     created_at: datetime
     updated_at: Optional[datetime] = None
+    version: int = 1
     items: list[OrderItemResponse]
     user: Optional[Any] = None
     table: Optional[Any] = None
@@ -106,3 +107,12 @@ class OrderResponse(OrderBase):
 class OrdersResponse(BaseModel):
     orders: list[OrderResponse]
     total: int = 0
+    next_cursor: Optional[str] = None
+
+
+class OrderListParams(BaseModel):
+    limit: int = Field(default=100, ge=1, le=500)
+    cursor: Optional[str] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    lean: bool = False
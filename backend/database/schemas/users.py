@@ -68,3 +68,17 @@ class UserResponse(UserBase):
 
 class UsersResponse(BaseModel):
     users: list[UserResponse]
+
+
+class UserLoginOption(BaseModel):
+    id: int
+    username: str
+    full_name: str
+    role: str
+
+    class Config:
+        from_attributes = True
+
+
+class UserLoginOptionsResponse(BaseModel):
+    users: list[UserLoginOption]
@@ -1,9 +1,12 @@
+import asyncio
 from contextlib import asynccontextmanager
+from datetime import datetime
 
 import crud
 import schemas
 from authx.exceptions import AuthXException, MissingTokenError, NoAuthorizationError
-from deps import UserRole, get_current_staff, require_roles
+from config import settings
+from deps import UserRole, get_current_staff, require_roles, user_cache
 from fastapi import (
     APIRouter,
     Depends,
@@ -12,34 +15,101 @@ from fastapi import (
     Request,
     WebSocket,
     WebSocketDisconnect,
+    Query,
     status,
 )
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from rabbitmq_client import rabbitmq_client
-from websocket_manager import ws_manager
+from redis_client import redis_client
+from shared import codec
+from websocket_manager import Subscription, ws_manager
+
+
+def _coalesce_key(kind: str, data: dict, id_field: str):
+    # Full-state updates of one entity supersede each other in a client's queue;
+    # creates, deletes and deltas must all be delivered. Order events are
+    # versioned deltas, so they never go through here.
+    if data.get("action") in ("updated", "status_updated"):
+        return (kind, data.get("action"), data.get(id_field))
+    return None
+
+
+def _ids(*values) -> set[int]:
+    return {value for value in values if value is not None}
 
 
 async def handle_product_event(data: dict):
-    await ws_manager.broadcast({"type": "product_update", "data": data})
+    attributes = {}
+    if "category_id" in data:
+        attributes["category_id"] = _ids(data["category_id"])
+    await ws_manager.broadcast(
+        {"type": "product_update", "data": data},
+        coalesce_key=_coalesce_key("product", data, "product_id"),
+        topic=f"product.{data.get('action')}",
+        attributes=attributes,
+    )
 
 
 async def handle_user_event(data: dict):
-    await ws_manager.broadcast({"type": "user_update", "data": data})
+    await user_cache.handle_user_event(data)
+    await ws_manager.broadcast(
+        {"type": "user_update", "data": data},
+        coalesce_key=_coalesce_key("user", data, "user_id"),
+        topic=f"user.{data.get('action')}",
+        attributes={"user_id": _ids(data.get("user_id"))},
+    )
 
 
 async def handle_order_event(data: dict):
-    await ws_manager.broadcast({"type": "order_update", "data": data})
+    # Deltas carry category_ids; order.created carries the full item list
+    category_ids = data.get("category_ids")
+    if category_ids is None:
+        category_ids = [item.get("category_id") for item in data.get("items") or []]
+    await ws_manager.broadcast(
+        {"type": "order_update", "data": data},
+        topic=f"order.{data.get('action')}",
+        attributes={
+            # A moved order is news on both the old and the new table
+            "table_id": _ids(data.get("table_id"), data.get("old_table_id")),
+            "user_id": _ids(data.get("user_id")),
+            "category_id": _ids(*category_ids),
+        },
+    )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    try:
+        await redis_client.connect()
+    except Exception as e:
+        print(f"⚠️ Redis unavailable, user lookups use the local cache only: {e}")
     await rabbitmq_client.connect()
-    await rabbitmq_client.subscribe("product.*", handle_product_event)
-    await rabbitmq_client.subscribe("user.*", handle_user_event)
-    await rabbitmq_client.subscribe("order.*", handle_order_event)
+    # Sockets and user caches live in each worker, so every worker needs every
+    # event: a private queue per process, not one shared load-balanced queue.
+    # Events about one entity are handled in order, different ones in
+    # parallel; stock changes cover several products, so products go serially.
+    await rabbitmq_client.subscribe(
+        "product.*", handle_product_event, exclusive=True, concurrency=1
+    )
+    await rabbitmq_client.subscribe(
+        "user.*", handle_user_event, exclusive=True, ordering_key="user_id"
+    )
+    await rabbitmq_client.subscribe(
+        "order.*", handle_order_event, exclusive=True, ordering_key="order_id"
+    )
+    await rabbitmq_client.subscribe(
+        "config.*",
+        crud.config_cache.handle_config_event,
+        exclusive=True,
+        ordering_key="key",
+    )
+    # Shared queues from before; bound to the exchange, they would fill forever
+    for queue_name in ("queue_product_all", "queue_user_all", "queue_order_all"):
+        await rabbitmq_client.delete_queue(queue_name)
     yield
     await rabbitmq_client.close()
+    await redis_client.close()
     await crud.service_client.close()
 
 
@@ -60,13 +130,119 @@ async def health():
     return {"status": "ok", "service": "order"}
 
 
+@mapp.get("/ws/stats", tags=["Health"])
+async def websocket_stats():
+    """Connection count, send-queue depths and slow-consumer counters"""
+    return ws_manager.stats()
+
+
+@mapp.get("/mq/stats", tags=["Health"])
+async def rabbitmq_stats():
+    """Consumed, dead-lettered and in-flight event counts for this worker"""
+    return rabbitmq_client.stats()
+
+
+async def _send_order_snapshots(websocket: WebSocket, message: dict):
+    order_ids = message.get("order_ids")
+    if order_ids is None:
+        order_ids = [message.get("order_id")]
+    try:
+        order_ids = list(dict.fromkeys(int(order_id) for order_id in order_ids))
+    except (TypeError, ValueError):
+        order_ids = []
+    if not order_ids or len(order_ids) > settings.WS_RESYNC_MAX_ORDERS:
+        await ws_manager.send(
+            websocket,
+            {
+                "type": "error",
+                "message": "resync needs order_id or up to "
+                f"{settings.WS_RESYNC_MAX_ORDERS} order_ids",
+            },
+        )
+        return
+
+    results = await asyncio.gather(
+        *(crud.get_order_by_id(order_id) for order_id in order_ids),
+        return_exceptions=True,
+    )
+    for order_id, order in zip(order_ids, results):
+        if isinstance(order, Exception):
+            await ws_manager.send(
+                websocket,
+                {"type": "error", "message": f"resync of order {order_id} failed"},
+            )
+            continue
+        # data is null when the order no longer exists
+        await ws_manager.send(
+            websocket,
+            {
+                "type": "order_snapshot",
+                "order_id": order_id,
+                "data": order.model_dump(mode="json") if order else None,
+            },
+        )
+
+
+async def _handle_ws_message(websocket: WebSocket, text: str):
+    try:
+        message = codec.loads(text)
+    except ValueError:
+        message = None
+    action = message.get("action") if isinstance(message, dict) else None
+    if action == "resync":
+        await _send_order_snapshots(websocket, message)
+        return
+    if action != "subscribe":
+        await ws_manager.send(websocket, {"type": "ping", "message": "pong"})
+        return
+
+    try:
+        subscription = Subscription.parse(message.get("topics"), message)
+    except ValueError as e:
+        await ws_manager.send(websocket, {"type": "error", "message": str(e)})
+        return
+    ws_manager.subscribe(websocket, subscription)
+    await ws_manager.send(
+        websocket, {"type": "subscribed", "subscription": subscription.as_dict()}
+    )
+
+
 @mapp.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    await ws_manager.connect(websocket)
+    """Order, product and user events.
+
+    Clients get everything unless they subscribe, at connect time with query
+    params (``?topics=order.*&table_id=3``) or later by sending
+    ``{"action": "subscribe", "topics": [...], "table_id": [...]}``, which
+    replaces the current subscription. Filters: table_id, user_id,
+    category_id.
+
+    Events carry ``seq`` and the first frame is a ``hello`` with the
+    ``stream`` id and current seq. A reconnecting client passes
+    ``?last_seq=<seq>&stream=<id>`` to get the events it missed replayed;
+    ``resumed: false`` in the hello means they are gone and it should
+    reload instead.
+
+    Order events are deltas stamped with the order's ``version``. A client
+    that misses one (version jumps by more than one) sends
+    ``{"action": "resync", "order_ids": [...]}`` and gets an
+    ``order_snapshot`` per order, queued after the events already sent to
+    it; deltas at or below the snapshot's version are then stale. Any other
+    message is answered with a pong.
+    """
+    params = websocket.query_params
+    try:
+        subscription = Subscription.parse(params.get("topics"), params)
+        last_seq = int(params["last_seq"]) if params.get("last_seq") else None
+    except ValueError as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+        return
+
+    await ws_manager.connect(websocket, subscription, last_seq, params.get("stream"))
     try:
         while True:
-            data = await websocket.receive_text()
-            await websocket.send_json({"type": "ping", "message": "pong"})
+            text = await websocket.receive_text()
+            await _handle_ws_message(websocket, text)
     except WebSocketDisconnect:
         ws_manager.disconnect(websocket)
 
@@ -75,6 +251,22 @@ app = APIRouter(prefix="/orders", tags=["Orders"])
 get_order_viewer = require_roles(UserRole.ADMIN, UserRole.STAFF, UserRole.CHEF)
 
 
+def order_list_params(
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    start_date: datetime | None = Query(default=None),
+    end_date: datetime | None = Query(default=None),
+    lean: bool = Query(default=False),
+) -> schemas.OrderListParams:
+    return schemas.OrderListParams(
+        limit=limit,
+        cursor=cursor,
+        start_date=start_date,
+        end_date=end_date,
+        lean=lean,
+    )
+
+
 def normalize_business_type(value: str | None) -> str | None:
     if value is None:
         return None
@@ -85,15 +277,11 @@ def normalize_business_type(value: str | None) -> str | None:
 
 @app.get("/config", response_model=schemas.SystemConfigResponse)
 async def get_config():
-    config = await crud.get_business_type()
-    service_fee_percent = await crud.get_service_fee_percent()
-    business_name = await crud.get_business_name()
-    business_phone = await crud.get_business_phone()
     return schemas.SystemConfigResponse(
-        business_type=config,
-        service_fee_percent=service_fee_percent,
-        business_name=business_name,
-        business_phone=business_phone,
+        business_type=await crud.get_business_type(),
+        service_fee_percent=await crud.get_service_fee_percent(),
+        business_name=await crud.get_business_name(),
+        business_phone=await crud.get_business_phone(),
     )
 
 
@@ -104,9 +292,11 @@ async def get_tables():
 
 
 @app.get("", response_model=schemas.OrdersResponse, status_code=status.HTTP_200_OK)
-async def get_orders(_: schemas.User = Depends(get_order_viewer)):
-    orders = await crud.get_orders()
-    return schemas.OrdersResponse(orders=orders, total=len(orders))
+async def get_orders(
+    page: schemas.OrderListParams = Depends(order_list_params),
+    _: schemas.User = Depends(get_order_viewer),
+):
+    return await crud.get_orders(page)
 
 
 @app.get(
@@ -123,16 +313,18 @@ async def get_order(order_id: int):
 
 @app.get("/status/{order_status}", response_model=schemas.OrdersResponse)
 async def get_orders_by_status(
-    order_status: str, _: schemas.User = Depends(get_order_viewer)
+    order_status: str,
+    page: schemas.OrderListParams = Depends(order_list_params),
+    _: schemas.User = Depends(get_order_viewer),
 ):
-    orders = await crud.get_orders_by_status(order_status)
-    return schemas.OrdersResponse(orders=orders, total=len(orders))
+    return await crud.get_orders_by_status(order_status, page)
 
 
 @app.get("/user/{user_id}", response_model=schemas.OrdersResponse)
-async def get_orders_by_user(user_id: int):
-    orders = await crud.get_orders_by_user(user_id)
-    return schemas.OrdersResponse(orders=orders, total=len(orders))
+async def get_orders_by_user(
+    user_id: int, page: schemas.OrderListParams = Depends(order_list_params)
+):
+    return await crud.get_orders_by_user(user_id, page)
 
 
 @app.post("", response_model=schemas.OrderResponse, status_code=status.HTTP_201_CREATED)
@@ -0,0 +1,52 @@
+import time
+from typing import Awaitable, Callable
+
+from config import settings
+
+
+class ConfigCache:
+    """System config for this process, fetched in one request.
+
+    ``config.updated`` events patch the cached values in place; the TTL only
+    bounds how long a missed event can leave them stale. If the database
+    service is unreachable the last known values are served.
+    """
+
+    def __init__(self):
+        self.ttl = settings.CONFIG_CACHE_TTL_SECONDS
+        self._values: dict[str, str] | None = None
+        self._expires_at = 0.0
+        # Bumped on every event so a load that raced one is not cached.
+        self._generation = 0
+
+    async def get(
+        self, loader: Callable[[], Awaitable[dict[str, str]]]
+    ) -> dict[str, str]:
+        if self._values is not None and self._expires_at > time.monotonic():
+            return self._values
+
+        generation = self._generation
+        try:
+            values = await loader()
+        except Exception:
+            if self._values is None:
+                raise
+            print("⚠️ System config refresh failed, serving cached values")
+            return self._values
+
+        if generation == self._generation:
+            self._values = values
+            self._expires_at = time.monotonic() + self.ttl
+        return values
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._expires_at = 0.0
+
+    async def handle_config_event(self, data: dict) -> None:
+        key = data.get("key")
+        if self._values is None or key is None or "value" not in data:
+            self.invalidate()
+            return
+        self._generation += 1
+        self._values = {**self._values, key: data["value"]}
@@ -4,7 +4,9 @@ from typing import Any, Callable
 import httpx
 import schemas
 from config import settings
+from config_cache import ConfigCache
 from fastapi import HTTPException, status
+from shared import codec
 
 
 class ServiceClient:
@@ -15,7 +17,6 @@ class ServiceClient:
         self.auth_client = httpx.AsyncClient(
             base_url="http://127.0.0.1:8003", timeout=10.0
         )
-        self._business_type_cache = None
 
     async def close(self):
         await self.db_client.aclose()
@@ -23,6 +24,7 @@ class ServiceClient:
 
 
 service_client = ServiceClient()
+config_cache = ConfigCache()
 
 
 def handle_service_errors(func: Callable) -> Callable:
@@ -49,43 +51,38 @@ def handle_service_errors(func: Callable) -> Callable:
     return wrapper
 
 
+async def _load_system_config() -> dict[str, str]:
+    response = await service_client.db_client.get("/system-config")
+    response.raise_for_status()
+    return codec.decode_response(response)
+
+
 @handle_service_errors
+async def get_system_config() -> dict[str, str]:
+    return await config_cache.get(_load_system_config)
+
+
 async def get_business_type() -> str:
-    if service_client._business_type_cache:
-        return service_client._business_type_cache
-    response = await service_client.db_client.get("/system-config/business_type")
-    if response.status_code == 200:
-        business_type = response.json().get("value", "market")
-        service_client._business_type_cache = business_type
-        return business_type
-    return "market"
+    config = await get_system_config() or {}
+    return config.get("business_type") or "market"
 
 
-@handle_service_errors
 async def get_service_fee_percent() -> float:
-    response = await service_client.db_client.get("/system-config/service_fee_percent")
-    if response.status_code == 200:
-        try:
-            return float(response.json().get("value", 0) or 0)
-        except (TypeError, ValueError):
-            return 0.0
-    return 0.0
+    config = await get_system_config() or {}
+    try:
+        return float(config.get("service_fee_percent") or 0)
+    except (TypeError, ValueError):
+        return 0.0
 
 
-@handle_service_errors
 async def get_business_name() -> str:
-    response = await service_client.db_client.get("/system-config/business_name")
-    if response.status_code == 200:
-        return str(response.json().get("value", "POS System") or "POS System")
-    return "POS System"
+    config = await get_system_config() or {}
+    return str(config.get("business_name") or "POS System")
 
 
-@handle_service_errors
 async def get_business_phone() -> str:
-    response = await service_client.db_client.get("/system-config/business_phone")
-    if response.status_code == 200:
-        return str(response.json().get("value", "+998") or "+998")
-    return "+998"
+    config = await get_system_config() or {}
+    return str(config.get("business_phone") or "+998")
 
 
 @handle_service_errors
@@ -93,22 +90,39 @@ async def get_active_tables() -> list[schemas.TableResponse]:
     response = await service_client.db_client.get("/tables")
     if response.status_code != 200:
         return []
-    data = response.json()
+    data = codec.decode_response(response)
     tables = data.get("tables", [])
     return [schemas.TableResponse.model_validate(table) for table in tables]
 
 
+def _order_list_query(page: schemas.OrderListParams | None) -> dict:
+    if page is None:
+        return {}
+    return page.model_dump(mode="json", exclude_none=True)
+
+
+def _parse_orders_page(data: dict) -> schemas.OrdersResponse:
+    orders = [
+        schemas.OrderResponse.model_validate(order) for order in data.get("orders", [])
+    ]
+    return schemas.OrdersResponse(
+        orders=orders, total=len(orders), next_cursor=data.get("next_cursor")
+    )
+
+
 @handle_service_errors
-async def get_orders() -> list[schemas.OrderResponse]:
-    response = await service_client.db_client.get("/orders")
+async def get_orders(
+    page: schemas.OrderListParams | None = None,
+) -> schemas.OrdersResponse:
+    response = await service_client.db_client.get(
+        "/orders", params=_order_list_query(page)
+    )
     if response.status_code != 200:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch orders",
         )
-    data = response.json()
-    orders = data.get("orders", [])
-    return [schemas.OrderResponse.model_validate(order) for order in orders]
+    return _parse_orders_page(codec.decode_response(response))
 
 
 @handle_service_errors
@@ -121,7 +135,7 @@ async def get_order_by_id(order_id: int) -> schemas.OrderResponse | None:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch order",
         )
-    return schemas.OrderResponse.model_validate(response.json())
+    return schemas.OrderResponse.model_validate(codec.decode_response(response))
 
 
 @handle_service_errors
@@ -155,9 +169,9 @@ async def create_order(
         },
     )
     if response.status_code == 201:
-        return schemas.OrderResponse.model_validate(response.json())
+        return schemas.OrderResponse.model_validate(codec.decode_response(response))
     if response.status_code == 400:
-        error_detail = response.json().get("detail", "Bad request")
+        error_detail = codec.decode_response(response).get("detail", "Bad request")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=error_detail
         )
@@ -174,7 +188,7 @@ async def update_order(
     if response.status_code == 404:
         return None
     if response.status_code == 200:
-        return schemas.OrderResponse.model_validate(response.json())
+        return schemas.OrderResponse.model_validate(codec.decode_response(response))
     return None
 
 
@@ -199,14 +213,14 @@ async def update_order_status(
         return None
 
     if response.status_code in (400, 422):
-        error_data = response.json() if response.content else {}
+        error_data = codec.decode_response(response) if response.content else {}
         error_detail = error_data.get("detail", "Invalid status")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=error_detail
         )
 
     if response.status_code == 200:
-        return schemas.OrderResponse.model_validate(response.json())
+        return schemas.OrderResponse.model_validate(codec.decode_response(response))
 
     raise HTTPException(
         status_code=status.HTTP_502_BAD_GATEWAY,
@@ -226,12 +240,14 @@ async def add_order_item(
             status_code=status.HTTP_404_NOT_FOUND, detail="Order not found"
         )
     if response.status_code == 400:
-        error_detail = response.json().get("detail", "Invalid item data")
+        error_detail = codec.decode_response(response).get(
+            "detail", "Invalid item data"
+        )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=error_detail
         )
     if response.status_code in [200, 201]:
-        return schemas.OrderResponse.model_validate(response.json())
+        return schemas.OrderResponse.model_validate(codec.decode_response(response))
     return None
 
 
@@ -245,13 +261,13 @@ async def update_order_item(
     if response.status_code == 404:
         return None
     if response.status_code in (400, 422):
-        error_data = response.json() if response.content else {}
+        error_data = codec.decode_response(response) if response.content else {}
         error_detail = error_data.get("detail", "Invalid item data")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=error_detail
         )
     if response.status_code == 200:
-        return schemas.OrderResponse.model_validate(response.json())
+        return schemas.OrderResponse.model_validate(codec.decode_response(response))
     return None
 
 
@@ -265,13 +281,13 @@ async def remove_order_item(
     if response.status_code == 404:
         return None
     if response.status_code in (400, 422):
-        error_data = response.json() if response.content else {}
+        error_data = codec.decode_response(response) if response.content else {}
         error_detail = error_data.get("detail", "Invalid item data")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=error_detail
         )
     if response.status_code == 200:
-        return schemas.OrderResponse.model_validate(response.json())
+        return schemas.OrderResponse.model_validate(codec.decode_response(response))
     return None
 
 
@@ -284,23 +300,27 @@ async def delete_order(order_id: int) -> bool:
 
 
 @handle_service_errors
-async def get_orders_by_status(order_status: str) -> list[schemas.OrderResponse]:
-    response = await service_client.db_client.get(f"/orders/status/{order_status}")
+async def get_orders_by_status(
+    order_status: str, page: schemas.OrderListParams | None = None
+) -> schemas.OrdersResponse:
+    response = await service_client.db_client.get(
+        f"/orders/status/{order_status}", params=_order_list_query(page)
+    )
     if response.status_code != 200:
-        return []
-    data = response.json()
-    orders = data.get("orders", [])
-    return [schemas.OrderResponse.model_validate(order) for order in orders]
+        return schemas.OrdersResponse()
+    return _parse_orders_page(codec.decode_response(response))
 
 
 @handle_service_errors
-async def get_orders_by_user(user_id: int) -> list[schemas.OrderResponse]:
-    response = await service_client.db_client.get(f"/orders/user/{user_id}")
+async def get_orders_by_user(
+    user_id: int, page: schemas.OrderListParams | None = None
+) -> schemas.OrdersResponse:
+    response = await service_client.db_client.get(
+        f"/orders/user/{user_id}", params=_order_list_query(page)
+    )
     if response.status_code != 200:
-        return []
-    data = response.json()
-    orders = data.get("orders", [])
-    return [schemas.OrderResponse.model_validate(order) for order in orders]
+        return schemas.OrdersResponse()
+    return _parse_orders_page(codec.decode_response(response))
 
 
 @handle_service_errors
@@ -308,5 +328,5 @@ async def calculate_order_total(order_id: int) -> float:
     response = await service_client.db_client.get(f"/orders/{order_id}/total")
     if response.status_code != 200:
         return 0.0
-    data = response.json()
+    data = codec.decode_response(response)
     return data.get("total", 0.0)
@@ -1,8 +1,10 @@
 import crud
 from authx import TokenPayload
-from config import auth
+from config import auth, settings
 from fastapi import Depends, HTTPException, status
+from redis_client import redis_client
 from schemas import User
+from shared.user_cache import UserCache
 
 
 class UserRole:
@@ -11,6 +13,15 @@ class UserRole:
     CHEF = "chef"
 
 
+user_cache = UserCache(
+    User,
+    redis_client,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+    snapshot_ttl_seconds=settings.USER_SNAPSHOT_TTL_SECONDS,
+)
+
+
 async def get_current_user(
     token: TokenPayload = Depends(auth.access_token_required),
 ) -> User:
@@ -24,7 +35,7 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        user = await crud.get_user_by_username(username)
+        user = await user_cache.get(username, crud.get_user_by_username)
 
         if not user:
             raise HTTPException(
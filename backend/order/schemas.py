@@ -63,6 +63,7 @@ class OrderResponse(OrderBase):
     status: str
     created_at: datetime
     updated_at: datetime | None = None
+    version: int = 1
     items: list[OrderItem] = Field(default_factory=list)
     user: dict | None = None  # ADD THIS LINE
     table: dict | None = None  # ADD THIS LINE
@@ -73,13 +74,23 @@ class OrderResponse(OrderBase):
 class OrdersResponse(BaseModel):
     orders: list[OrderResponse] = Field(default_factory=list)
     total: int = 0
+    next_cursor: str | None = None
+
+
+class OrderListParams(BaseModel):
+    limit: int = Field(default=100, ge=1, le=500)
+    cursor: str | None = None
+    start_date: datetime | None = None
+    end_date: datetime | None = None
+    lean: bool = False
 
 
 class User(BaseModel):
+    """The user behind a request. Cached for auth checks, so no PIN."""
+
     id: int
     username: str
     full_name: str
-    pin: int
     role: str
     status: str
     last_login: datetime | None = None
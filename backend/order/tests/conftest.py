@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# The service imports its modules flat (``from config import settings``) and
+# the shared clients as ``shared``, as it does when run from its directory.
+SERVICE_DIR = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(SERVICE_DIR), str(SERVICE_DIR.parent)]
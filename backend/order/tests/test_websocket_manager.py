@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+import pytest
+from config import settings
+from shared import codec
+from websocket_manager import DISCONNECT, DROP_OLDEST, WebSocketManager
+
+QUEUE_SIZE = 4
+BROADCASTS = 50
+# Generous for a loaded CI box; a client stuck behind the slow one would
+# wait forever, not a few milliseconds.
+DELIVERY_BOUND_SECONDS = 0.5
+
+
+class FastClient:
+    def __init__(self):
+        self.received: list[tuple[float, str]] = []
+        self.got_frame = asyncio.Event()
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame: str):
+        self.received.append((time.perf_counter(), frame))
+        self.got_frame.set()
+
+    async def close(self):
+        self.closed = True
+
+
+class StalledClient(FastClient):
+    """Never reads: its first send blocks for good."""
+
+    async def send_text(self, frame: str):
+        await asyncio.Event().wait()
+
+
+async def _wait_for_count(client: FastClient, count: int, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while len(client.received) < count:
+        remaining = deadline - time.perf_counter()
+        assert remaining > 0, f"got {len(client.received)} of {count} frames"
+        client.got_frame.clear()
+        try:
+            await asyncio.wait_for(client.got_frame.wait(), remaining)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _broadcast_next_to_stalled_client():
+    manager = WebSocketManager()
+    stalled = StalledClient()
+    fast = [FastClient() for _ in range(3)]
+    await manager.connect(stalled)
+    for client in fast:
+        await manager.connect(client)
+    # Each client's hello frame
+    for client in fast:
+        await _wait_for_count(client, 1, DELIVERY_BOUND_SECONDS)
+
+    for i in range(BROADCASTS):
+        sent_at = time.perf_counter()
+        await manager.broadcast(
+            {"type": "order_update", "data": {"order_id": i}}, topic="order.updated"
+        )
+        assert time.perf_counter() - sent_at < DELIVERY_BOUND_SECONDS
+        for client in fast:
+            await _wait_for_count(client, i + 2, DELIVERY_BOUND_SECONDS)
+            received_at = client.received[-1][0]
+            assert received_at - sent_at < DELIVERY_BOUND_SECONDS
+
+    for client in fast:
+        order_ids = [
+            codec.loads(frame)["data"]["order_id"] for _, frame in client.received[1:]
+        ]
+        assert order_ids == list(range(BROADCASTS))
+    return manager, stalled
+
+
+@pytest.fixture
+def queue_policy(monkeypatch):
+    monkeypatch.setattr(settings, "WS_SEND_QUEUE_SIZE", QUEUE_SIZE)
+
+    def use(policy: str):
+        monkeypatch.setattr(settings, "WS_SLOW_CONSUMER_POLICY", policy)
+
+    return use
+
+
+def test_stalled_client_does_not_delay_others_drop_oldest(queue_policy):
+    queue_policy(DROP_OLDEST)
+
+    async def run():
+        manager, stalled = await _broadcast_next_to_stalled_client()
+        connection = manager.connections[stalled]
+        # Still connected, holding only the newest frames
+        assert len(connection.queue) <= QUEUE_SIZE
+        assert connection.dropped > 0
+        assert manager.stats()["dropped"] == connection.dropped
+
+    asyncio.run(run())
+
+
+def test_stalled_client_does_not_delay_others_disconnect(queue_policy):
+    queue_policy(DISCONNECT)
+
+    async def run():
+        manager, stalled = await _broadcast_next_to_stalled_client()
+        assert stalled not in manager.connections
+        assert manager.disconnected_slow == 1
+        await asyncio.sleep(0)
+        assert stalled.closed
+
+    asyncio.run(run())
@@ -1,34 +1,402 @@
-import json
-from typing import Dict, Set
+import asyncio
+import uuid
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Hashable, Iterable, Mapping, Optional
 
+from config import settings
 from fastapi import WebSocket
+from shared import codec
+
+DROP_OLDEST = "drop_oldest"
+DISCONNECT = "disconnect"
+
+ALL_TOPICS = "*"
+# Event attributes a client can filter on
+DIMENSIONS = ("table_id", "user_id", "category_id")
+
+
+def _topic_pattern(topic: str) -> str:
+    topic = topic.strip()
+    if topic in ("", "#", ALL_TOPICS):
+        return ALL_TOPICS
+    return topic if "." in topic else f"{topic}.*"
+
+
+@dataclass(frozen=True)
+class Subscription:
+    """What one client wants: topics plus optional attribute filters.
+
+    Topics are routing keys (``order.status_updated``), per-kind wildcards
+    (``order.*`` or just ``order``) or ``*``. A filter on a dimension only
+    applies to events that carry that dimension, so ``table_id=3`` narrows
+    order traffic without hiding product events.
+    """
+
+    topics: frozenset = frozenset({ALL_TOPICS})
+    filters: Mapping[str, frozenset] = field(default_factory=dict)
+
+    @classmethod
+    def parse(
+        cls, topics: Iterable[str] | str | None, filters: Mapping[str, Any]
+    ) -> "Subscription":
+        """Build from query params or a subscribe message; ValueError if invalid."""
+        if isinstance(topics, str):
+            topics = topics.split(",")
+        patterns = frozenset(_topic_pattern(t) for t in topics or ()) or frozenset(
+            {ALL_TOPICS}
+        )
+
+        parsed = {}
+        for dim in DIMENSIONS:
+            values = filters.get(dim)
+            if values is None or values == "":
+                continue
+            if isinstance(values, (str, int)):
+                values = str(values).split(",")
+            try:
+                parsed[dim] = frozenset(int(v) for v in values)
+            except (TypeError, ValueError):
+                raise ValueError(f"{dim} must be an integer or a list of integers")
+        return cls(patterns, parsed)
+
+    def as_dict(self) -> dict:
+        return {
+            "topics": sorted(self.topics),
+            **{dim: sorted(values) for dim, values in self.filters.items()},
+        }
+
+    def matches(self, topic: str, attributes: Mapping[str, Iterable]) -> bool:
+        """Single-client version of ``SubscriptionIndex.match``."""
+        kind = topic.split(".", 1)[0]
+        if not self.topics & {ALL_TOPICS, f"{kind}.*", topic}:
+            return False
+        for dim, values in attributes.items():
+            wanted = self.filters.get(dim)
+            if wanted is not None and wanted.isdisjoint(values):
+                return False
+        return True
+
+
+class SubscriptionIndex:
+    """Topic and attribute postings, so routing an event only visits clients
+    whose topics match it rather than every open socket."""
+
+    def __init__(self):
+        self._by_topic: dict[str, set] = defaultdict(set)
+        self._by_value = {dim: defaultdict(set) for dim in DIMENSIONS}
+        self._unfiltered = {dim: set() for dim in DIMENSIONS}
+        self._subscriptions: dict[Hashable, Subscription] = {}
+
+    def get(self, key: Hashable) -> Optional[Subscription]:
+        return self._subscriptions.get(key)
+
+    def add(self, key: Hashable, subscription: Subscription) -> None:
+        self.remove(key)
+        self._subscriptions[key] = subscription
+        for topic in subscription.topics:
+            self._by_topic[topic].add(key)
+        for dim in DIMENSIONS:
+            values = subscription.filters.get(dim)
+            if values is None:
+                self._unfiltered[dim].add(key)
+            else:
+                for value in values:
+                    self._by_value[dim][value].add(key)
+
+    def remove(self, key: Hashable) -> None:
+        subscription = self._subscriptions.pop(key, None)
+        if subscription is None:
+            return
+        for topic in subscription.topics:
+            self._by_topic[topic].discard(key)
+            if not self._by_topic[topic]:
+                del self._by_topic[topic]
+        for dim in DIMENSIONS:
+            self._unfiltered[dim].discard(key)
+            for value in subscription.filters.get(dim, ()):
+                postings = self._by_value[dim][value]
+                postings.discard(key)
+                if not postings:
+                    del self._by_value[dim][value]
+
+    def topic_counts(self) -> dict[str, int]:
+        return {topic: len(keys) for topic, keys in self._by_topic.items()}
+
+    def match(self, topic: str, attributes: Mapping[str, Iterable]) -> set:
+        kind = topic.split(".", 1)[0]
+        candidates = set()
+        for pattern in (ALL_TOPICS, f"{kind}.*", topic):
+            candidates |= self._by_topic.get(pattern, set())
+
+        for dim, values in attributes.items():
+            if not candidates:
+                break
+            matched = set()
+            for value in values:
+                matched |= self._by_value[dim].get(value, set())
+            # Set intersection walks the smaller side, so a filter that only a
+            # few clients pass costs little even when many follow the topic.
+            candidates = (candidates & self._unfiltered[dim]) | (candidates & matched)
+        return candidates
+
+
+class ReplayBuffer:
+    """The most recent events, numbered, for clients that reconnect.
+
+    Sequence numbers only mean something within one process, so each
+    buffer has a random ``stream`` id; a client resuming against another
+    stream (a restart, another worker) is told to reload instead.
+    """
+
+    def __init__(self, size: int):
+        self.stream = uuid.uuid4().hex[:12]
+        self.seq = 0
+        # (seq, topic, attributes, frame)
+        self._events: deque[tuple] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def append(
+        self, message: dict, topic: str, attributes: Mapping[str, Iterable]
+    ) -> str:
+        """Number and serialise an event; returns the frame to send."""
+        self.seq += 1
+        frame = codec.dumps_text({**message, "seq": self.seq})
+        self._events.append((self.seq, topic, attributes, frame))
+        return frame
+
+    def since(self, stream: str | None, seq: int) -> Optional[list[tuple]]:
+        """Events after ``seq``, or None if any of them is no longer held."""
+        if stream != self.stream or seq > self.seq:
+            return None
+        oldest = self._events[0][0] if self._events else self.seq + 1
+        if seq < oldest - 1:
+            return None
+        # Numbers are contiguous, so the first missed event's position is known.
+        return list(islice(self._events, seq - oldest + 1, None))
+
+
+class _Connection:
+    """One client: a bounded queue of ready-to-send frames and its sender task.
+
+    ``broadcast`` only appends here, so a client on a slow link fills its own
+    queue instead of holding up everyone else's.
+    """
+
+    def __init__(self, websocket: WebSocket, max_queue: int):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        # [coalesce_key, frame]; lists so a coalesced entry can be found and moved
+        self.queue: deque[list] = deque()
+        self.pending: Dict[Hashable, list] = {}
+        self.ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+
+    def enqueue(self, frame: str, coalesce_key: Optional[Hashable] = None) -> bool:
+        """Queue a frame; False when the queue is full and nothing could give."""
+        if coalesce_key is not None:
+            entry = self.pending.get(coalesce_key)
+            if entry is not None:
+                # A newer state of the same thing supersedes the unsent one.
+                # It goes to the back, behind frames queued since the one it
+                # replaces, so frames still leave in seq order.
+                self.queue.remove(entry)
+                entry[1] = frame
+                self.queue.append(entry)
+                self.coalesced += 1
+                return True
+
+        if len(self.queue) >= self.max_queue:
+            if settings.WS_SLOW_CONSUMER_POLICY == DISCONNECT:
+                return False
+            key, _ = self.queue.popleft()
+            if key is not None:
+                self.pending.pop(key, None)
+            self.dropped += 1
+
+        entry = [coalesce_key, frame]
+        self.queue.append(entry)
+        if coalesce_key is not None:
+            self.pending[coalesce_key] = entry
+        self.max_depth = max(self.max_depth, len(self.queue))
+        self.ready.set()
+        return True
+
+    async def run(self, on_failure) -> None:
+        try:
+            while True:
+                await self.ready.wait()
+                while self.queue:
+                    entry = self.queue.popleft()
+                    if self.pending.get(entry[0]) is entry:
+                        del self.pending[entry[0]]
+                    await asyncio.wait_for(
+                        self.websocket.send_text(entry[1]),
+                        timeout=settings.WS_SEND_TIMEOUT_SECONDS,
+                    )
+                    self.sent += 1
+                self.ready.clear()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ Error sending to WebSocket: {type(e).__name__}: {e}")
+            await on_failure(self.websocket)
 
 
 class WebSocketManager:
     def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
+        self.connections: Dict[WebSocket, _Connection] = {}
+        self.dropped_total = 0
+        self.coalesced_total = 0
+        self.disconnected_slow = 0
+        self._closing: set[asyncio.Task] = set()
+        self.subscriptions = SubscriptionIndex()
+        self.replay = ReplayBuffer(settings.WS_REPLAY_BUFFER_SIZE)
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        subscription: Optional[Subscription] = None,
+        last_seq: Optional[int] = None,
+        stream: Optional[str] = None,
+    ):
+        """Register a client and greet it with the stream position.
 
-    async def connect(self, websocket: WebSocket):
+        With ``last_seq`` (and the ``stream`` it came from) the events the
+        client missed are queued first, ahead of anything live. The hello
+        frame's ``resumed`` is false when they could not be replayed and the
+        client has to reload its state.
+        """
         await websocket.accept()
-        self.active_connections.add(websocket)
-        print(f"✅ WebSocket connected. Total: {len(self.active_connections)}")
+        subscription = subscription or Subscription()
+        connection = _Connection(websocket, settings.WS_SEND_QUEUE_SIZE)
+        connection.task = asyncio.create_task(connection.run(self._close))
+        self.connections[websocket] = connection
+        self.subscriptions.add(websocket, subscription)
+
+        # No await from here on, so no broadcast can slip in between the
+        # replayed events and the live ones.
+        missed = None if last_seq is None else self.replay.since(stream, last_seq)
+        replayed = [
+            frame
+            for _, topic, attributes, frame in missed or ()
+            if subscription.matches(topic, attributes)
+        ]
+        hello = {
+            "type": "hello",
+            "stream": self.replay.stream,
+            "seq": self.replay.seq,
+            "resumed": missed is not None,
+            "replayed": len(replayed),
+        }
+        self._enqueue(connection, codec.dumps_text(hello), None)
+        for frame in replayed:
+            self._enqueue(connection, frame, None)
+        print(f"✅ WebSocket connected. Total: {len(self.connections)}")
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.discard(websocket)
-        print(f"👋 WebSocket disconnected. Total: {len(self.active_connections)}")
+        connection = self.connections.pop(websocket, None)
+        if connection is None:
+            return
+        self.subscriptions.remove(websocket)
+        self.dropped_total += connection.dropped
+        self.coalesced_total += connection.coalesced
+        if (
+            connection.task is not None
+            and connection.task is not asyncio.current_task()
+        ):
+            connection.task.cancel()
+        print(f"👋 WebSocket disconnected. Total: {len(self.connections)}")
 
-    async def broadcast(self, message: dict):
-        disconnected = set()
+    async def _close(self, websocket: WebSocket):
+        self.disconnect(websocket)
+        try:
+            await websocket.close()
+        except Exception:
+            pass
 
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                print(f"❌ Error sending to WebSocket: {e}")
-                disconnected.add(connection)
+    def _enqueue(
+        self, connection: _Connection, frame: str, coalesce_key: Optional[Hashable]
+    ) -> None:
+        if not connection.enqueue(frame, coalesce_key):
+            print("⚠️ WebSocket client too slow, disconnecting")
+            self.disconnected_slow += 1
+            # Detach now so later broadcasts skip it; the close can finish later.
+            self.disconnect(connection.websocket)
+            task = asyncio.create_task(self._close(connection.websocket))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def send(
+        self, websocket: WebSocket, message: Any, coalesce_key: Hashable = None
+    ):
+        """Queue a message for one client, in order with its broadcasts."""
+        connection = self.connections.get(websocket)
+        if connection is not None:
+            self._enqueue(connection, codec.dumps_text(message), coalesce_key)
+
+    def subscribe(self, websocket: WebSocket, subscription: Subscription):
+        """Replace a connected client's subscription."""
+        if websocket in self.connections:
+            self.subscriptions.add(websocket, subscription)
+
+    async def broadcast(
+        self,
+        message: Any,
+        coalesce_key: Hashable = None,
+        topic: Optional[str] = None,
+        attributes: Optional[Mapping[str, Iterable]] = None,
+    ):
+        """Queue one pre-serialised frame for every interested client and return.
+
+        With ``topic`` only clients whose subscription matches it and
+        ``attributes`` get the frame; without it everyone does. Topic events
+        are numbered (``seq``) and kept for replay to reconnecting clients.
+        Messages sharing a ``coalesce_key`` replace each other while still
+        queued, so a lagging client gets the latest state, not every step.
+        """
+        if topic is None:
+            targets = list(self.connections.values())
+            if not targets:
+                return
+            frame = codec.dumps_text(message)
+        else:
+            attributes = attributes or {}
+            frame = self.replay.append(message, topic, attributes)
+            targets = [
+                self.connections[websocket]
+                for websocket in self.subscriptions.match(topic, attributes)
+                if websocket in self.connections
+            ]
+        for connection in targets:
+            self._enqueue(connection, frame, coalesce_key)
 
-        # Remove disconnected clients
-        self.active_connections -= disconnected
+    def stats(self) -> dict:
+        depths = [len(c.queue) for c in self.connections.values()]
+        live = self.connections.values()
+        return {
+            "connections": len(depths),
+            "topics": self.subscriptions.topic_counts(),
+            "stream": self.replay.stream,
+            "seq": self.replay.seq,
+            "replay_buffered": len(self.replay),
+            "queue_limit": settings.WS_SEND_QUEUE_SIZE,
+            "slow_consumer_policy": settings.WS_SLOW_CONSUMER_POLICY,
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "queue_depth_high_water": max((c.max_depth for c in live), default=0),
+            "sent": sum(c.sent for c in live),
+            "dropped": self.dropped_total + sum(c.dropped for c in live),
+            "coalesced": self.coalesced_total + sum(c.coalesced for c in live),
+            "disconnected_slow": self.disconnected_slow,
+        }
 
 
 ws_manager = WebSocketManager()
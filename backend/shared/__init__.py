@@ -0,0 +1,6 @@
+"""Clients shared by the backend services.
+
+Import the module you need (``shared.rabbitmq_client``,
+``shared.redis_client``); nothing is imported here, so a service without
+redis installed can still use the RabbitMQ client.
+"""
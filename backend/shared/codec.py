@@ -0,0 +1,60 @@
+"""Encoding for event bodies, WebSocket frames and service responses.
+
+orjson by default. Bodies whose content type is application/msgpack go
+through msgpack, which is optional: install it in every service that
+consumes such messages before switching a publisher to it.
+"""
+
+from typing import Any
+
+import orjson
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+
+# Same output as json.dumps(default=str): datetimes, Decimals and the like
+# become their str(), non-string dict keys become strings
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=str, option=_JSON_OPTIONS)
+
+
+def dumps_text(value: Any) -> str:
+    return dumps(value).decode()
+
+
+def loads(data: bytes | str) -> Any:
+    return orjson.loads(data)
+
+
+def check_content_type(content_type: str) -> None:
+    if content_type not in (JSON, MSGPACK):
+        raise ValueError(f"Unsupported content type: {content_type}")
+    if content_type == MSGPACK and msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+
+
+def encode(value: Any, content_type: str = JSON) -> bytes:
+    if content_type == MSGPACK:
+        return msgpack.packb(value, default=str)
+    return dumps(value)
+
+
+def decode(data: bytes | str, content_type: str | None = None) -> Any:
+    if content_type and content_type.startswith(MSGPACK):
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed")
+        return msgpack.unpackb(data, strict_map_key=False)
+    return loads(data)
+
+
+def decode_response(response) -> Any:
+    """Body of an httpx response, decoded according to its content type."""
+    return decode(response.content, response.headers.get("content-type"))
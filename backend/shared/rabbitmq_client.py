@@ -1,70 +1,290 @@
-import aio_pika
-import json
+import asyncio
 from typing import Callable
-from config import settings
+
+import aio_pika
+
+from shared import codec
+
+DEAD_LETTER_EXCHANGE = "pos_events.dlx"
+DEAD_LETTER_QUEUE = "pos_events.dead_letter"
 
 
 class RabbitMQClient:
-    def __init__(self):
+    """Publisher and consumer for the pos_events exchange, used by every service.
+
+    One robust connection per process: publishes share a confirm channel,
+    each subscription gets a channel of its own. Services build their
+    instance from their own settings in their rabbitmq_client module.
+    Bodies are encoded as ``content_type``; consumers decode by the type
+    each message carries.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        prefetch_count: int = 32,
+        concurrency: int = 8,
+        exchange_name: str = "pos_events",
+        content_type: str = codec.JSON,
+    ):
+        codec.check_content_type(content_type)
+        self.url = url
+        self.content_type = content_type
+        self.prefetch_count = prefetch_count
+        self.concurrency = concurrency
         self.connection = None
         self.channel = None
         self.exchange = None
+        self._connect_lock = asyncio.Lock()
+        self._connect_task = None
+        self._exchange_name = exchange_name
+        self._in_flight = 0
+        self.metrics = {
+            "published": 0,
+            "publish_failed": 0,
+            "consumed": 0,
+            "dead_lettered": 0,
+        }
+
+    def is_connected(self) -> bool:
+        return bool(
+            self.connection
+            and not self.connection.is_closed
+            and self.channel
+            and not self.channel.is_closed
+            and self.exchange
+        )
 
-    async def connect(self):
-        self.connection = await aio_pika.connect_robust(settings.RABBITMQ_URL)
-        self.channel = await self.connection.channel()
+    def stats(self) -> dict:
+        return {
+            **self.metrics,
+            "connected": self.is_connected(),
+            "in_flight": self._in_flight,
+        }
+
+    async def _open_connection(self):
+        self.connection = await aio_pika.connect_robust(self.url)
+        # With confirms, publish() returns only once the broker has the message;
+        # publish_many() keeps a batch of them in flight on the one channel
+        self.channel = await self.connection.channel(publisher_confirms=True)
 
         self.exchange = await self.channel.declare_exchange(
-            "pos_events", aio_pika.ExchangeType.TOPIC, durable=True
+            self._exchange_name, aio_pika.ExchangeType.TOPIC, durable=True
         )
 
+        # Messages a callback fails on are parked here, keeping their routing
+        # key and an x-death header naming the queue they came from
+        dead_letters = await self.channel.declare_exchange(
+            DEAD_LETTER_EXCHANGE, aio_pika.ExchangeType.FANOUT, durable=True
+        )
+        dead_letter_queue = await self.channel.declare_queue(
+            DEAD_LETTER_QUEUE, durable=True
+        )
+        await dead_letter_queue.bind(dead_letters)
+
         print("✅ RabbitMQ connected")
 
+    async def connect(self, retries: int = 10, delay_seconds: int = 3) -> bool:
+        async with self._connect_lock:
+            if self.is_connected():
+                return True
+
+            last_error = None
+            for attempt in range(1, retries + 1):
+                try:
+                    await self._open_connection()
+                    return True
+                except Exception as exc:
+                    last_error = exc
+                    print(
+                        f"⚠️ RabbitMQ connect attempt {attempt}/{retries} failed: {exc}"
+                    )
+                    if attempt < retries:
+                        await asyncio.sleep(delay_seconds)
+
+            print(f"❌ RabbitMQ unavailable after {retries} attempts: {last_error}")
+            return False
+
+    async def ensure_connected(self) -> bool:
+        if self.is_connected():
+            return True
+        return await self.connect(retries=3, delay_seconds=2)
+
+    async def connect_in_background(self, retries: int = 60, delay_seconds: int = 2):
+        if self._connect_task and not self._connect_task.done():
+            return
+
+        async def _runner():
+            await self.connect(retries=retries, delay_seconds=delay_seconds)
+
+        self._connect_task = asyncio.create_task(_runner())
+
     async def close(self):
+        if self._connect_task and not self._connect_task.done():
+            self._connect_task.cancel()
         if self.connection:
             await self.connection.close()
             print("👋 RabbitMQ disconnected")
 
-    async def publish(self, routing_key: str, message: dict):
-        if not self.exchange:
-            raise Exception("RabbitMQ not connected")
+    async def publish(self, routing_key: str, message: dict) -> bool:
+        if not await self.ensure_connected():
+            print(f"⚠️ Skipped publish, RabbitMQ not connected: {routing_key}")
+            self.metrics["publish_failed"] += 1
+            return False
 
         await self.exchange.publish(
-            aio_pika.Message(
-                body=json.dumps(message).encode(),
-                content_type="application/json",
-                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            self._build_message(message), routing_key=routing_key
+        )
+        self.metrics["published"] += 1
+        print(f"📤 Published: {routing_key}")
+        return True
+
+    async def publish_many(self, messages: list[tuple[str, dict]]) -> int:
+        """Publish (routing_key, message) pairs, waiting on all confirms at once.
+
+        Frames go out in list order; returns how many leading messages the
+        broker confirmed, so a caller can retry from the first failure.
+        """
+        if not messages:
+            return 0
+        if not await self.ensure_connected():
+            print(
+                f"⚠️ Skipped publish of {len(messages)} messages, RabbitMQ not connected"
+            )
+            self.metrics["publish_failed"] += len(messages)
+            return 0
+
+        results = await asyncio.gather(
+            *(
+                self.exchange.publish(self._build_message(message), routing_key=key)
+                for key, message in messages
             ),
-            routing_key=routing_key,
+            return_exceptions=True,
         )
-        print(f"📤 Published: {routing_key} -> {message}")
+        confirmed = 0
+        for result in results:
+            if isinstance(result, BaseException):
+                print(f"⚠️ Publish not confirmed: {result}")
+                break
+            confirmed += 1
+        self.metrics["published"] += confirmed
+        self.metrics["publish_failed"] += len(messages) - confirmed
+        print(f"📤 Published {confirmed}/{len(messages)} messages")
+        return confirmed
 
-    async def subscribe(self, routing_key: str, callback: Callable):
-        if not self.channel:
+    def _build_message(self, message: dict) -> aio_pika.Message:
+        return aio_pika.Message(
+            body=codec.encode(message, self.content_type),
+            content_type=self.content_type,
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+        )
+
+    async def delete_queue(self, queue_name: str):
+        """Drop a queue that is no longer consumed, unless something still is."""
+        if not self.connection:
             raise Exception("RabbitMQ not connected")
 
-        # Create unique queue name without special characters
-        queue_name = (
-            routing_key.replace(".", "_").replace("*", "all").replace("#", "any")
-        )
-        queue_name = f"queue_{queue_name}"
+        # A refused delete closes its channel, so don't use the shared one
+        try:
+            async with self.connection.channel() as channel:
+                await channel.queue_delete(queue_name, if_unused=True)
+            print(f"🗑️ Deleted queue: {queue_name}")
+        except Exception as e:
+            print(f"⚠️ Queue {queue_name} not deleted: {e}")
+
+    async def subscribe(
+        self,
+        routing_key: str,
+        callback: Callable,
+        exclusive: bool = False,
+        prefetch_count: int | None = None,
+        concurrency: int | None = None,
+        ordering_key: str | None = None,
+    ):
+        """Consume routing_key with up to ``concurrency`` callbacks at a time.
+
+        Each subscription has its own channel, so ``prefetch_count`` caps the
+        deliveries it holds unacked. Messages sharing a value of the
+        ``ordering_key`` field run one after another in delivery order.
+        Callback failures are dead-lettered rather than acked.
+        """
+        if not await self.ensure_connected():
+            raise Exception("RabbitMQ not connected")
 
-        queue = await self.channel.declare_queue(queue_name, durable=True)
+        channel = await self.connection.channel()
+        await channel.set_qos(prefetch_count=prefetch_count or self.prefetch_count)
+        arguments = {"x-dead-letter-exchange": DEAD_LETTER_EXCHANGE}
+
+        if exclusive:
+            # Private auto-delete queue: every process gets its own copy of
+            # each event instead of competing on the shared queue.
+            queue = await channel.declare_queue(
+                exclusive=True, auto_delete=True, arguments=arguments
+            )
+            queue_name = queue.name
+        else:
+            # Create unique queue name without special characters
+            queue_name = (
+                routing_key.replace(".", "_").replace("*", "all").replace("#", "any")
+            )
+            queue_name = f"queue_{queue_name}"
+
+            queue = await channel.declare_queue(
+                queue_name, durable=True, arguments=arguments
+            )
 
         # Bind with routing key pattern
         await queue.bind(self.exchange, routing_key=routing_key)
 
+        slots = asyncio.Semaphore(concurrency or self.concurrency)
+        # Last message queued per ordering key; the next one waits for it
+        tails: dict = {}
+
+        async def reject(message: aio_pika.IncomingMessage):
+            self.metrics["dead_lettered"] += 1
+            await message.reject(requeue=False)
+
+        async def handle(message: aio_pika.IncomingMessage, data: dict):
+            try:
+                async with slots:
+                    self._in_flight += 1
+                    try:
+                        await callback(data)
+                    finally:
+                        self._in_flight -= 1
+            except Exception as e:
+                print(f"❌ Error processing message, dead-lettered: {e}")
+                await reject(message)
+            else:
+                self.metrics["consumed"] += 1
+                await message.ack()
+
         async def wrapper(message: aio_pika.IncomingMessage):
-            async with message.process():
-                try:
-                    data = json.loads(message.body.decode())
-                    print(f"📥 Received: {routing_key} -> {data}")
-                    await callback(data)
-                except Exception as e:
-                    print(f"❌ Error processing message: {e}")
+            # aio_pika runs each delivery as its own task, in delivery order;
+            # nothing here awaits before the message has joined its key's chain
+            try:
+                data = codec.decode(message.body, message.content_type)
+            except Exception as e:
+                print(f"❌ Undecodable message, dead-lettered: {e}")
+                await reject(message)
+                return
 
-        await queue.consume(wrapper)
-        print(f"🔔 Subscribed to: {routing_key} (queue: {queue_name})")
+            key = data.get(ordering_key) if ordering_key else None
+            if key is None:
+                await handle(message, data)
+                return
 
+            previous = tails.get(key)
+            done = asyncio.get_running_loop().create_future()
+            tails[key] = done
+            try:
+                if previous is not None:
+                    await previous
+                await handle(message, data)
+            finally:
+                done.set_result(None)
+                if tails.get(key) is done:
+                    del tails[key]
 
-rabbitmq_client = RabbitMQClient()
+        await queue.consume(wrapper)
+        print(f"🔔 Subscribed to: {routing_key} (queue: {queue_name})")
@@ -1,22 +1,27 @@
 import redis.asyncio as redis
 from typing import Optional
-from config import settings
 
 
 class RedisClient:
-    def __init__(self):
+    """Pooled Redis connection; services build one from their own settings."""
+
+    def __init__(self, host: str, port: int, max_connections: int = 50):
         self.redis: Optional[redis.Redis] = None
-        self.host = settings.REDIS_HOST
-        self.port = settings.REDIS_PORT
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
 
     async def connect(self):
         self.redis = await redis.from_url(
-            f"redis://{self.host}:{self.port}", encoding="utf-8", decode_responses=True
+            f"redis://{self.host}:{self.port}",
+            encoding="utf-8",
+            decode_responses=True,
+            max_connections=self.max_connections,
         )
 
     async def close(self):
         if self.redis:
-            await self.redis.close()
+            await self.redis.aclose()
 
     async def set_token(self, username: str, token: str, expire_seconds: int = None):
         if expire_seconds is None:
@@ -65,6 +70,3 @@ class RedisClient:
             return await self.redis.ping()
         except Exception:
             return False
-
-
-redis_client = RedisClient()
@@ -0,0 +1,128 @@
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from pydantic import BaseModel
+
+from shared.redis_client import RedisClient
+
+SNAPSHOT_KEY = "user:snapshot:{}"
+
+
+class UserCache:
+    """User records for authenticated requests, without a database hop.
+
+    The JWT itself is verified locally by authx; this only replaces the
+    ``/users/username/{u}`` lookup that rebuilt the ``User`` on every request.
+    Lookups go through a short-TTL in-process LRU, then a Redis snapshot
+    shared by every worker, and only then the database service. ``user.*``
+    events evict the user from both layers; the TTLs bound staleness if an
+    event is missed. Services build their instance from their own settings
+    in their deps module.
+
+    ``model`` is what gets cached and returned. Give it only the fields
+    auth checks need, never the PIN: loaded users are converted to it
+    before they reach Redis or the LRU.
+    """
+
+    def __init__(
+        self,
+        model: type[BaseModel],
+        redis_client: RedisClient,
+        ttl_seconds: float = 30,
+        max_entries: int = 1024,
+        snapshot_ttl_seconds: int = 300,
+    ):
+        self.model = model
+        self.redis_client = redis_client
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self.snapshot_ttl = snapshot_ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, BaseModel]] = OrderedDict()
+        # Bumped on every invalidation so a load that raced one is not cached.
+        self._generation = 0
+
+    async def get(
+        self, username: str, loader: Callable[[str], Awaitable[BaseModel | None]]
+    ) -> BaseModel | None:
+        entry = self._entries.get(username)
+        if entry is not None:
+            expires_at, user = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(username)
+                return user
+            del self._entries[username]
+
+        generation = self._generation
+        user = await self._get_snapshot(username)
+        if user is None:
+            user = await loader(username)
+            if user is None:
+                return None
+            user = self.model.model_validate(user, from_attributes=True)
+            if generation == self._generation:
+                await self._set_snapshot(username, user)
+
+        if generation == self._generation:
+            self._put(username, user)
+        return user
+
+    def _put(self, username: str, user: BaseModel) -> None:
+        self._entries[username] = (time.monotonic() + self.ttl, user)
+        self._entries.move_to_end(username)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _get_snapshot(self, username: str) -> BaseModel | None:
+        if self.redis_client.redis is None:
+            return None
+        try:
+            raw = await self.redis_client.get_value(SNAPSHOT_KEY.format(username))
+            return self.model.model_validate_json(raw) if raw else None
+        except Exception as e:
+            print(f"⚠️ User snapshot read failed: {e}")
+            return None
+
+    async def _set_snapshot(self, username: str, user: BaseModel) -> None:
+        if self.redis_client.redis is None:
+            return
+        try:
+            await self.redis_client.set_value(
+                SNAPSHOT_KEY.format(username),
+                user.model_dump_json(),
+                self.snapshot_ttl,
+            )
+        except Exception as e:
+            print(f"⚠️ User snapshot write failed: {e}")
+
+    async def invalidate(
+        self,
+        username: str | None = None,
+        user_id: int | None = None,
+        old_username: str | None = None,
+    ) -> None:
+        self._generation += 1
+        # A rename's event names the old username as well, so its snapshot
+        # goes too and nobody authenticates from the stale record
+        usernames = {name for name in (username, old_username) if name}
+        if user_id is not None:
+            usernames.update(
+                name
+                for name, (_, user) in self._entries.items()
+                if getattr(user, "id", None) == user_id
+            )
+        for name in usernames:
+            self._entries.pop(name, None)
+
+        if usernames and self.redis_client.redis is not None:
+            try:
+                await self.redis_client.redis.delete(
+                    *(SNAPSHOT_KEY.format(name) for name in usernames)
+                )
+            except Exception as e:
+                print(f"⚠️ User snapshot delete failed: {e}")
+
+    async def handle_user_event(self, data: dict) -> None:
+        await self.invalidate(
+            data.get("username"), data.get("user_id"), data.get("old_username")
+        )
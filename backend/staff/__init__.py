@@ -1,9 +1,53 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 import crud
 import schemas
-from fastapi import FastAPI, HTTPException, Query, status
+from catalog import catalog
+from config import settings
+from fastapi import FastAPI, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from rabbitmq_client import rabbitmq_client
+
+
+async def _refresh_catalog_periodically():
+    while True:
+        await asyncio.sleep(settings.CATALOG_REFRESH_SECONDS)
+        try:
+            await catalog.load(crud.staff_client.db_client)
+        except Exception as e:
+            print(f"⚠️ Catalog refresh failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    try:
+        await rabbitmq_client.connect()
+        # The catalog applies events in arrival order, so one at a time
+        await rabbitmq_client.subscribe(
+            "product.*", catalog.handle_product_event, exclusive=True, concurrency=1
+        )
+        await rabbitmq_client.subscribe(
+            "category.*", catalog.handle_category_event, exclusive=True, concurrency=1
+        )
+    except Exception as e:
+        print(
+            f"⚠️ Staff Service started without RabbitMQ, catalog relies on refresh: {e}"
+        )
+    try:
+        await catalog.load(crud.staff_client.db_client)
+    except Exception as e:
+        print(f"⚠️ Catalog not loaded at startup, will load on first request: {e}")
+    refresh_task = asyncio.create_task(_refresh_catalog_periodically())
 
-router = FastAPI(tags=["Staff POS"], root_path="/api/staff")
+    yield
+
+    refresh_task.cancel()
+    await rabbitmq_client.close()
+    await crud.staff_client.close()
+
+
+router = FastAPI(tags=["Staff POS"], root_path="/api/staff", lifespan=lifespan)
 
 router.add_middleware(
     CORSMiddleware,
@@ -14,24 +58,37 @@ router.add_middleware(
 )
 
 
+def _catalog_not_modified(request: Request, response: Response) -> bool:
+    etag = catalog.etag
+    response.headers["ETag"] = etag
+    return request.headers.get("if-none-match") == etag
+
+
 # ==================== Products ====================
 @router.get("/products")
-async def get_products():
+async def get_products(request: Request, response: Response):
     """
     Get all active products for staff POS terminal
     """
-    return await crud.get_active_products()
+    data = await crud.get_active_products()
+    if _catalog_not_modified(request, response):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=response.headers
+        )
+    return data
 
 
 @router.get("/products/search")
 async def search_products(
     q: str = Query(None, description="Search query"),
     category_id: int = Query(None, description="Filter by category"),
+    limit: int = Query(None, ge=1, le=500, description="Return only the best N"),
 ):
     """
-    Search products by name/description and filter by category
+    Search products by name, description or category (prefix match, Latin or
+    Cyrillic) and filter by category; results are ranked best first
     """
-    return await crud.search_products(query=q, category_id=category_id)
+    return await crud.search_products(query=q, category_id=category_id, limit=limit)
 
 
 @router.get("/products/{product_id}")
@@ -50,11 +107,16 @@ async def get_product(product_id: int):
 
 # ==================== Categories ====================
 @router.get("/categories")
-async def get_categories():
+async def get_categories(request: Request, response: Response):
     """
     Get all active categories for staff POS terminal
     """
-    return await crud.get_active_categories()
+    data = await crud.get_active_categories()
+    if _catalog_not_modified(request, response):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=response.headers
+        )
+    return data
 
 
 # ==================== Printers ====================
@@ -189,11 +251,12 @@ async def get_user_orders(
     limit: int = Query(
         50, ge=1, le=100, description="Maximum number of orders to return"
     ),
+    cursor: str = Query(None, description="next_cursor from the previous page"),
 ):
     """
     Get recent orders for a staff member
     """
-    return await crud.get_staff_orders(user_id=user_id, limit=limit)
+    return await crud.get_staff_orders(user_id=user_id, limit=limit, cursor=cursor)
 
 
 @router.get("/orders/today/{user_id}")
@@ -0,0 +1,191 @@
+import asyncio
+import uuid
+
+import httpx
+from search import ProductSearchIndex
+from shared import codec
+
+PRODUCT_FIELDS = (
+    "title",
+    "description",
+    "category_id",
+    "quantity",
+    "price",
+    "is_active",
+    "image_url",
+    "image_filename",
+    "created_at",
+    "updated_at",
+)
+CATEGORY_FIELDS = ("name", "description", "is_active", "created_at", "updated_at")
+
+
+class CatalogCache:
+    """In-memory snapshot of products and categories for the POS.
+
+    Loaded from the database service at startup and patched from
+    ``product.*`` / ``category.*`` events. Every change bumps ``version``;
+    ``etag`` is stable for a given version of this process's snapshot.
+    """
+
+    def __init__(self):
+        self.products: dict[int, dict] = {}
+        self.categories: dict[int, dict] = {}
+        self.version = 0
+        self.loaded = False
+        self._boot_id = uuid.uuid4().hex[:8]
+        self._lock = asyncio.Lock()
+        self._active_products: list[dict] | None = None
+        self._active_categories: list[dict] | None = None
+        self.search_index = ProductSearchIndex()
+
+    @property
+    def etag(self) -> str:
+        return f'"{self._boot_id}-{self.version}"'
+
+    def _changed(self) -> None:
+        self.version += 1
+        self._active_products = None
+        self._active_categories = None
+
+    async def load(self, client: httpx.AsyncClient) -> None:
+        """Replace the snapshot with the database service's current catalog."""
+        async with self._lock:
+            products_resp, categories_resp = await asyncio.gather(
+                client.get("/products"), client.get("/categories")
+            )
+            products_resp.raise_for_status()
+            categories_resp.raise_for_status()
+
+            products = {
+                p["id"]: p
+                for p in codec.decode_response(products_resp).get("products", [])
+            }
+            categories = {
+                c["id"]: c
+                for c in codec.decode_response(categories_resp).get("categories", [])
+            }
+            # A refresh that finds nothing new keeps clients' ETags valid.
+            if (
+                self.loaded
+                and products == self.products
+                and categories == self.categories
+            ):
+                return
+            self.products = products
+            self.categories = categories
+            self.search_index.rebuild(products.values(), self._category_names())
+            self.loaded = True
+            self._changed()
+
+    async def ensure_loaded(self, client: httpx.AsyncClient) -> None:
+        if not self.loaded:
+            await self.load(client)
+
+    def active_products(self) -> list[dict]:
+        if self._active_products is None:
+            self._active_products = [
+                p for p in self.products.values() if p.get("is_active", False)
+            ]
+        return self._active_products
+
+    def active_categories(self) -> list[dict]:
+        if self._active_categories is None:
+            self._active_categories = [
+                c for c in self.categories.values() if c.get("is_active", False)
+            ]
+        return self._active_categories
+
+    def get_product(self, product_id: int) -> dict | None:
+        return self.products.get(product_id)
+
+    def search_products(
+        self, query: str | None, category_id: int | None, limit: int | None = None
+    ) -> list[dict]:
+        """Active products matching ``query``, best match first."""
+        products = self.products
+
+        def accept(product_id: int) -> bool:
+            product = products[product_id]
+            return product.get("is_active", False) and (
+                category_id is None or product.get("category_id") == category_id
+            )
+
+        # Only a blank query lists everything; "!!!" has no terms, so no matches
+        if query and query.strip():
+            return [
+                products[product_id]
+                for product_id in self.search_index.search(query, limit, accept)
+            ]
+
+        matches = [p for p in self.active_products() if accept(p["id"])]
+        return matches[:limit] if limit is not None else matches
+
+    def _category_names(self) -> dict[int, str]:
+        return {
+            category_id: category.get("name")
+            for category_id, category in self.categories.items()
+        }
+
+    def _reindex_category(self, category_id: int) -> None:
+        name = self.categories.get(category_id, {}).get("name")
+        for product in self.products.values():
+            if product.get("category_id") == category_id:
+                self.search_index.upsert(product, name)
+
+    async def handle_product_event(self, data: dict) -> None:
+        # Waits out a load in progress, then patches the snapshot it installed
+        async with self._lock:
+            self._apply_product_event(data)
+
+    async def handle_category_event(self, data: dict) -> None:
+        async with self._lock:
+            self._apply_category_event(data)
+
+    def _apply_product_event(self, data: dict) -> None:
+        action = data.get("action")
+        if action == "stock_changed":
+            for change in data.get("products", []):
+                product = self.products.get(change.get("product_id"))
+                if product is not None:
+                    product["quantity"] = change.get("quantity")
+            self._changed()
+            return
+
+        product_id = data.get("product_id")
+        if product_id is None:
+            return
+        if action == "deleted":
+            self.products.pop(product_id, None)
+            self.search_index.remove(product_id)
+        elif action in ("created", "updated"):
+            product = self.products.setdefault(product_id, {"id": product_id})
+            product.update({key: data[key] for key in PRODUCT_FIELDS if key in data})
+            category = self.categories.get(product.get("category_id"), {})
+            self.search_index.upsert(product, category.get("name"))
+        else:
+            return
+        self._changed()
+
+    def _apply_category_event(self, data: dict) -> None:
+        action = data.get("action")
+        category_id = data.get("category_id")
+        if category_id is None:
+            return
+        if action == "deleted":
+            self.categories.pop(category_id, None)
+            # The database sets category_id to NULL on these products
+            for product in self.products.values():
+                if product.get("category_id") == category_id:
+                    product["category_id"] = None
+                    self.search_index.upsert(product, None)
+        elif action in ("created", "updated"):
+            category = self.categories.setdefault(category_id, {"id": category_id})
+            category.update({key: data[key] for key in CATEGORY_FIELDS if key in data})
+            self._reindex_category(category_id)
+        else:
+            return
+        self._changed()
+
+
+catalog = CatalogCache()
@@ -1,14 +1,16 @@
 import asyncio
 import socket
-from datetime import datetime
+from datetime import datetime, timedelta
 from types import SimpleNamespace
 from typing import Any
 from zoneinfo import ZoneInfo
 
 import httpx
 import schemas
+from catalog import catalog
 from config import settings
 from fastapi import HTTPException, status
+from shared import codec
 
 UZBEKISTAN_TZ = ZoneInfo("Asia/Samarkand")
 
@@ -36,21 +38,23 @@ staff_client = StaffServiceClient()
 async def get_active_products():
     """Get all active products for staff POS"""
     try:
-        response = await staff_client.db_client.get("/products")
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to fetch products",
-            )
-        data = response.json()
-        all_products = data.get("products", [])
-        active_products = [p for p in all_products if p.get("is_active", False)]
-        return {"products": active_products, "total": len(active_products)}
+        await catalog.ensure_loaded(staff_client.db_client)
+        active_products = catalog.active_products()
+        return {
+            "products": active_products,
+            "total": len(active_products),
+            "version": catalog.version,
+        }
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Database service unavailable",
         )
+    except httpx.HTTPStatusError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch products",
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -60,31 +64,13 @@ async def get_active_products():
         )
 
 
-async def search_products(query: str | None, category_id: int | None):
+async def search_products(
+    query: str | None, category_id: int | None, limit: int | None = None
+):
     """Search products for staff POS"""
     try:
-        response = await staff_client.db_client.get("/products")
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to fetch products",
-            )
-        data = response.json()
-        products = data.get("products", [])
-
-        products = [p for p in products if p.get("is_active", False)]
-
-        if query:
-            query_lower = query.lower()
-            products = [
-                p
-                for p in products
-                if query_lower in p.get("title", "").lower()
-                or query_lower in p.get("description", "").lower()
-            ]
-
-        if category_id is not None:
-            products = [p for p in products if p.get("category_id") == category_id]
+        await catalog.ensure_loaded(staff_client.db_client)
+        products = catalog.search_products(query, category_id, limit)
 
         return {"products": products, "total": len(products)}
     except httpx.ConnectError:
@@ -92,6 +78,11 @@ async def search_products(query: str | None, category_id: int | None):
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Database service unavailable",
         )
+    except httpx.HTTPStatusError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch products",
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -104,22 +95,13 @@ async def search_products(query: str | None, category_id: int | None):
 async def get_product_by_id(product_id: int):
     """Get a single product by ID"""
     try:
-        response = await staff_client.db_client.get(f"/products/{product_id}")
-        if response.status_code == 404:
-            return None
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to fetch product",
-            )
-        return response.json()
+        await catalog.ensure_loaded(staff_client.db_client)
+        return catalog.get_product(product_id)
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Database service unavailable",
         )
-    except HTTPException:
-        raise
     except Exception:
         return None
 
@@ -130,21 +112,23 @@ async def get_product_by_id(product_id: int):
 async def get_active_categories():
     """Get all active categories for staff POS"""
     try:
-        response = await staff_client.db_client.get("/categories")
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to fetch categories",
-            )
-        data = response.json()
-        all_categories = data.get("categories", [])
-        active_categories = [c for c in all_categories if c.get("is_active", False)]
-        return {"categories": active_categories, "total": len(active_categories)}
+        await catalog.ensure_loaded(staff_client.db_client)
+        active_categories = catalog.active_categories()
+        return {
+            "categories": active_categories,
+            "total": len(active_categories),
+            "version": catalog.version,
+        }
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Database service unavailable",
         )
+    except httpx.HTTPStatusError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch categories",
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -168,7 +152,7 @@ async def get_printers(active_only: bool = True):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to fetch printers",
             )
-        return response.json()
+        return codec.decode_response(response)
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -441,7 +425,7 @@ async def get_tables(active_only: bool = False):
                 detail="Failed to fetch tables",
             )
 
-        return response.json()
+        return codec.decode_response(response)
 
     except httpx.ConnectError:
         raise HTTPException(
@@ -468,7 +452,7 @@ async def get_available_tables():
                 detail="Failed to fetch available tables",
             )
 
-        return response.json()
+        return codec.decode_response(response)
 
     except httpx.ConnectError:
         raise HTTPException(
@@ -494,7 +478,7 @@ async def get_table_by_id(table_id: int):
         if response.status_code != 200:
             return None
 
-        return response.json()
+        return codec.decode_response(response)
 
     except httpx.ConnectError:
         raise HTTPException(
@@ -523,7 +507,7 @@ async def update_table_status(table_id: int, table_status: str):
                 detail="Failed to update table status",
             )
 
-        return response.json()
+        return codec.decode_response(response)
 
     except httpx.ConnectError:
         raise HTTPException(
@@ -568,7 +552,7 @@ async def create_staff_order(
         response = await staff_client.order_client.post("/orders", json=order_data)
 
         if response.status_code == 400:
-            error_data = response.json()
+            error_data = codec.decode_response(response)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=error_data.get("detail", "Invalid order data"),
@@ -580,7 +564,7 @@ async def create_staff_order(
                 detail="Failed to create order",
             )
 
-        return response.json()
+        return codec.decode_response(response)
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -595,26 +579,35 @@ async def create_staff_order(
         )
 
 
-async def get_staff_orders(user_id: int, limit: int = 50):
+async def get_staff_orders(user_id: int, limit: int = 50, cursor: str | None = None):
     """Get recent orders for a staff member"""
     try:
-        response = await staff_client.order_client.get(f"/orders/user/{user_id}")
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+
+        response = await staff_client.db_client.get(
+            f"/orders/user/{user_id}", params=params
+        )
 
         if response.status_code != 200:
-            return {"orders": [], "total": 0}
+            return {"orders": [], "total": 0, "next_cursor": None}
 
-        data = response.json()
+        data = codec.decode_response(response)
         orders = data.get("orders", [])
-        orders = orders[:limit]
 
-        return {"orders": orders, "total": len(orders)}
+        return {
+            "orders": orders,
+            "total": len(orders),
+            "next_cursor": data.get("next_cursor"),
+        }
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Order service unavailable",
+            detail="Database service unavailable",
         )
     except Exception:
-        return {"orders": [], "total": 0}
+        return {"orders": [], "total": 0, "next_cursor": None}
 
 
 async def get_order_by_id(order_id: int):
@@ -627,7 +620,7 @@ async def get_order_by_id(order_id: int):
         if response.status_code != 200:
             return None
 
-        return response.json()
+        return codec.decode_response(response)
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -645,7 +638,7 @@ async def get_orders_by_table(table_id: int):
         if response.status_code != 200:
             return {"orders": [], "total": 0}
 
-        data = response.json()
+        data = codec.decode_response(response)
         return data
 
     except httpx.ConnectError:
@@ -657,32 +650,46 @@ async def get_orders_by_table(table_id: int):
         return {"orders": [], "total": 0}
 
 
+def _today_window() -> tuple[datetime, datetime]:
+    today_start = datetime.now(UZBEKISTAN_TZ).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    return today_start, today_start + timedelta(days=1)
+
+
 async def get_today_orders(user_id: int):
     """Get today's orders for a staff member"""
     try:
-        from datetime import datetime
+        # The window and limit are applied by the database service, which
+        # answers from the (user_id, created_at) index.
+        today_start, tomorrow_start = _today_window()
+        params = {
+            "start_date": today_start.isoformat(),
+            "end_date": tomorrow_start.isoformat(),
+            "limit": 500,
+        }
 
-        response = await staff_client.order_client.get(f"/orders/user/{user_id}")
+        today_orders = []
+        while True:
+            response = await staff_client.db_client.get(
+                f"/orders/user/{user_id}", params=params
+            )
 
-        if response.status_code != 200:
-            return {"orders": [], "total": 0}
+            if response.status_code != 200:
+                return {"orders": [], "total": 0}
 
-        data = response.json()
-        all_orders = data.get("orders", [])
+            data = codec.decode_response(response)
+            today_orders.extend(data.get("orders", []))
 
-        today = datetime.now().date()
-        today_orders = [
-            order
-            for order in all_orders
-            if datetime.fromisoformat(order["created_at"].replace("Z", "+00:00")).date()
-            == today
-        ]
+            if not data.get("next_cursor"):
+                break
+            params["cursor"] = data["next_cursor"]
 
         return {"orders": today_orders, "total": len(today_orders)}
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Order service unavailable",
+            detail="Database service unavailable",
         )
     except Exception:
         return {"orders": [], "total": 0}
@@ -732,7 +739,7 @@ async def update_staff_order(
                 detail="Failed to update order",
             )
 
-        return response.json()
+        return codec.decode_response(response)
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -765,7 +772,7 @@ async def update_order_status(order_id: int, new_status: str):
                 detail="Failed to update order status",
             )
 
-        return response.json()
+        return codec.decode_response(response)
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -812,7 +819,7 @@ async def remove_order_item(order_id: int, item_id: int, user_id: int):
                 detail="Failed to remove order item",
             )
 
-        return response.json()
+        return codec.decode_response(response)
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -859,7 +866,7 @@ async def update_order_item(
                 detail="Failed to update order item",
             )
 
-        return response.json()
+        return codec.decode_response(response)
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -906,7 +913,7 @@ async def cancel_order(order_id: int, user_id: int):
                 detail="Failed to cancel order",
             )
 
-        return response.json()
+        return codec.decode_response(response)
     except httpx.ConnectError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -0,0 +1,207 @@
+import heapq
+import re
+from bisect import bisect_left, insort
+from typing import Callable
+
+# Uzbek/Russian Cyrillic -> Uzbek Latin, so either script finds the other.
+CYRILLIC_TO_LATIN = {
+    "а": "a",
+    "б": "b",
+    "в": "v",
+    "г": "g",
+    "ғ": "g",
+    "д": "d",
+    "е": "e",
+    "ё": "yo",
+    "ж": "j",
+    "з": "z",
+    "и": "i",
+    "й": "y",
+    "к": "k",
+    "қ": "q",
+    "л": "l",
+    "м": "m",
+    "н": "n",
+    "о": "o",
+    "ў": "o",
+    "п": "p",
+    "р": "r",
+    "с": "s",
+    "т": "t",
+    "у": "u",
+    "ф": "f",
+    "х": "x",
+    "ҳ": "h",
+    "ц": "ts",
+    "ч": "ch",
+    "ш": "sh",
+    "щ": "sh",
+    "ъ": "",
+    "ы": "i",
+    "ь": "",
+    "э": "e",
+    "ю": "yu",
+    "я": "ya",
+}
+_TRANSLATE = str.maketrans(
+    {
+        **CYRILLIC_TO_LATIN,
+        # Uzbek o‘/g‘ are typed with any of these marks, or none.
+        "'": "",
+        "`": "",
+        "‘": "",
+        "’": "",
+        "ʻ": "",
+        "ʼ": "",
+    }
+)
+# Spelling variants that should meet in one key (Russian-style Latin,
+# and q/k which POS users type interchangeably).
+_VARIANTS = (("zh", "j"), ("kh", "x"), ("q", "k"))
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+# Field weights for ranking
+TITLE_WEIGHT = 3
+CATEGORY_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+
+
+def fold(text: str | None) -> str:
+    """Lowercase, transliterate and collapse spelling variants."""
+    folded = str(text or "").lower().translate(_TRANSLATE)
+    for variant, canonical in _VARIANTS:
+        folded = folded.replace(variant, canonical)
+    return folded
+
+
+def tokenize(text: str | None) -> list[str]:
+    return _TOKEN_RE.findall(fold(text))
+
+
+class ProductSearchIndex:
+    """Inverted index over product title, description and category name.
+
+    Every query token is matched as a prefix of an indexed token: the sorted
+    vocabulary is bisected to the prefix range, so a lookup costs
+    O(log V + matches) rather than a scan of the catalog.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, dict[int, int]] = {}  # token -> {id: weight}
+        self._vocabulary: list[str] = []
+        self._tokens_by_product: dict[int, set[str]] = {}
+        self._titles: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._tokens_by_product)
+
+    def rebuild(self, products, category_names: dict[int, str]) -> None:
+        self._postings = {}
+        self._tokens_by_product = {}
+        self._titles = {}
+        for product in products:
+            self._add(product, category_names.get(product.get("category_id")))
+        self._vocabulary = sorted(self._postings)
+
+    def upsert(self, product: dict, category_name: str | None) -> None:
+        self.remove(product["id"])
+        for token in self._add(product, category_name):
+            if len(self._postings[token]) == 1:
+                insort(self._vocabulary, token)
+
+    def remove(self, product_id: int) -> None:
+        self._titles.pop(product_id, None)
+        for token in self._tokens_by_product.pop(product_id, ()):
+            postings = self._postings[token]
+            postings.pop(product_id, None)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def _add(self, product: dict, category_name: str | None) -> set[str]:
+        product_id = product["id"]
+        weights: dict[str, int] = {}
+        for text, weight in (
+            (product.get("title"), TITLE_WEIGHT),
+            (category_name, CATEGORY_WEIGHT),
+            (product.get("description"), DESCRIPTION_WEIGHT),
+        ):
+            for token in tokenize(text):
+                if weights.get(token, 0) < weight:
+                    weights[token] = weight
+
+        for token, weight in weights.items():
+            self._postings.setdefault(token, {})[product_id] = weight
+        self._tokens_by_product[product_id] = set(weights)
+        self._titles[product_id] = fold(product.get("title"))
+        return set(weights)
+
+    def _prefix_matches(self, prefix: str) -> dict[int, int]:
+        """Best score per product for tokens starting with ``prefix``."""
+        matches: dict[int, int] = {}
+        vocabulary = self._vocabulary
+        for position in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            token = vocabulary[position]
+            if not token.startswith(prefix):
+                break
+            # Whole-token hits outrank prefix hits in the same field.
+            exact = 1 if token == prefix else 0
+            for product_id, weight in self._postings[token].items():
+                score = weight * 2 + exact
+                if matches.get(product_id, 0) < score:
+                    matches[product_id] = score
+        return matches
+
+    def search(
+        self,
+        query: str | None,
+        limit: int | None = None,
+        accept: Callable[[int], bool] | None = None,
+    ) -> list[int]:
+        """Product ids matching every query token, best first.
+
+        ``accept`` filters candidates before ranking; with ``limit`` only the
+        top results are selected instead of sorting every match.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        # Most selective term first, so the intersection shrinks early.
+        per_term = sorted(
+            (self._prefix_matches(term) for term in dict.fromkeys(terms)), key=len
+        )
+        scores = dict(per_term[0])
+        for matches in per_term[1:]:
+            scores = {
+                product_id: score + matches[product_id]
+                for product_id, score in scores.items()
+                if product_id in matches
+            }
+            if not scores:
+                return []
+
+        if accept is not None:
+            scores = {
+                product_id: score
+                for product_id, score in scores.items()
+                if accept(product_id)
+            }
+
+        folded_query = " ".join(terms)
+        titles = self._titles
+        ranked = [
+            (
+                -(score + TITLE_WEIGHT * 2)
+                if titles[product_id].startswith(folded_query)
+                else -score,
+                titles[product_id],
+                product_id,
+            )
+            for product_id, score in scores.items()
+        ]
+        if limit is not None and limit < len(ranked):
+            ranked = heapq.nsmallest(limit, ranked)
+        else:
+            ranked.sort()
+        return [product_id for _, _, product_id in ranked]
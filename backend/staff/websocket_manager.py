@@ -1,7 +1,7 @@
-import json
-from typing import Dict, Set
+from typing import Set
 
 from fastapi import WebSocket
+from shared import codec
 
 
 class WebSocketManager:
@@ -19,10 +19,12 @@ class WebSocketManager:
 
     async def broadcast(self, message: dict):
         disconnected = set()
+        # Encode once, not once per connection
+        frame = codec.dumps_text(message)
 
         for connection in self.active_connections:
             try:
-                await connection.send_json(message)
+                await connection.send_text(frame)
             except Exception as e:
                 print(f"❌ Error sending to WebSocket: {e}")
                 disconnected.add(connection)
@@ -10,6 +10,7 @@ import { api, API_URL } from "@/config";
 import { useAuth } from "@/contexts/auth-context";
 import { useI18n } from "@/i18n";
 import { AuthGuard } from "@/middlewares/AuthGuard";
+import { fetchAllOrders } from "@/utils/orderPages";
 import { createFileRoute, Link } from "@tanstack/react-router";
 import {
   AlertTriangle,
@@ -80,10 +81,6 @@ interface TopProduct {
   revenue: number;
 }
 
-interface OrdersResponse {
-  orders: RecentOrder[];
-}
-
 interface UsersResponse {
   users: Array<{ status: string; role: string }>;
 }
@@ -178,36 +175,57 @@ function DashboardPage() {
         end_date: endOfYesterday.toISOString(),
       });
 
-      const [todaySales, yesterdaySales, inventory, orders, users, topProds] =
-        await Promise.all([
-          fetchJson(
-            `${API_URL}${api.admin.base}/${api.admin.reports}/sales?${todayParams}`,
-          ),
-
-          fetchJson(
-            `${API_URL}${api.admin.base}/${api.admin.reports}/sales?${yesterdayParams}`,
-          ),
-
-          fetchJson(
-            `${API_URL}${api.admin.base}/${api.admin.reports}/inventory`,
-          ),
-
-          fetchJson(`${API_URL}${api.orders.base}/${api.orders.orders}`),
-
-          fetchJson(`${API_URL}${api.admin.base}/${api.admin.users}`),
-
-          // Get top products for last 7 days
-          (() => {
-            const last7Days = new Date();
-            last7Days.setDate(last7Days.getDate() - 7);
-            const params = new URLSearchParams({
-              start_date: last7Days.toISOString(),
-            });
-            return fetchJson(
-              `${API_URL}${api.admin.base}/${api.admin.reports}/sales?${params}`,
-            );
-          })(),
-        ]);
+      const [
+        todaySales,
+        yesterdaySales,
+        inventory,
+        orderList,
+        pending,
+        users,
+        topProds,
+      ] = await Promise.all([
+        fetchJson(
+          `${API_URL}${api.admin.base}/${api.admin.reports}/sales?${todayParams}`,
+        ),
+
+        fetchJson(
+          `${API_URL}${api.admin.base}/${api.admin.reports}/sales?${yesterdayParams}`,
+        ),
+
+        fetchJson(
+          `${API_URL}${api.admin.base}/${api.admin.reports}/inventory`,
+        ),
+
+        // Newest first: stop paging once a page reaches before today
+        fetchAllOrders<RecentOrder>(
+          `${API_URL}${api.orders.base}/${api.orders.orders}`,
+          {
+            init: { headers: authHeaders },
+            more: (page) =>
+              page.length > 0 &&
+              new Date(page[page.length - 1].created_at) >= startOfToday,
+          },
+        ),
+
+        fetchAllOrders<RecentOrder>(
+          `${API_URL}${api.orders.base}/${api.orders.orders}/status/pending`,
+          { init: { headers: authHeaders } },
+        ),
+
+        fetchJson(`${API_URL}${api.admin.base}/${api.admin.users}`),
+
+        // Get top products for last 7 days
+        (() => {
+          const last7Days = new Date();
+          last7Days.setDate(last7Days.getDate() - 7);
+          const params = new URLSearchParams({
+            start_date: last7Days.toISOString(),
+          });
+          return fetchJson(
+            `${API_URL}${api.admin.base}/${api.admin.reports}/sales?${params}`,
+          );
+        })(),
+      ]);
 
       // Process sales stats
       const todayTotal = todaySales.total_sales || 0;
@@ -234,15 +252,12 @@ function DashboardPage() {
       });
 
       // Process order stats
-      const orderList = ((orders as OrdersResponse).orders ||
-        []) as RecentOrder[];
       const todayOrders =
         orderList.filter((o) => {
           const orderDate = new Date(o.created_at);
           return orderDate >= startOfToday && orderDate <= endOfToday;
         }) || [];
 
-      const pending = orderList.filter((o) => o.status === "pending");
       const completedToday = todayOrders.filter(
         (o) => o.status === "completed",
       );
@@ -85,12 +85,22 @@ function RouteComponent() {
 
   const [isDetailModalOpen, setIsDetailModalOpen] = useState(false)
   const [selectedOrder, setSelectedOrder] = useState<Order | null>(null)
-
-  const fetchOrders = async () => {
-    setIsLoading(true)
+  // The list is paged newest first; set while older orders remain
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
+
+  const fetchOrders = async (cursor?: string) => {
+    if (cursor) {
+      setIsLoadingMore(true)
+    } else {
+      setIsLoading(true)
+    }
     setError(null)
     try {
-      const response = await fetch(ORDERS_API, {
+      const url = cursor
+        ? `${ORDERS_API}?cursor=${encodeURIComponent(cursor)}`
+        : ORDERS_API
+      const response = await fetch(url, {
         method: 'GET',
         headers: {
           'Content-Type': 'application/json',
@@ -103,15 +113,16 @@ function RouteComponent() {
       }
 
       const data = await response.json()
-      const ordersList = Array.isArray(data) ? data : (data.orders || [])
-      
-      setOrders(ordersList)
-      setFilteredOrders(ordersList)
+      const ordersList: Order[] = Array.isArray(data) ? data : (data.orders || [])
+
+      setOrders(prev => (cursor ? [...prev, ...ordersList] : ordersList))
+      setNextCursor(data.next_cursor ?? null)
     } catch (err) {
       console.error('Error fetching orders:', err)
       setError(err instanceof Error ? err.message : 'Failed to fetch orders')
     } finally {
       setIsLoading(false)
+      setIsLoadingMore(false)
     }
   }
 
@@ -354,7 +365,7 @@ function RouteComponent() {
           <TableCaption>
             {filteredOrders.length === 0
               ? 'No orders found'
-              : `Showing ${filteredOrders.length} of ${orders.length} orders`}
+              : `Showing ${filteredOrders.length} of ${orders.length}${nextCursor ? ' loaded' : ''} orders`}
           </TableCaption>
           <TableHeader>
             <TableRow>
@@ -405,6 +416,18 @@ function RouteComponent() {
         </Table>
       </div>
 
+      {nextCursor && (
+        <div className="flex justify-center">
+          <Button
+            variant="outline"
+            disabled={isLoadingMore}
+            onClick={() => fetchOrders(nextCursor)}
+          >
+            {isLoadingMore ? 'Loading...' : 'Load older orders'}
+          </Button>
+        </div>
+      )}
+
       <Dialog open={isDetailModalOpen} onOpenChange={setIsDetailModalOpen}>
         <DialogContent className="sm:max-w-[600px]">
           <DialogHeader>
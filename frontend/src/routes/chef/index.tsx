@@ -17,6 +17,7 @@ import {
 import { API_URL, api } from "@/config";
 import { useAuth } from "@/contexts/auth-context";
 import { AuthGuard } from "@/middlewares/AuthGuard";
+import { fetchAllOrders } from "@/utils/orderPages";
 import { createFileRoute, useNavigate } from "@tanstack/react-router";
 import { LogOut, RefreshCw, UtensilsCrossed } from "lucide-react";
 import { useCallback, useEffect, useRef, useState } from "react";
@@ -76,6 +77,9 @@ function ChefOrdersPage() {
   const [showDetails, setShowDetails] = useState(false);
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectTimerRef = useRef<number | null>(null);
+  // Stream position, so a reconnect replays missed events instead of reloading
+  const streamRef = useRef<{ stream: string; seq: number } | null>(null);
+  const refetchTimerRef = useRef<number | null>(null);
 
   const token = localStorage.getItem("postoken");
 
@@ -83,25 +87,16 @@ function ChefOrdersPage() {
     setLoading(true);
     setError(null);
     try {
-      const res = await fetch(
-        `${API_URL}${api.orders.base}/${api.orders.orders}`,
-        {
-          headers: {
-            Authorization: `Bearer ${token}`,
-          },
-        },
-      );
-
-      if (!res.ok) {
-        throw new Error("Failed to load orders");
-      }
+      // Ask the server for each active status and follow every page: the
+      // unfiltered list is paged, so older active orders would drop off it.
+      const fetchStatus = (orderStatus: string) =>
+        fetchAllOrders<Order>(
+          `${API_URL}${api.orders.base}/${api.orders.orders}/status/${orderStatus}`,
+          { init: { headers: { Authorization: `Bearer ${token}` } } },
+        );
 
-      const data = await res.json();
-      const allOrders: Order[] = data.orders || [];
-      const filtered = allOrders.filter((o) =>
-        ACTIVE_STATUSES.includes(o.status),
-      );
-      setOrders(filtered);
+      const pages = await Promise.all(ACTIVE_STATUSES.map(fetchStatus));
+      setOrders(pages.flat().sort((a, b) => b.id - a.id));
     } catch {
       setError("Failed to load cooker orders");
     } finally {
@@ -113,26 +108,50 @@ function ChefOrdersPage() {
     fetchOrders();
   }, [fetchOrders]);
 
+  // Events arrive in bursts (a reconnect replays every missed one), so
+  // they share one reload per short window instead of one each.
+  const scheduleRefetch = useCallback(() => {
+    if (refetchTimerRef.current) return;
+    refetchTimerRef.current = window.setTimeout(() => {
+      refetchTimerRef.current = null;
+      fetchOrders();
+    }, 300);
+  }, [fetchOrders]);
+
   useEffect(() => {
     let manuallyClosed = false;
 
     const wsUrl = (() => {
       const parsed = new URL(API_URL);
       const wsProtocol = parsed.protocol === "https:" ? "wss:" : "ws:";
-      return `${wsProtocol}//${parsed.host}${api.orders.base}/ws`;
+      return `${wsProtocol}//${parsed.host}${api.orders.base}/ws?topics=order.*`;
     })();
 
     const connect = () => {
       if (manuallyClosed) return;
 
-      const ws = new WebSocket(wsUrl);
+      const position = streamRef.current;
+      const ws = new WebSocket(
+        position
+          ? `${wsUrl}&stream=${position.stream}&last_seq=${position.seq}`
+          : wsUrl,
+      );
       wsRef.current = ws;
 
       ws.onmessage = (event) => {
         try {
           const payload = JSON.parse(event.data);
-          if (payload?.type === "order_update") {
-            fetchOrders();
+          if (payload?.type === "hello") {
+            // Events were missed and cannot be replayed: reload.
+            if (position && !payload.resumed) {
+              scheduleRefetch();
+            }
+            streamRef.current = { stream: payload.stream, seq: payload.seq };
+          } else if (payload?.type === "order_update") {
+            if (streamRef.current && typeof payload.seq === "number") {
+              streamRef.current.seq = payload.seq;
+            }
+            scheduleRefetch();
           }
         } catch {
           // Ignore non-JSON websocket messages.
@@ -158,11 +177,15 @@ function ChefOrdersPage() {
       if (reconnectTimerRef.current) {
         clearTimeout(reconnectTimerRef.current);
       }
+      if (refetchTimerRef.current) {
+        clearTimeout(refetchTimerRef.current);
+        refetchTimerRef.current = null;
+      }
       if (wsRef.current) {
         wsRef.current.close();
       }
     };
-  }, [fetchOrders]);
+  }, [scheduleRefetch]);
 
   const handleLogout = () => {
     logout();
@@ -2,6 +2,7 @@ import { api, API_URL } from "@/config";
 import { useAuth } from "@/contexts/auth-context";
 import { useBusiness } from "@/contexts/business-context";
 import { AuthGuard } from "@/middlewares/AuthGuard";
+import { fetchAllOrders } from "@/utils/orderPages";
 import { printService } from "@/utils/printService";
 import { createFileRoute, Link, useNavigate } from "@tanstack/react-router";
 import {
@@ -206,25 +207,26 @@ export default function POSTerminal() {
   const fetchRestaurantTableActivity = useCallback(async () => {
     if (!isRestaurant) return;
     try {
-      const res = await fetch(
-        `${API_URL}${api.orders.base}/${api.orders.orders}`,
-        {
-          headers: {
-            Authorization: `Bearer ${localStorage.getItem("postoken") || ""}`,
-          },
+      // Ask for each active status and follow every page: the unfiltered
+      // list is paged, so older active orders would drop off the map.
+      const init = {
+        headers: {
+          Authorization: `Bearer ${localStorage.getItem("postoken") || ""}`,
         },
-      );
-      if (!res.ok) return;
-
-      const data = await res.json();
-      const orders = Array.isArray(data.orders) ? data.orders : [];
-      const activeOrders = orders.filter(
-        (order: any) =>
-          order?.table_id &&
-          ["pending", "preparing", "ready"].includes(
-            String(order?.status || ""),
+      };
+      const pages = await Promise.all(
+        ["pending", "preparing", "ready"].map((orderStatus) =>
+          fetchAllOrders(
+            `${API_URL}${api.orders.base}/${api.orders.orders}/status/${orderStatus}`,
+            { init },
           ),
+        ),
       );
+      // Newest first, as the unfiltered list was
+      const activeOrders = pages
+        .flat()
+        .filter((order: any) => order?.table_id)
+        .sort((a: any, b: any) => Number(b.id) - Number(a.id));
 
       const mapped: Record<number, ActiveTableOrder> = {};
       for (const order of activeOrders) {
@@ -18,6 +18,7 @@ import {
 } from "@/components/ui/table";
 import { api, API_URL } from "@/config";
 import { AuthGuard } from "@/middlewares/AuthGuard";
+import { fetchAllOrders } from "@/utils/orderPages";
 import { printService } from "@/utils/printService";
 import { createFileRoute, Link } from "@tanstack/react-router";
 import {
@@ -148,12 +149,12 @@ function OrdersPage() {
     setLoading(true);
     setError(null);
     try {
-      // GET /orders/user/{user_id} -> { orders[], total }
-      const res = await fetch(`${ORDERS_URL}/user/${UID}`);
-      if (!res.ok) throw new Error("Failed");
-      const data = await res.json();
-      setOrders(data.orders || []);
-      setFilteredOrders(data.orders || []);
+      // GET /orders/user/{user_id} -> { orders[], next_cursor }, every page
+      const orders = await fetchAllOrders<Order>(`${ORDERS_URL}/user/${UID}`, {
+        limit: 100,
+      });
+      setOrders(orders);
+      setFilteredOrders(orders);
     } catch {
       setError("Failed to load orders");
     } finally {
@@ -0,0 +1,33 @@
+// Order list endpoints are keyset-paged: each response is one page of
+// `orders`, newest first, plus the `next_cursor` of the page after it.
+interface FetchAllOrdersOptions<T> {
+  init?: RequestInit;
+  // Page size; stay within the endpoint's own `limit` bound
+  limit?: number;
+  // Return false to stop after this page (e.g. once it reaches older orders)
+  more?: (page: T[]) => boolean;
+}
+
+// Follows `next_cursor` until the list runs out or `more` says stop.
+export async function fetchAllOrders<T = any>(
+  url: string,
+  { init, limit = 500, more }: FetchAllOrdersOptions<T> = {},
+): Promise<T[]> {
+  const orders: T[] = [];
+  const separator = url.includes("?") ? "&" : "?";
+  let cursor: string | null = null;
+  do {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (cursor) params.set("cursor", cursor);
+    const res = await fetch(`${url}${separator}${params}`, init);
+    if (!res.ok) {
+      throw new Error(`Failed to load orders (${res.status}) ${url}`);
+    }
+    const data = await res.json();
+    const page: T[] = Array.isArray(data.orders) ? data.orders : [];
+    orders.push(...page);
+    cursor = data.next_cursor ?? null;
+    if (more && !more(page)) break;
+  } while (cursor);
+  return orders;
+}